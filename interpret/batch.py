@@ -0,0 +1,268 @@
+from typing import IO, Dict, List
+from collections import deque
+from multiprocessing import Process, Pipe
+from multiprocessing.connection import Connection, wait
+from os import path
+from enums import Engines
+from runner import run
+import json
+import resource
+import signal
+import time
+
+# Vychozi casovy limit jedne ulohy (s).
+DEFAULT_TIMEOUT = 10.0
+# Doba, po kterou se ceka na vlastni ukonceni ulohy po vyprseni limitu.
+# Potom se proces ukonci nasilne.
+KILL_GRACE = 1.0
+
+# Stav dokoncene ulohy.
+STATUS_OK = 'ok'
+STATUS_TIMEOUT = 'timeout'
+STATUS_MEMORY = 'memory'
+STATUS_CRASH = 'crash'
+STATUS_ERROR = 'error'
+
+
+class JobTimeout(Exception):
+    """ Vyprseni casoveho limitu ulohy (signal SIGALRM v procesu). """
+
+
+def read_manifest(manifest: str) -> List[dict]:
+    """ Nacteni seznamu uloh (JSON lines).
+
+    Kazdy radek obsahuje objekt s klici source (XML program), input (vstup
+    instrukce READ, nepovinny), expected (ocekavany standardni vystup,
+    nepovinny), code (ocekavany navratovy kod, vychozi 0) a id (vychozi
+    cislo radku). Relativni cesty jsou vztazeny k adresari manifestu.
+    """
+
+    directory = path.dirname(path.abspath(manifest))
+    jobs = list()
+
+    with open(manifest, 'r') as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+
+            job = json.loads(line)
+            if not isinstance(job, dict) or 'source' not in job:
+                raise ValueError('Missing source at line {}'.format(number))
+
+            job.setdefault('id', number)
+            job.setdefault('code', 0)
+
+            for key in ('source', 'input', 'expected'):
+                if job.get(key) is not None:
+                    job[key] = path.join(directory, job[key])
+
+            jobs.append(job)
+
+    return jobs
+
+
+def raise_timeout(signum, frame):
+    raise JobTimeout()
+
+
+def run_job(job: dict, engine: Engines, optimization: int,
+            timeout: float) -> dict:
+    """ Provedeni jedne ulohy v pracovnim procesu. """
+
+    result = {'id': job['id'], 'exit_code': None, 'stdout': '', 'stderr': ''}
+    start = time.perf_counter()
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    try:
+        data_input = b''
+        if job.get('input') is not None:
+            with open(job['input'], 'rb') as file:
+                data_input = file.read()
+
+        with open(job['source'], 'r') as source:
+            outcome = run(source, data_input, (), engine, optimization)
+
+        result['status'] = STATUS_OK
+        result['exit_code'] = outcome.exit_code
+        result['stdout'] = outcome.stdout
+        result['stderr'] = outcome.stderr
+    except JobTimeout:
+        result['status'] = STATUS_TIMEOUT
+    except MemoryError:
+        result['status'] = STATUS_MEMORY
+    except Exception as e:
+        result['status'] = STATUS_ERROR
+        result['stderr'] = '{}: {}'.format(type(e).__name__, e)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    result['time'] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def worker_main(connection: Connection, engine: Engines, optimization: int,
+                timeout: float, memory_limit: int):
+    """ Pracovni proces. Interpret je jiz importovan (proces vznika jako
+    kopie rodice), ulohy se prijimaji az do prijeti None. """
+
+    if memory_limit is not None:
+        limit = memory_limit * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    signal.signal(signal.SIGALRM, raise_timeout)
+
+    while True:
+        job = connection.recv()
+        if job is None:
+            break
+
+        connection.send(run_job(job, engine, optimization, timeout))
+
+
+class Worker():
+    """ Dlouhodobe bezici pracovni proces a jeho aktualni uloha. """
+
+    def __init__(self, engine: Engines, optimization: int, timeout: float,
+                 memory_limit: int):
+        self.connection, child = Pipe()
+        self.process = Process(
+            target=worker_main,
+            args=(child, engine, optimization, timeout, memory_limit),
+            daemon=True)
+        self.process.start()
+        child.close()
+        self.job: dict = None
+        self.started = 0.0
+
+    def submit(self, job: dict):
+        self.job = job
+        self.started = time.perf_counter()
+        self.connection.send(job)
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+
+        self.process.join(KILL_GRACE)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+        self.connection.close()
+
+
+def evaluate(job: dict, result: dict):
+    """ Porovnani vysledku s ocekavanym navratovym kodem a vystupem. """
+
+    if result['status'] != STATUS_OK:
+        result['passed'] = False
+        return
+
+    passed = result['exit_code'] == job['code']
+
+    # Vystup se porovnava pouze u uspesne ukonceneho programu.
+    if passed and job['code'] == 0 and job.get('expected') is not None:
+        with open(job['expected'], 'r') as file:
+            passed = file.read() == result['stdout']
+
+    result['passed'] = passed
+
+
+def run_batch(manifest: str, results: IO, jobs: int = 1,
+              timeout: float = DEFAULT_TIMEOUT, memory_limit: int = None,
+              engine: Engines = Engines.DEFAULT,
+              optimization: int = 0) -> Dict[str, int]:
+    """ Provedeni vsech uloh manifestu pomoci <jobs> pracovnich procesu.
+
+    Vysledek kazde ulohy (id, stav, navratovy kod, standardni a chybovy
+    vystup, doba a shoda s ocekavanim) se zapise jako radek JSON, jakmile
+    je uloha dokoncena.
+
+    Parameters
+    ----------
+    manifest: str
+        Cesta k seznamu uloh (viz read_manifest).
+    results: IO
+        Vystup vysledku (JSON lines).
+    jobs: int
+        Pocet pracovnich procesu.
+    timeout: float
+        Casovy limit jedne ulohy (s).
+    memory_limit: int
+        Limit adresniho prostoru pracovniho procesu (MiB, None = bez limitu).
+    engine, optimization
+        Zpusob provadeni a uroven optimalizace (stejne jako v interpret.py).
+    Returns
+    -------
+    Dict[str, int]
+        Pocet uloh, pocet uspesnych a neuspesnych uloh.
+    """
+
+    pending = deque(read_manifest(manifest))
+    workers = [Worker(engine, optimization, timeout, memory_limit)
+               for _ in range(max(1, min(jobs, len(pending))))]
+    summary = {'jobs': len(pending), 'passed': 0, 'failed': 0}
+
+    def finish(job: dict, result: dict):
+        evaluate(job, result)
+        summary['passed' if result['passed'] else 'failed'] += 1
+        results.write(json.dumps(result) + '\n')
+
+    def replace(worker: Worker) -> Worker:
+        worker.kill()
+        return Worker(engine, optimization, timeout, memory_limit)
+
+    try:
+        while True:
+            for worker in workers:
+                if worker.job is None and pending:
+                    worker.submit(pending.popleft())
+
+            busy = [worker for worker in workers if worker.job is not None]
+            if not busy:
+                break
+
+            # Cekani na nejblizsi vysledek, nejdele do vyprseni limitu.
+            now = time.perf_counter()
+            deadline = min(worker.started for worker in busy) + timeout + \
+                KILL_GRACE
+            ready = wait([worker.connection for worker in busy],
+                         max(0.0, deadline - now))
+
+            for index, worker in enumerate(workers):
+                if worker.job is None:
+                    continue
+
+                job = worker.job
+
+                if worker.connection in ready:
+                    try:
+                        finish(job, worker.connection.recv())
+                        worker.job = None
+                        continue
+                    except EOFError:
+                        # Proces skoncil (napr. ukoncen pri nedostatku pameti).
+                        status = STATUS_CRASH
+                elif time.perf_counter() > worker.started + timeout + \
+                        KILL_GRACE:
+                    # Uloha nereaguje na signal (napr. ceka v kodu jazyka C).
+                    status = STATUS_TIMEOUT
+                else:
+                    continue
+
+                workers[index] = replace(worker)
+                finish(job, {
+                    'id': job['id'], 'exit_code': None, 'stdout': '',
+                    'stderr': '', 'status': status,
+                    'time': round(time.perf_counter() - worker.started, 6)
+                })
+    finally:
+        for worker in workers:
+            worker.stop()
+
+    return summary
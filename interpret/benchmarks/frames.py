@@ -0,0 +1,103 @@
+"""
+Porovnani volani funkci bez opetovneho pouziti ramcu (kazdy CREATEFRAME
+vytvori novy ramec) a s nim (FramePool, viz frames.py).
+
+Meri rekurzivni programy fib a ackermann (adresar workloads): pocet
+pozadovanych ramcu (jeden na volani funkce), pocet skutecne vytvorenych
+ramcu, pocet alokaci na volani (objekt Frame a pole hodnot) a dobu behu.
+
+Pouziti: python3 benchmarks/frames.py [--engine E] [-O N] [--repeat N]
+"""
+
+from argparse import ArgumentParser
+from os import path, devnull
+import sys
+import time
+
+BENCHMARKS_DIR = path.dirname(path.abspath(__file__))
+INTERPRET_DIR = path.dirname(BENCHMARKS_DIR)
+WORKLOADS_DIR = path.join(BENCHMARKS_DIR, 'workloads')
+sys.path.insert(0, INTERPRET_DIR)
+
+# Programy <nazev, vstup programu>.
+WORKLOADS = {
+    'fib': '20\n',
+    'ackermann': '3\n5\n'
+}
+
+# Pocet alokaci na jeden vytvoreny ramec (objekt Frame a pole hodnot).
+FRAME_ALLOCATIONS = 2
+
+
+def measure(workload: str, capacity: int, engine: str, optimization: int,
+            repeat: int) -> dict:
+    """ Provedeni programu s kapacitou zasobniku ramcu <capacity>
+    (0 = ramce se znovu nepouzivaji). Pouzije se nejlepsi doba behu. """
+
+    from runner import load
+    from program import Program
+    from enums import Engines
+    from input_reader import InputReader
+    from output import Output
+
+    with open(path.join(WORKLOADS_DIR, workload + '.src'), 'r') as file:
+        linked = load(file, optimization)
+
+    run_time = None
+
+    for _ in range(repeat):
+        with open(devnull, 'w') as stream:
+            program = Program(linked,
+                              InputReader.from_data(WORKLOADS[workload]),
+                              None, Engines(engine), optimization,
+                              Output(stream=stream))
+            program.frame_pool.capacity = capacity
+
+            begin = time.perf_counter()
+            program.run()
+            elapsed = time.perf_counter() - begin
+
+        run_time = elapsed if run_time is None else min(run_time, elapsed)
+
+    pool = program.frame_pool
+    return {
+        'calls': pool.requested,
+        'frames_created': pool.created,
+        'allocations_per_call':
+            FRAME_ALLOCATIONS * pool.created / pool.requested,
+        'run_time': run_time,
+        'ns_per_call': run_time / pool.requested * 1e9
+    }
+
+
+def main():
+    from enums import Engines
+    from frames import POOL_CAPACITY
+
+    parser = ArgumentParser()
+    parser.add_argument('--engine', default=Engines.DEFAULT.value,
+                        choices=[engine.value for engine in Engines])
+    parser.add_argument('-O', dest='optimization', type=int, default=0,
+                        choices=[0, 1, 2])
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    modes = {'no-pool': 0, 'pool': POOL_CAPACITY}
+
+    print('{:<10} {:<8} {:>8} {:>8} {:>12} {:>10} {:>12}'.format(
+        'workload', 'mode', 'calls', 'frames', 'alloc/call', 'time [s]',
+        'ns/call'))
+
+    for workload in WORKLOADS:
+        for mode, capacity in modes.items():
+            result = measure(workload, capacity, arguments.engine,
+                             arguments.optimization, arguments.repeat)
+            print('{:<10} {:<8} {:>8} {:>8} {:>12.4f} {:>10.3f} {:>12.0f}'
+                  .format(workload, mode, result['calls'],
+                          result['frames_created'],
+                          result['allocations_per_call'],
+                          result['run_time'], result['ns_per_call']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Mikrobenchmarky jednotlivych instrukci. Pro kazdou instrukci se sestavi
+smycka, jejiz telo instrukci UNROLL krat opakuje, a program se provede primo
+metodou Program.run (bez spousteni interpret.py). Od doby behu se odecte doba
+prazdne smycky (rezie pocitadla a skoku).
+
+Pouziti: python3 benchmarks/opcodes.py [--engine E] [-O N] [--iterations N]
+                                       [OPCODE ...]
+"""
+
+from argparse import ArgumentParser
+from io import BytesIO, StringIO
+from os import path, devnull
+from xml.sax.saxutils import escape
+import json
+import sys
+import time
+
+INTERPRET_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+sys.path.insert(0, INTERPRET_DIR)
+
+from enums import ArgumentTypes, Engines  # noqa: E402
+from instruction_parser import InstructionsParser  # noqa: E402
+from instructions import OPCODE_TO_CLASS_MAP  # noqa: E402
+from input_reader import InputReader  # noqa: E402
+from output import Output  # noqa: E402
+from program import Program, link  # noqa: E402
+
+# Pocet opakovani tela v jedne iteraci smycky.
+UNROLL = 10
+
+# Vychozi pocet iteraci smycky.
+ITERATIONS = 20000
+
+# Mereni <nazev, (priprava, telo)>. Telo se opakuje UNROLL krat, {0} v tele
+# je poradove cislo opakovani (unikatni navesti). Instrukce zasobnikoveho
+# rozsireni potrebuji operandy na zasobniku, jejich telo proto obsahuje
+# i instrukce PUSHS a POPS. Doba CALL zahrnuje i instrukci RETURN.
+BENCHMARKS = {
+    'MOVE': (['DEFVAR GF@a'], ['MOVE GF@a int@1']),
+    'ADD': (['DEFVAR GF@a', 'MOVE GF@a int@1'], ['ADD GF@a GF@a int@1']),
+    'SUB': (['DEFVAR GF@a', 'MOVE GF@a int@1'], ['SUB GF@a GF@a int@1']),
+    'MUL': (['DEFVAR GF@a', 'MOVE GF@a int@1'], ['MUL GF@a GF@a int@1']),
+    'IDIV': (['DEFVAR GF@a', 'MOVE GF@a int@9'], ['IDIV GF@a GF@a int@1']),
+    'DIV': (['DEFVAR GF@a', 'MOVE GF@a float@0x1p+0'],
+            ['DIV GF@a GF@a float@0x1p+0']),
+    'LT': (['DEFVAR GF@a', 'DEFVAR GF@b', 'MOVE GF@b int@1'],
+           ['LT GF@a GF@b int@2']),
+    'EQ': (['DEFVAR GF@a', 'DEFVAR GF@b', 'MOVE GF@b string@abc'],
+           ['EQ GF@a GF@b string@abd']),
+    'AND': (['DEFVAR GF@a', 'MOVE GF@a bool@true'],
+            ['AND GF@a GF@a bool@true']),
+    'NOT': (['DEFVAR GF@a', 'MOVE GF@a bool@true'], ['NOT GF@a GF@a']),
+    'INT2CHAR': (['DEFVAR GF@a'], ['INT2CHAR GF@a int@97']),
+    'STRI2INT': (['DEFVAR GF@a'], ['STRI2INT GF@a string@abc int@1']),
+    'INT2FLOAT': (['DEFVAR GF@a'], ['INT2FLOAT GF@a int@3']),
+    'CONCAT': (['DEFVAR GF@a'], ['CONCAT GF@a string@abc string@def']),
+    'STRLEN': (['DEFVAR GF@a'], ['STRLEN GF@a string@abcdef']),
+    'GETCHAR': (['DEFVAR GF@a'], ['GETCHAR GF@a string@abcdef int@2']),
+    'SETCHAR': (['DEFVAR GF@a', 'MOVE GF@a string@abcdef'],
+                ['SETCHAR GF@a int@2 string@x']),
+    'TYPE': (['DEFVAR GF@a'], ['TYPE GF@a int@1']),
+    'WRITE': ([], ['WRITE int@42']),
+    'READ': (['DEFVAR GF@a'], ['READ GF@a int']),
+    'JUMP': ([], ['JUMP next{0}', 'LABEL next{0}']),
+    'JUMPIFEQ': (['DEFVAR GF@a', 'MOVE GF@a int@1'],
+                 ['JUMPIFEQ next{0} GF@a int@2', 'LABEL next{0}']),
+    'CALL': ([], ['CALL function']),
+    'CREATEFRAME': ([], ['CREATEFRAME']),
+    'PUSHFRAME': ([], ['CREATEFRAME', 'PUSHFRAME', 'POPFRAME']),
+    'PUSHS': (['DEFVAR GF@a'], ['PUSHS int@1', 'POPS GF@a']),
+    'ADDS': (['DEFVAR GF@a'], ['PUSHS int@1', 'PUSHS int@2', 'ADDS',
+                               'POPS GF@a']),
+    'LTS': (['DEFVAR GF@a'], ['PUSHS int@1', 'PUSHS int@2', 'LTS',
+                              'POPS GF@a']),
+    'NOTS': (['DEFVAR GF@a'], ['PUSHS bool@true', 'NOTS', 'POPS GF@a']),
+    'STRI2INTS': (['DEFVAR GF@a'], ['PUSHS string@abc', 'PUSHS int@1',
+                                    'STRI2INTS', 'POPS GF@a']),
+    'JUMPIFEQS': ([], ['PUSHS int@1', 'PUSHS int@2', 'JUMPIFEQS next{0}',
+                       'LABEL next{0}']),
+}
+
+# Funkce volana v mereni CALL (umistena za koncem smycky).
+FUNCTION = ['JUMP end', 'LABEL function', 'RETURN', 'LABEL end']
+
+
+def assemble(lines: list) -> str:
+    """ Prevod instrukci v textovem zapisu IPPcode20 do XML reprezentace. """
+
+    result = ['<?xml version="1.0" encoding="UTF-8"?>',
+              '<program language="IPPcode20">']
+
+    for order, line in enumerate(lines, 1):
+        opcode, *operands = line.split()
+        expected = OPCODE_TO_CLASS_MAP[opcode].expected_args
+        result.append('<instruction order="{}" opcode="{}">'
+                      .format(order, opcode))
+
+        for index, operand in enumerate(operands):
+            if expected[index] == ArgumentTypes.LABEL:
+                arg_type, value = 'label', operand
+            elif expected[index] == ArgumentTypes.TYPE:
+                arg_type, value = 'type', operand
+            elif operand[:3] in ('GF@', 'LF@', 'TF@'):
+                arg_type, value = 'var', operand
+            else:
+                arg_type, value = operand.split('@', 1)
+
+            result.append('<arg{0} type="{1}">{2}</arg{0}>'
+                          .format(index + 1, arg_type, escape(value)))
+
+        result.append('</instruction>')
+
+    result.append('</program>')
+    return '\n'.join(result)
+
+
+def build(setup: list, body: list, iterations: int) -> str:
+    """ Sestaveni programu se smyckou, ktera <iterations> krat provede telo
+    opakovane UNROLL krat. """
+
+    lines = ['DEFVAR GF@counter', 'MOVE GF@counter int@{}'.format(iterations)]
+    lines += setup
+    lines.append('LABEL loop')
+
+    for copy in range(UNROLL):
+        lines += [line.format(copy) for line in body]
+
+    lines += ['SUB GF@counter GF@counter int@1',
+              'JUMPIFNEQ loop GF@counter int@0']
+    return '\n'.join(lines + FUNCTION)
+
+
+def execute(source: str, engine: Engines, optimization: int) -> float:
+    """ Provedeni programu a vraceni doby behu (s). """
+
+    instructions = InstructionsParser.parse_file(StringIO(assemble(
+        source.splitlines())))
+    linked = link(instructions, optimization)
+
+    with open(devnull, 'w') as stream:
+        program = Program(linked, InputReader(BytesIO(), 'utf-8'), None,
+                          engine, optimization, Output(stream=stream))
+
+        start = time.perf_counter()
+        program.run()
+        return time.perf_counter() - start
+
+
+def measure(name: str, engine: Engines, optimization: int,
+            iterations: int, repeat: int = 3) -> dict:
+    """ Mereni jedne instrukce (nejlepsi z <repeat> behu).
+
+    Parameters
+    ----------
+    name: str
+        Nazev mereni (klic BENCHMARKS).
+    engine: Engines
+        Zpusob provadeni programu.
+    optimization: int
+        Uroven optimalizace (-O).
+    iterations: int
+        Pocet iteraci smycky.
+    repeat: int
+        Pocet opakovani mereni.
+    Returns
+    -------
+    dict
+        Doba jedne instrukce tela (ns) a pocet instrukci za sekundu.
+    """
+
+    setup, body = BENCHMARKS[name]
+    baseline = build(setup, [], iterations)
+    source = build(setup, body, iterations)
+
+    elapsed = min(execute(source, engine, optimization) -
+                  execute(baseline, engine, optimization)
+                  for _ in range(repeat))
+
+    # Navesti se pri propojeni odstrani, do poctu se nezapocitavaji.
+    count = sum(1 for line in body if not line.startswith('LABEL'))
+    per_instruction = max(elapsed, 0) / (iterations * UNROLL * count)
+
+    return {
+        'body': body,
+        'ns_per_instruction': round(per_instruction * 1e9, 2),
+        'instructions_per_second':
+            round(1 / per_instruction) if per_instruction > 0 else None
+    }
+
+
+def run(names: list, engine: Engines, optimization: int,
+        iterations: int = ITERATIONS, repeat: int = 3) -> dict:
+    """ Mereni vybranych instrukci (vsech, neni-li vyber zadan). """
+
+    return {name: measure(name, engine, optimization, iterations, repeat)
+            for name in (names or BENCHMARKS)}
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('names', nargs='*', metavar='OPCODE')
+    parser.add_argument('--engine', default=Engines.DEFAULT.value,
+                        choices=[engine.value for engine in Engines])
+    parser.add_argument('-O', dest='optimization', type=int, default=0,
+                        choices=[0, 1, 2])
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--repeat', type=int, default=3)
+    arguments = parser.parse_args()
+
+    for name in arguments.names:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark {}'.format(name))
+
+    results = run(arguments.names, Engines(arguments.engine),
+                  arguments.optimization, arguments.iterations,
+                  arguments.repeat)
+    json.dump(results, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Sada benchmarku interpretu. Meri typicke programy (adresar workloads)
+a jednotlive instrukce (opcodes.py) a vysledky vypisuje ve formatu JSON, aby
+je bylo mozne porovnavat mezi revizemi.
+
+U kazdeho programu se meri doba nacteni (XML a propojeni), doba behu, celkova
+doba, pocet provedenych instrukci, pocet instrukci za sekundu a spicka pameti
+(maxrss). Kazdy program se meri v samostatnem procesu, aby spicka pameti
+odpovidala pouze danemu programu.
+
+Pouziti: python3 benchmarks/run.py [--engine E] [-O N] [--scale N]
+                                   [--repeat N] [--output FILE]
+                                   [--workloads W ...] [--opcodes [OP ...]]
+"""
+
+from argparse import ArgumentParser
+from os import path, devnull
+from tempfile import NamedTemporaryFile
+from io import StringIO
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = path.dirname(path.abspath(__file__))
+INTERPRET_DIR = path.dirname(BENCHMARKS_DIR)
+WORKLOADS_DIR = path.join(BENCHMARKS_DIR, 'workloads')
+sys.path.insert(0, INTERPRET_DIR)
+
+
+def read_input(scale: int) -> str:
+    """ Dvojice radku (cislo, slovo) pro program read. """
+
+    return ''.join('{}\nword{}\n'.format(index * 7 % 1000, index % 100)
+                   for index in range(20000 * scale))
+
+
+# Programy <nazev, funkce vracejici vstup programu podle meritka>.
+WORKLOADS = {
+    'loop': lambda scale: '{}\n'.format(50000 * scale),
+    'fib': lambda scale: '{}\n'.format(17 + scale.bit_length()),
+    'ackermann': lambda scale: '3\n{}\n'.format(4 + scale.bit_length()),
+    'strings': lambda scale: '{}\n'.format(10000 * scale),
+    'stack': lambda scale: '{}\n'.format(20000 * scale),
+    'float': lambda scale: '{}\n'.format(20000 * scale),
+    'read': read_input,
+}
+
+
+def measure(workload: str, input_path: str, engine: str, optimization: int,
+            repeat: int):
+    """ Mereni jednoho programu (spousti se v podprocesu).
+
+    Program se jednou provede se statistikou --insts (pocet provedenych
+    instrukci) a <repeat> krat bez statistik (doba behu, pouzije se nejlepsi
+    vysledek). Vysledek se vypise na standardni vystup ve formatu JSON.
+    """
+
+    from enums import Engines
+    from instruction_parser import InstructionsParser
+    from input_reader import InputReader
+    from output import Output
+    from program import Program, link
+    from constant_pool import ConstantPool
+    from stats import Stats
+
+    start = time.perf_counter()
+
+    with open(path.join(WORKLOADS_DIR, workload + '.src'), 'r') as file:
+        pool = ConstantPool()
+        instructions = InstructionsParser.parse_file(file, pool)
+
+    parsed = time.perf_counter()
+    linked = link(instructions, optimization, pool)
+    linked_time = time.perf_counter() - parsed
+
+    def execute(stats: Stats) -> float:
+        with open(devnull, 'w') as stream:
+            program = Program(linked, InputReader.from_file(input_path),
+                              stats, Engines(engine), optimization,
+                              Output(stream=stream))
+
+            begin = time.perf_counter()
+            program.run()
+            return time.perf_counter() - begin
+
+    stats = Stats(StringIO(), True, False)
+    execute(stats)
+    run_time = min(execute(None) for _ in range(repeat))
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    json.dump({
+        'instructions': stats.insts_count,
+        'parse_time': round(parsed - start, 6),
+        'link_time': round(linked_time, 6),
+        'run_time': round(run_time, 6),
+        'wall_time': round(time.perf_counter() - start, 6),
+        'instructions_per_second':
+            round(stats.insts_count / run_time) if run_time > 0 else None,
+        'peak_rss_kib': usage.ru_maxrss
+    }, sys.stdout)
+
+
+def run_workload(workload: str, engine: str, optimization: int, scale: int,
+                 repeat: int) -> dict:
+    """ Spusteni mereni programu v samostatnem procesu. """
+
+    with NamedTemporaryFile('w', suffix='.in') as file:
+        file.write(WORKLOADS[workload](scale))
+        file.flush()
+
+        output = subprocess.run(
+            [sys.executable, __file__, '--measure', workload,
+             '--input', file.name, '--engine', engine,
+             '-O', str(optimization), '--repeat', str(repeat)],
+            check=True, capture_output=True, text=True).stdout
+
+    return json.loads(output)
+
+
+def revision() -> str:
+    """ Aktualni revize (git), pokud je k dispozici. """
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=INTERPRET_DIR, check=True,
+            capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    import opcodes
+    from enums import Engines
+
+    parser = ArgumentParser()
+    parser.add_argument('--engine', default=Engines.DEFAULT.value,
+                        choices=[engine.value for engine in Engines])
+    parser.add_argument('-O', dest='optimization', type=int, default=0,
+                        choices=[0, 1, 2])
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=str)
+    parser.add_argument('--workloads', nargs='*', choices=list(WORKLOADS),
+                        default=list(WORKLOADS))
+    parser.add_argument('--opcodes', nargs='*', metavar='OPCODE')
+    parser.add_argument('--measure', choices=list(WORKLOADS))
+    parser.add_argument('--input', type=str)
+    arguments = parser.parse_args()
+
+    if arguments.measure is not None:
+        measure(arguments.measure, arguments.input, arguments.engine,
+                arguments.optimization, arguments.repeat)
+        return
+
+    for name in arguments.opcodes or []:
+        if name not in opcodes.BENCHMARKS:
+            parser.error('unknown opcode benchmark {}'.format(name))
+
+    results = {
+        'revision': revision(),
+        'python': platform.python_version(),
+        'engine': arguments.engine,
+        'optimization': arguments.optimization,
+        'scale': arguments.scale,
+        'workloads': {
+            workload: run_workload(workload, arguments.engine,
+                                   arguments.optimization, arguments.scale,
+                                   arguments.repeat)
+            for workload in arguments.workloads
+        }
+    }
+
+    # Mikrobenchmarky instrukci se provadi pouze na vyzadani (--opcodes,
+    # bez nazvu = vsechny instrukce).
+    if arguments.opcodes is not None:
+        results['opcodes'] = opcodes.run(
+            arguments.opcodes, Engines(arguments.engine),
+            arguments.optimization, repeat=arguments.repeat)
+
+    if arguments.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        with open(arguments.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Porovnani nacitani XML reprezentace programu: puvodni zpusob (cely strom
+ElementTree, slovnik podle order, serazeni do noveho slovniku a kopie do
+seznamu) a postupne nacitani (InstructionsParser.parse_file).
+
+Kazde mereni probiha v samostatnem procesu, aby spicka pameti (maxrss)
+odpovidala pouze danemu zpusobu nacteni.
+
+Pouziti: python3 benchmarks/xml_loader.py [--instructions N] [--shuffle]
+"""
+
+from argparse import ArgumentParser
+from os import path
+from tempfile import NamedTemporaryFile
+import random
+import resource
+import subprocess
+import sys
+import time
+
+INTERPRET_DIR = path.dirname(path.dirname(path.abspath(__file__)))
+sys.path.insert(0, INTERPRET_DIR)
+
+# Opakujici se vzor instrukci generovaneho programu.
+PATTERN = [
+    ('DEFVAR', [('var', 'GF@v{0}')]),
+    ('MOVE', [('var', 'GF@v{0}'), ('int', '{0}')]),
+    ('ADD', [('var', 'GF@v{0}'), ('var', 'GF@v{0}'), ('int', '1')]),
+    ('CONCAT', [('var', 'GF@s'), ('string', 'a\\032b'), ('string', 'c')]),
+    ('JUMPIFEQ', [('label', 'end'), ('var', 'GF@v{0}'), ('nil', 'nil')]),
+    ('WRITE', [('float', '0x1.8p+{1}')])
+]
+
+
+def generate(file, count: int, shuffle: bool):
+    """ Zapis programu s <count> instrukcemi. """
+
+    orders = list(range(1, count + 1))
+    if shuffle:
+        random.Random(0).shuffle(orders)
+
+    file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    file.write('<program language="IPPcode20">\n')
+
+    for position, order in enumerate(orders):
+        opcode, args = PATTERN[position % len(PATTERN)]
+        file.write('  <instruction order="{}" opcode="{}">\n'
+                   .format(order, opcode))
+
+        for index, (arg_type, value) in enumerate(args):
+            file.write('    <arg{0} type="{1}">{2}</arg{0}>\n'.format(
+                index + 1, arg_type, value.format(position, position % 8)))
+
+        file.write('  </instruction>\n')
+
+    file.write('</program>\n')
+
+
+def load_tree(source: str) -> list:
+    """ Puvodni zpusob nacteni (cely strom, slovnik, serazeni, seznam). """
+
+    from xml.etree.ElementTree import parse as parse_xml
+    from instruction_parser import InstructionsParser
+
+    root = parse_xml(source).getroot()
+    result = dict()
+
+    for element in list(root):
+        order = int(element.attrib.get('order'))
+        result[order] = InstructionsParser.parse_instruction(element, order)
+
+    return list(dict(sorted(result.items())).values())
+
+
+def load_stream(source: str) -> list:
+    """ Postupne nacteni (iterparse). """
+
+    from instruction_parser import InstructionsParser
+
+    with open(source, 'r') as file:
+        return InstructionsParser.parse_file(file)
+
+
+LOADERS = {'tree': load_tree, 'stream': load_stream}
+
+
+def measure(loader: str, source: str):
+    """ Mereni jednoho zpusobu nacteni (spousti se v podprocesu). """
+
+    start = time.perf_counter()
+    instructions = LOADERS[loader](source)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print('{} {:.3f} {}'.format(len(instructions), elapsed, peak))
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--instructions', type=int, default=300000)
+    parser.add_argument('--shuffle', default=False, action='store_true')
+    parser.add_argument('--measure', choices=list(LOADERS))
+    parser.add_argument('--source', type=str)
+    arguments = parser.parse_args()
+
+    if arguments.measure is not None:
+        measure(arguments.measure, arguments.source)
+        return
+
+    with NamedTemporaryFile('w', suffix='.xml') as file:
+        generate(file, arguments.instructions, arguments.shuffle)
+        file.flush()
+
+        print('{:<8} {:>12} {:>10} {:>14}'.format(
+            'loader', 'instructions', 'time [s]', 'maxrss [KiB]'))
+
+        for loader in LOADERS:
+            output = subprocess.run(
+                [sys.executable, __file__, '--measure', loader,
+                 '--source', file.name],
+                check=True, capture_output=True, text=True).stdout
+            count, elapsed, peak = output.split()
+            print('{:<8} {:>12} {:>10} {:>14}'.format(
+                loader, count, elapsed, peak))
+
+
+if __name__ == '__main__':
+    main()
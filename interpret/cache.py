@@ -0,0 +1,102 @@
+from hashlib import sha256
+from typing import BinaryIO
+from program import LinkedProgram
+from tempfile import NamedTemporaryFile
+import os
+import pickle
+import sys
+
+# Adresar se zdrojovymi soubory interpretu.
+INTERPRET_DIR = os.path.dirname(os.path.abspath(__file__))
+# Velikost bloku pri vypoctu otisku zdrojoveho souboru.
+CHUNK_SIZE = 1 << 20
+# Pripona souboru v cache.
+CACHE_SUFFIX = '.ippc'
+
+
+def interpreter_fingerprint() -> bytes:
+    """
+    Otisk interpretu (verze Pythonu a obsah vsech modulu interpretu). Jakakoliv
+    zmena interpretu tak vede k novemu klici a stara cache se nepouzije.
+    """
+
+    digest = sha256(sys.implementation.cache_tag.encode())
+
+    for name in sorted(os.listdir(INTERPRET_DIR)):
+        if name.endswith('.py'):
+            digest.update(name.encode())
+
+            with open(os.path.join(INTERPRET_DIR, name), 'rb') as file:
+                digest.update(file.read())
+
+    return digest.digest()
+
+
+class ProgramCache():
+    """
+    Cache nactenych a propojenych programu (parametr --cache-dir). Kazdy
+    program je ulozen v samostatnem souboru (pickle), jehoz nazev je otisk
+    zdrojoveho XML, interpretu a urovne optimalizace.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def key(self, source: BinaryIO, optimization: int) -> str:
+        """ Vypocet klice programu.
+
+        Parameters
+        ----------
+        source: BinaryIO
+            Zdrojovy soubor (XML reprezentace programu). Cte se po blocich.
+        optimization: int
+            Uroven optimalizace (parametr -O), ovlivnuje propojeny program.
+        Returns
+        -------
+        str
+            Klic (sestnactkovy zapis otisku SHA-256).
+        """
+
+        digest = sha256(interpreter_fingerprint())
+        digest.update('-O{}'.format(optimization).encode())
+
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, key: str) -> LinkedProgram:
+        """ Nacteni programu z cache. Vraci None, pokud v cache neni. """
+
+        try:
+            with open(self.path(key), 'rb') as file:
+                linked = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Poskozeny nebo nekompatibilni soubor se ignoruje (prepise se).
+            return None
+
+        return linked if type(linked) is LinkedProgram else None
+
+    def store(self, key: str, linked: LinkedProgram):
+        """
+        Ulozeni programu do cache. Soubor se zapise pod docasnym nazvem
+        a pak se prejmenuje, soubezne behy tak nikdy neprectou cast souboru.
+        Chyba pri zapisu neni chybou interpretu (program se pouze neulozi).
+        """
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+
+            with NamedTemporaryFile('wb', dir=self.directory,
+                                    suffix=CACHE_SUFFIX + '.tmp',
+                                    delete=False) as file:
+                pickle.dump(linked, file, pickle.HIGHEST_PROTOCOL)
+
+            os.replace(file.name, self.path(key))
+        except OSError:
+            pass
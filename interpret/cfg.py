@@ -0,0 +1,224 @@
+from typing import Dict, List, Set
+from enums import exitCodes
+from helper import exit_app
+import instructions as instrs
+
+
+def collect_labels(instructions: List['instrs.InstructionBase']) -> \
+        Dict[str, int]:
+    """ Pozice navesti (instrukci LABEL) v seznamu instrukci. """
+
+    labels: Dict[str, int] = dict()
+
+    for position, instruction in enumerate(instructions):
+        if type(instruction) is instrs.Label:
+            if instruction.name.name in labels:
+                exit_app(exitCodes.SEMANTIC_ERROR,
+                         'Detected label redefinition.', True)
+
+            labels[instruction.name.name] = position
+
+    return labels
+
+
+def ends_block(instruction: 'instrs.InstructionBase') -> bool:
+    """ Instrukce meni tok programu (za ni zacina novy zakladni blok). """
+
+    return isinstance(instruction, (instrs.Jump, instrs.Return, instrs.Exit))
+
+
+def falls_through(instruction: 'instrs.InstructionBase') -> bool:
+    """ Po instrukci muze program pokracovat nasledujici instrukci. Za
+    volanim (CALL) se pokracuje po navratu z funkce (RETURN). """
+
+    kind = type(instruction)
+    return kind is not instrs.Jump and kind is not instrs.Return and \
+        kind is not instrs.Exit
+
+
+def escape(text: str) -> str:
+    """ Escapovani textu pro retezec jazyka DOT. """
+
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+class BasicBlock():
+    """ Zakladni blok (instrukce na pozicich start az stop - 1). """
+
+    __slots__ = ('index', 'start', 'stop', 'target', 'fallthrough',
+                 'predecessors')
+
+    def __init__(self, index: int, start: int, stop: int):
+        self.index = index
+        self.start = start
+        self.stop = stop
+        # Blok cile skoku nebo volani a blok, kterym program pokracuje po
+        # posledni instrukci bloku. None = hrana neexistuje (konec programu).
+        self.target: int = None
+        self.fallthrough: int = None
+        # Bloky, ze kterych vede hrana do tohoto bloku (bez opakovani).
+        self.predecessors: List[int] = list()
+
+    @property
+    def successors(self) -> List[int]:
+        return [index for index in dict.fromkeys([self.target,
+                                                  self.fallthrough])
+                if index is not None]
+
+
+class ControlFlowGraph():
+    """
+    Graf toku rizeni programu rozdeleneho na zakladni bloky.
+
+    Blok zacina na navesti (cili skoku) a za instrukcemi skoku, volani,
+    RETURN a EXIT. Po volani program pokracuje nasledujicim blokem (tam se
+    vraci RETURN), RETURN proto v grafu nema zadne hrany. Graf lze sestavit
+    nad instrukcemi vcetne navesti (pred propojenim) i nad propojenym
+    programem (instrukce bez navesti a pozice navesti).
+    """
+
+    def __init__(self, instructions: List['instrs.InstructionBase'],
+                 labels: Dict[str, int] = None):
+        """
+        Parameters
+        ----------
+        instructions: List[InstructionBase]
+            Instrukce programu.
+        labels: Dict[str, int]
+            Pozice navesti propojeneho programu. Neni-li zadano, navesti se
+            hledaji v instrukcich (instrukce LABEL).
+        """
+
+        self.instructions = instructions
+        # <label, instructionPosition>
+        self.labels = collect_labels(instructions) if labels is None \
+            else labels
+        self.blocks: List[BasicBlock] = list()
+        # Blok zacinajici na pozici <instructionPosition, blockIndex>
+        self.block_at: Dict[int, int] = dict()
+
+        self.split()
+        self.connect()
+
+    def target(self, instruction: 'instrs.Jump') -> int:
+        """ Pozice cile skoku. Nedefinovane navesti se nahlasi jiz zde,
+        tedy i ve skoku, ktery neni dosazitelny. """
+
+        label = instruction.args[0].name
+        if label not in self.labels:
+            exit_app(exitCodes.SEMANTIC_ERROR,
+                     'Undefined label to jump. ({})'.format(label), True)
+
+        return self.labels[label]
+
+    def split(self):
+        """ Rozdeleni instrukci na zakladni bloky. """
+
+        end = len(self.instructions)
+        leaders: Set[int] = {0} | set(self.labels.values())
+
+        for position, instruction in enumerate(self.instructions):
+            if ends_block(instruction):
+                leaders.add(position + 1)
+
+        leaders = sorted(position for position in leaders if position < end)
+        for index, (start, stop) in enumerate(zip(leaders,
+                                                  leaders[1:] + [end])):
+            self.blocks.append(BasicBlock(index, start, stop))
+            self.block_at[start] = index
+
+    def connect(self):
+        """ Hrany mezi bloky (skoky, volani a pokracovani dalsim blokem).
+        Skok na konec programu (navesti za posledni instrukci) hranu
+        nema. """
+
+        for block in self.blocks:
+            last = self.last(block)
+
+            if isinstance(last, instrs.Jump):
+                block.target = self.block_at.get(self.target(last))
+            if falls_through(last):
+                block.fallthrough = self.block_at.get(block.stop)
+
+            for successor in block.successors:
+                self.blocks[successor].predecessors.append(block.index)
+
+    def last(self, block: BasicBlock) -> 'instrs.InstructionBase':
+        return self.instructions[block.stop - 1]
+
+    def reachable(self) -> Set[int]:
+        """ Bloky dosazitelne ze zacatku programu. """
+
+        if len(self.blocks) == 0:
+            return set()
+
+        visited = {0}
+        pending = [0]
+
+        while len(pending) > 0:
+            for successor in self.blocks[pending.pop()].successors:
+                if successor not in visited:
+                    visited.add(successor)
+                    pending.append(successor)
+
+        return visited
+
+    def live_instructions(self) -> List['instrs.InstructionBase']:
+        """ Odstraneni nedosazitelnych instrukci a nepouzitych navesti.
+
+        Returns
+        -------
+        List[InstructionBase]
+            Instrukce dosazitelnych bloku (v puvodnim poradi) bez navesti,
+            na ktera neskace zadna dosazitelna instrukce.
+        """
+
+        reachable = sorted(self.reachable())
+        used: Set[str] = set()
+
+        for index in reachable:
+            last = self.last(self.blocks[index])
+            if isinstance(last, instrs.Jump):
+                used.add(last.args[0].name)
+
+        return [instruction
+                for index in reachable
+                for instruction in self.instructions[
+                    self.blocks[index].start:self.blocks[index].stop]
+                if type(instruction) is not instrs.Label or
+                instruction.name.name in used]
+
+    def to_dot(self) -> str:
+        """ Graf ve formatu DOT (Graphviz). Nedosazitelne bloky jsou sede,
+        hrany pokracovani dalsim blokem carkovane. """
+
+        reachable = self.reachable()
+        lines = ['digraph cfg {', '    node [shape=box, fontname=monospace];']
+
+        for block in self.blocks:
+            rows = ['B{} [{}, {})'.format(block.index, block.start,
+                                          block.stop)]
+            for position in range(block.start, block.stop):
+                instruction = self.instructions[position]
+                row = '{}: {}'.format(position, instruction.opcode)
+                if isinstance(instruction, (instrs.Jump, instrs.Label)):
+                    row += ' ' + instruction.args[0].name
+                rows.append(row)
+
+            style = '' if block.index in reachable \
+                else ', style=filled, fillcolor=lightgray'
+            lines.append('    B{} [label="{}\\l"{}];'.format(
+                block.index, '\\l'.join(escape(row) for row in rows), style))
+
+        for block in self.blocks:
+            if block.target is not None:
+                kind = 'call' if isinstance(self.last(block), instrs.Call) \
+                    else 'jump'
+                lines.append('    B{} -> B{} [label="{}"];'.format(
+                    block.index, block.target, kind))
+            if block.fallthrough is not None:
+                lines.append('    B{} -> B{} [style=dashed];'.format(
+                    block.index, block.fallthrough))
+
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
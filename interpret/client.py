@@ -0,0 +1,229 @@
+"""
+Klient interpretu spusteneho v rezimu --serve (daemon.py). Prijima stejne
+parametry jako interpret.py, pozadavek odesle na socket zadany promennou
+prostredi IPP_INTERPRET_SOCKET (nebo parametrem --socket) a vypise vysledek.
+Importuje pouze nekolik standardnich modulu, takze spusteni je vyrazne
+rychlejsi nez spusteni celeho interpretu.
+
+Neni-li server dostupny nebo jsou-li zadany parametry, ktere klient
+nepodporuje (nebo chybne parametry), provede se primo interpret.py se
+stejnymi parametry. Vstup instrukce READ ze standardniho vstupu se serveru
+preda pouze tehdy, lze-li jej precist cely bez cekani (soubor, uzavrena
+prazdna roura). Interaktivni vstup a otevrenou rouru cte az interpret
+instrukci READ, stejne jako bez klienta. Spojeni se serverem se navaze pred ctenim standardniho
+vstupu, jiz precteny vstup se pri selhani pozadavku preda interpretu rourou.
+
+Pouziti: python3 client.py [--socket=SOCKET] --source=FILE --input=FILE ...
+"""
+
+from hashlib import sha256
+from select import select
+from termios import FIONREAD
+import fcntl
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+
+SOCKET_VARIABLE = 'IPP_INTERPRET_SOCKET'
+INTERPRET = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'interpret.py')
+
+# Parametry s hodnotou a priznaky, ktere klient predava serveru.
+VALUE_OPTIONS = ('--source', '--input', '--stats', '--engine', '--socket')
+STATS_FLAGS = ('--insts', '--vars', '--checks', '--pool-size', '--pool-hits')
+
+
+def fallback(consumed: bytes = None):
+    """ Provedeni interpret.py se stejnymi parametry (bez serveru).
+
+    Parameters
+    ----------
+    consumed: bytes
+        Jiz precteny standardni vstup (program nebo vstup instrukce READ).
+        Interpret jej cte z roury, do ktere jej zapise potomek klienta.
+    """
+
+    arguments = [argument for argument in sys.argv[1:]
+                 if not argument.startswith('--socket=')]
+
+    if consumed is not None:
+        read_fd, write_fd = os.pipe()
+
+        if os.fork() == 0:
+            os.close(read_fd)
+            try:
+                with os.fdopen(write_fd, 'wb') as pipe:
+                    pipe.write(consumed)
+            except OSError:
+                pass
+            os._exit(0)
+
+        os.close(write_fd)
+        os.dup2(read_fd, sys.stdin.fileno())
+        os.close(read_fd)
+
+    os.execv(sys.executable, [sys.executable, INTERPRET] + arguments)
+
+
+def stdin_complete() -> bool:
+    """ Standardni vstup lze precist cely bez cekani na dalsi data (neni
+    terminal a je to soubor nebo roura, ktera je jiz na konci). """
+
+    if sys.stdin is None:
+        return False
+
+    descriptor = sys.stdin.fileno()
+    if os.isatty(descriptor):
+        return False
+
+    if stat.S_ISREG(os.fstat(descriptor).st_mode):
+        return True
+
+    # Roura je na konci, pokud je citelna a neobsahuje zadna data.
+    readable, _, _ = select([descriptor], [], [], 0)
+    if not readable:
+        return False
+
+    try:
+        available = fcntl.ioctl(descriptor, FIONREAD, b'\0' * 4)
+    except OSError:
+        return False
+
+    return struct.unpack('i', available)[0] == 0
+
+
+def parse_arguments(argv: list) -> dict:
+    """ Zpracovani parametru. Vraci None, pokud je nelze predat serveru. """
+
+    options = {'stats_order': list(), 'optimization': 0}
+    index = 0
+
+    while index < len(argv):
+        argument = argv[index]
+        name, separator, value = argument.partition('=')
+
+        if name in VALUE_OPTIONS and separator:
+            options[name[2:]] = value
+        elif argument in STATS_FLAGS:
+            options['stats_order'].append(argument[2:])
+        elif argument in ('-O0', '-O1', '-O2'):
+            options['optimization'] = int(argument[2])
+        elif argument == '-O' and index + 1 < len(argv) and \
+                argv[index + 1] in ('0', '1', '2'):
+            index += 1
+            options['optimization'] = int(argv[index])
+        else:
+            return None
+
+        index += 1
+
+    if 'source' not in options and 'input' not in options:
+        return None
+
+    if ('stats' in options) != (len(options['stats_order']) > 0):
+        return None
+
+    return options
+
+
+def request(connection: socket.socket, stream, message: dict) -> dict:
+    """ Odeslani pozadavku a prijeti odpovedi (radky JSON). """
+
+    connection.sendall((json.dumps(message) + '\n').encode())
+    response = stream.readline()
+    if not response:
+        raise ConnectionError('Connection closed by server.')
+
+    return json.loads(response)
+
+
+def process(options: dict, connection: socket.socket, stream):
+    """ Nacteni programu a vstupu, provedeni na serveru a vypis vysledku. """
+
+    # Precteny standardni vstup (pro predani interpretu pri selhani).
+    consumed: bytes = None
+
+    try:
+        if 'source' in options:
+            with open(options['source'], 'r') as file:
+                source = file.read()
+        else:
+            consumed = sys.stdin.buffer.read()
+            source = consumed.decode(sys.stdin.encoding, 'surrogateescape')
+
+        if 'input' in options:
+            with open(options['input'], 'rb') as file:
+                data_input = file.read()
+        else:
+            consumed = data_input = sys.stdin.buffer.read()
+
+        stats_file = open(options['stats'], 'w') \
+            if 'stats' in options else None
+    except OSError:
+        fallback(consumed)
+
+    digest = sha256(source.encode('utf-8', 'surrogateescape'))
+    digest.update(b'-O%d' % options['optimization'])
+
+    message = {
+        'key': digest.hexdigest(),
+        'input': data_input.decode('utf-8', 'surrogateescape'),
+        'stats': options['stats_order'],
+        'engine': options.get('engine', 'default'),
+        'optimization': options['optimization']
+    }
+
+    try:
+        response = request(connection, stream, message)
+        if 'error' in response and 'key' in response:
+            # Program na serveru neni nacten, odesle se i jeho zdroj.
+            message['source'] = source
+            response = request(connection, stream, message)
+    except (OSError, ValueError):
+        fallback(consumed)
+
+    if 'error' in response:
+        fallback(consumed)
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+
+    if stats_file is not None:
+        for option in options['stats_order']:
+            value = response['stats'][option]
+            stats_file.write('{:.4f}\n'.format(value)
+                             if option == 'pool-hits'
+                             else '{}\n'.format(value))
+        stats_file.close()
+
+    sys.exit(response['exit_code'])
+
+
+def main():
+    options = parse_arguments(sys.argv[1:])
+    path = None if options is None else \
+        options.get('socket', os.environ.get(SOCKET_VARIABLE))
+
+    # Vstup instrukce READ ze standardniho vstupu, ktery by se cekanim na
+    # konec vstupu zablokoval, cte az interpret (pri provedeni READ).
+    if path is None or ('input' not in options and not stdin_complete()):
+        fallback()
+
+    # Spojeni se navaze jeste pred ctenim standardniho vstupu, nedostupny
+    # server se tak resi bez nutnosti predavat vstup interpretu.
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        fallback()
+
+    with connection, connection.makefile('rb') as stream:
+        process(options, connection, stream)
+
+
+if __name__ == '__main__':
+    main()
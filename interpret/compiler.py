@@ -0,0 +1,877 @@
+from functools import partial
+from operator import add, sub, mul, lt, gt
+from typing import Callable, Dict, List
+from enums import DataTypes, Frames, exitCodes
+from helper import (exit_app, validate_math_symbols,
+                    validate_comparable_symbols)
+from models import (Symbol, Variable, StringBuffer, NIL_SYMBOL, bool_symbol,
+                    int_symbol, float_symbol, string_symbol, render)
+from frames import UNDEFINED
+from input_reader import PARSERS
+
+# Prelozena instrukce. Vola se bez parametru, program je jiz navazan.
+Step = Callable[[], None]
+# Funkce vracejici hodnotu operandu <symb>.
+Reader = Callable[[], Symbol]
+# Funkce ukladajici hodnotu do promenne <var>.
+Writer = Callable[[Symbol], None]
+
+INT = DataTypes.INT
+FLOAT = DataTypes.FLOAT
+BOOL = DataTypes.BOOL
+STRING = DataTypes.STRING
+NIL = DataTypes.NIL
+
+# Instrukce, jejichz vypocet lze provest primo operatorem nad hodnotami.
+ARITHMETIC_OPERATORS = {
+    'ADD': add, 'SUB': sub, 'MUL': mul,
+    'ADDS': add, 'SUBS': sub, 'MULS': mul
+}
+
+COMPARE_OPERATORS = {
+    'LT': lt, 'GT': gt,
+    'LTS': lt, 'GTS': gt
+}
+
+
+def undefined_variable(opcode: str, name: str):
+    exit_app(exitCodes.UNDEFINED_VARIABLE,
+             '{}\nVariable {} not exists'.format(opcode, name), True)
+
+
+def undefined_value(opcode: str):
+    exit_app(exitCodes.UNDEFINED_VALUE,
+             '{}\nSymbol or variable is undefined.'.format(opcode))
+
+
+def stack_underflow(opcode: str, count: int):
+    exit_app(exitCodes.UNDEFINED_VALUE,
+             'Invalid count of required arguments in stack at' +
+             ' instruction {}. Count of values in data_stack: {}'
+             .format(opcode, count))
+
+
+def missing_local_frame():
+    exit_app(exitCodes.INVALID_FRAME, 'Local frame stack is empty.', True)
+
+
+def missing_temporary_frame():
+    exit_app(exitCodes.INVALID_FRAME, 'Temporary frame is unitialized', True)
+
+
+def compile_reader(program, opcode: str, symb: Symbol or Variable,
+                   required: bool = True) -> Reader:
+    """ Sestaveni funkce pro ziskani hodnoty operandu.
+
+    Parameters
+    ----------
+    program: Program
+        Program, nad jehoz ramci bude funkce pracovat.
+    opcode: str
+        Operacni kod instrukce. Pouziva se pouze pri hlaseni chyb.
+    symb: Symbol or Variable
+        Operand instrukce.
+    required: bool, optional
+        Priznak, ze promenna musi obsahovat hodnotu. (Vychozi hodnota je True)
+    """
+
+    if type(symb) is not Variable:
+        return lambda: symb
+
+    name = symb.value
+    slot = symb.slot
+
+    if symb.frame == Frames.GLOBAL:
+        values = program.GF.values
+
+        def read_global():
+            value = values[slot]
+
+            if value is UNDEFINED:
+                undefined_variable(opcode, name)
+            if value is None and required:
+                undefined_value(opcode)
+            return value
+
+        return read_global
+    elif symb.frame == Frames.LOCAL:
+        lf_stack = program.LF_Stack
+
+        def read_local():
+            if not lf_stack:
+                missing_local_frame()
+
+            value = lf_stack[-1].values[slot]
+
+            if value is UNDEFINED:
+                undefined_variable(opcode, name)
+            if value is None and required:
+                undefined_value(opcode)
+            return value
+
+        return read_local
+
+    def read_temporary():
+        frame = program.TF
+        if frame is None:
+            missing_temporary_frame()
+
+        value = frame.values[slot]
+
+        if value is UNDEFINED:
+            undefined_variable(opcode, name)
+        if value is None and required:
+            undefined_value(opcode)
+        return value
+
+    return read_temporary
+
+
+def compile_writer(program, opcode: str, var: Variable) -> Writer:
+    """ Sestaveni funkce pro ulozeni hodnoty do existujici promenne. """
+
+    name = var.value
+    slot = var.slot
+
+    if var.frame == Frames.GLOBAL:
+        values = program.GF.values
+
+        def write_global(value: Symbol):
+            if values[slot] is UNDEFINED:
+                undefined_variable(opcode, name)
+            values[slot] = value
+
+        return write_global
+    elif var.frame == Frames.LOCAL:
+        lf_stack = program.LF_Stack
+
+        def write_local(value: Symbol):
+            if not lf_stack:
+                missing_local_frame()
+
+            values = lf_stack[-1].values
+            if values[slot] is UNDEFINED:
+                undefined_variable(opcode, name)
+            values[slot] = value
+
+        return write_local
+
+    def write_temporary(value: Symbol):
+        frame = program.TF
+        if frame is None:
+            missing_temporary_frame()
+
+        values = frame.values
+        if values[slot] is UNDEFINED:
+            undefined_variable(opcode, name)
+        values[slot] = value
+
+    return write_temporary
+
+
+# 6.4.1 Prace s ramci, volani funkci
+def compile_move(program, instruction) -> Step:
+    read = compile_reader(program, 'MOVE', instruction.args[1], False)
+    write = compile_writer(program, 'MOVE', instruction.args[0])
+
+    def move():
+        symb = read()
+
+        # Menitelny retezec patri pouze zdrojove promenne.
+        if type(symb) is StringBuffer:
+            symb = symb.snapshot()
+
+        write(symb)
+
+    return move
+
+
+def compile_createframe(program, instruction) -> Step:
+    stats = program.stats
+    acquire = program.frame_pool.acquire
+    release = program.frame_pool.release
+
+    def createframe():
+        if stats is not None:
+            stats.replace_frame(program.TF, None)
+
+        release(program.TF)
+        program.TF = acquire()
+
+    return createframe
+
+
+def compile_pushframe(program, instruction) -> Step:
+    lf_stack = program.LF_Stack
+    stats = program.stats
+
+    def pushframe():
+        if program.TF is None:
+            exit_app(exitCodes.INVALID_FRAME,
+                     'PUSHFRAME\nInvalid access to undefined temporary ' +
+                     'frame.', True)
+
+        if stats is not None and lf_stack:
+            stats.replace_frame(lf_stack[-1], None)
+
+        lf_stack.append(program.TF)
+        program.TF = None
+
+    return pushframe
+
+
+def compile_popframe(program, instruction) -> Step:
+    lf_stack = program.LF_Stack
+    stats = program.stats
+    release = program.frame_pool.release
+
+    def popframe():
+        if not lf_stack:
+            exit_app(exitCodes.INVALID_FRAME,
+                     'POPFRAME\nNo available local frame.', True)
+
+        if stats is not None:
+            stats.replace_frame(program.TF,
+                                lf_stack[-2] if len(lf_stack) > 1 else None)
+
+        release(program.TF)
+        program.TF = lf_stack.pop()
+
+    return popframe
+
+
+def compile_defvar(program, instruction) -> Step:
+    var: Variable = instruction.args[0]
+    slot = var.slot
+    stats = program.stats
+
+    def define(frame):
+        if frame.values[slot] is not UNDEFINED:
+            exit_app(exitCodes.SEMANTIC_ERROR,
+                     'DEFVAR\nVariable {} now exists. Cannot redefine.'
+                     .format(var.value), True)
+
+        frame.values[slot] = None
+        frame.count += 1
+
+        if stats is not None:
+            stats.increment_vars()
+
+    if var.frame == Frames.GLOBAL:
+        frame = program.GF
+
+        def defvar_global():
+            define(frame)
+
+        return defvar_global
+    elif var.frame == Frames.LOCAL:
+        lf_stack = program.LF_Stack
+
+        def defvar_local():
+            if not lf_stack:
+                missing_local_frame()
+            define(lf_stack[-1])
+
+        return defvar_local
+
+    def defvar_temporary():
+        if program.TF is None:
+            missing_temporary_frame()
+        define(program.TF)
+
+    return defvar_temporary
+
+
+def compile_call(program, instruction) -> Step:
+    call_stack = program.call_stack
+    target = instruction.target
+
+    def call():
+        call_stack.append(program.instruction_pointer)
+        program.instruction_pointer = target
+
+    return call
+
+
+def compile_return(program, instruction) -> Step:
+    call_stack = program.call_stack
+
+    def return_():
+        if not call_stack:
+            exit_app(exitCodes.UNDEFINED_VALUE,
+                     'RETURN\nEmpty call stack.', True)
+        program.instruction_pointer = call_stack.pop()
+
+    return return_
+
+
+# Prace s datovym zasobnikem
+def compile_pushs(program, instruction) -> Step:
+    read = compile_reader(program, 'PUSHS', instruction.args[0])
+    data_stack = program.data_stack
+
+    def pushs():
+        symb = read()
+
+        if type(symb) is StringBuffer:
+            symb = symb.snapshot()
+
+        data_stack.append(symb)
+
+    return pushs
+
+
+def compile_pops(program, instruction) -> Step:
+    write = compile_writer(program, 'POPS', instruction.args[0])
+    data_stack = program.data_stack
+
+    def pops():
+        if not data_stack:
+            exit_app(exitCodes.UNDEFINED_VALUE,
+                     'POPS\nInstruction POPS. Data Stack is empty.', True)
+
+        write(data_stack.pop())
+
+    return pops
+
+
+# 6.4.3 Aritmeticke, relacni, booleovske a konverzni instrukce
+def compile_math(program, instruction) -> Step:
+    opcode = instruction.opcode
+    read1 = compile_reader(program, opcode, instruction.args[1])
+    read2 = compile_reader(program, opcode, instruction.args[2])
+    write = compile_writer(program, opcode, instruction.args[0])
+    operation = ARITHMETIC_OPERATORS.get(opcode)
+    compute = instruction.compute
+    checked = instruction.checked
+
+    def math():
+        symb1 = read1()
+        symb2 = read2()
+
+        data_type = symb1.data_type
+        if checked and (data_type is not symb2.data_type or
+                        (data_type is not INT and data_type is not FLOAT)):
+            validate_math_symbols(opcode, symb1, symb2)
+
+        if operation is None:
+            write(compute(symb1, symb2))
+        else:
+            value = operation(symb1.value, symb2.value)
+            write(int_symbol(value) if data_type is INT
+                  else float_symbol(value))
+
+    return math
+
+
+def compile_stack_math(program, instruction) -> Step:
+    opcode = instruction.opcode
+    data_stack = program.data_stack
+    operation = ARITHMETIC_OPERATORS.get(opcode)
+    compute = instruction.compute
+    checked = instruction.checked
+
+    def stack_math():
+        if len(data_stack) < 2:
+            stack_underflow(opcode, len(data_stack))
+
+        # Vysledek prepise prvni operand na vrcholu zasobniku.
+        symb2 = data_stack.pop()
+        symb1 = data_stack[-1]
+
+        data_type = symb1.data_type
+        if checked and (data_type is not symb2.data_type or
+                        (data_type is not INT and data_type is not FLOAT)):
+            validate_math_symbols(opcode, symb1, symb2)
+
+        if operation is None:
+            data_stack[-1] = compute(symb1, symb2)
+        else:
+            value = operation(symb1.value, symb2.value)
+            data_stack[-1] = int_symbol(value) if data_type is INT \
+                else float_symbol(value)
+
+    return stack_math
+
+
+def compile_compare(program, instruction) -> Step:
+    opcode = instruction.opcode
+    read1 = compile_reader(program, opcode, instruction.args[1])
+    read2 = compile_reader(program, opcode, instruction.args[2])
+    write = compile_writer(program, opcode, instruction.args[0])
+    allowed_types = tuple(instruction.allowedTypes)
+    operation = COMPARE_OPERATORS.get(opcode)
+    compare = instruction.compare
+    checked = instruction.checked
+
+    def compare_symbols():
+        symb1 = read1()
+        symb2 = read2()
+
+        data_type = symb1.data_type
+        if checked and (data_type is not symb2.data_type or
+                        data_type not in allowed_types):
+            validate_comparable_symbols(opcode, symb1, symb2,
+                                        instruction.allowedTypes)
+
+        if operation is None:
+            write(bool_symbol(compare(symb1, symb2)))
+        else:
+            write(bool_symbol(operation(symb1.value, symb2.value)))
+
+    return compare_symbols
+
+
+def compile_stack_compare(program, instruction) -> Step:
+    opcode = instruction.opcode
+    data_stack = program.data_stack
+    allowed_types = tuple(instruction.allowedTypes)
+    operation = COMPARE_OPERATORS.get(opcode)
+    compare = instruction.compare
+    checked = instruction.checked
+
+    def stack_compare():
+        if len(data_stack) < 2:
+            stack_underflow(opcode, len(data_stack))
+
+        symb2 = data_stack.pop()
+        symb1 = data_stack[-1]
+
+        data_type = symb1.data_type
+        if checked and (data_type is not symb2.data_type or
+                        data_type not in allowed_types):
+            validate_comparable_symbols(opcode, symb1, symb2,
+                                        instruction.allowedTypes)
+
+        if operation is None:
+            data_stack[-1] = bool_symbol(compare(symb1, symb2))
+        else:
+            data_stack[-1] = bool_symbol(operation(symb1.value, symb2.value))
+
+    return stack_compare
+
+
+def compile_operation(instruction) -> Callable[[Symbol, Symbol], Symbol]:
+    """ Sestaveni funkce pro aritmetickou nebo porovnavaci operaci.
+
+    Funkce provadi kontrolu typu operandu a vypocet. Pouziva se ve slozenych
+    instrukcich, kde operandy nepochazi z datoveho zasobniku.
+    """
+
+    opcode = instruction.opcode
+    checked = instruction.checked
+
+    if opcode in ARITHMETIC_OPERATORS:
+        operation = ARITHMETIC_OPERATORS[opcode]
+
+        def arithmetic(symb1: Symbol, symb2: Symbol) -> Symbol:
+            data_type = symb1.data_type
+            if checked and (data_type is not symb2.data_type or
+                            (data_type is not INT and
+                             data_type is not FLOAT)):
+                validate_math_symbols(opcode, symb1, symb2)
+
+            value = operation(symb1.value, symb2.value)
+            return int_symbol(value) if data_type is INT \
+                else float_symbol(value)
+
+        return arithmetic
+    elif opcode in COMPARE_OPERATORS:
+        operation = COMPARE_OPERATORS[opcode]
+        allowed_types = tuple(instruction.allowedTypes)
+
+        def comparison(symb1: Symbol, symb2: Symbol) -> Symbol:
+            data_type = symb1.data_type
+            if checked and (data_type is not symb2.data_type or
+                            data_type not in allowed_types):
+                validate_comparable_symbols(opcode, symb1, symb2,
+                                            instruction.allowedTypes)
+
+            return bool_symbol(operation(symb1.value, symb2.value))
+
+        return comparison
+
+    return instruction.apply
+
+
+def compile_not(program, instruction) -> Step:
+    read = compile_reader(program, 'NOT', instruction.args[1])
+    write = compile_writer(program, 'NOT', instruction.args[0])
+
+    def not_():
+        symb = read()
+
+        if symb.data_type is not BOOL:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'NOT\nInvalid data type. Expected: bool. Have: ({})'
+                     .format(symb.data_type.value), True)
+
+        write(bool_symbol(not symb.value))
+
+    return not_
+
+
+def compile_stack_not(program, instruction) -> Step:
+    data_stack = program.data_stack
+
+    def stack_not():
+        if not data_stack:
+            stack_underflow('NOTS', 0)
+
+        symb = data_stack[-1]
+
+        if symb.data_type is not BOOL:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'NOT\nInvalid data type. Expected: bool. Have: ({})'
+                     .format(symb.data_type.value), True)
+
+        data_stack[-1] = bool_symbol(not symb.value)
+
+    return stack_not
+
+
+# 6.4.4 Vstupne-vystupni instrukce
+def compile_read(program, instruction) -> Step:
+    write = compile_writer(program, 'READ', instruction.args[0])
+    reader = program.input
+    parse = PARSERS[instruction.args[1].type]
+
+    def read():
+        line = reader.readline()
+        write(NIL_SYMBOL if line is None else parse(reader, line))
+
+    return read
+
+
+def compile_write(program, instruction) -> Step:
+    symb = instruction.args[0]
+    output = program.output.write
+
+    if type(symb) is not Variable:
+        text = render(symb)
+
+        def write_constant():
+            output(text)
+
+        return write_constant
+
+    read = compile_reader(program, 'WRITE', symb)
+
+    def write():
+        symb = read()
+        text = symb.text
+
+        # Konstanta ma textovou podobu pripravenou (viz Constant).
+        if text is not None:
+            output(text)
+            return
+
+        data_type = symb.data_type
+
+        if data_type is STRING:
+            output(symb.value)
+        elif data_type is INT:
+            output(str(symb.value))
+        elif data_type is BOOL:
+            output('true' if symb.value else 'false')
+        elif data_type is FLOAT:
+            output(symb.value.hex())
+
+    return write
+
+
+# 6.4.5 Prace s retezci
+def compile_concat(program, instruction) -> Step:
+    read1 = compile_reader(program, 'CONCAT', instruction.args[1])
+    read2 = compile_reader(program, 'CONCAT', instruction.args[2])
+    write = compile_writer(program, 'CONCAT', instruction.args[0])
+    append = instruction.append
+
+    def concat():
+        symb1 = read1()
+
+        if symb1.data_type is not STRING:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'CONCAT\nInvalid type at second operand.', True)
+
+        symb2 = read2()
+
+        if symb2.data_type is not STRING:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'CONCAT\nInvalid type at third operand.', True)
+
+        if not append:
+            write(string_symbol(symb1.value + symb2.value))
+        elif type(symb1) is StringBuffer:
+            symb1.append(symb2.value)
+        else:
+            write(StringBuffer(symb1.value + symb2.value))
+
+    return concat
+
+
+def compile_strlen(program, instruction) -> Step:
+    read = compile_reader(program, 'STRLEN', instruction.args[1])
+    write = compile_writer(program, 'STRLEN', instruction.args[0])
+
+    def strlen():
+        string = read()
+
+        if string.data_type is not STRING:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'STRLEN\nExpected string', True)
+
+        write(int_symbol(string.length()))
+
+    return strlen
+
+
+def compile_getchar(program, instruction) -> Step:
+    read_string = compile_reader(program, 'GETCHAR', instruction.args[1])
+    read_index = compile_reader(program, 'GETCHAR', instruction.args[2])
+    write = compile_writer(program, 'GETCHAR', instruction.args[0])
+
+    def getchar():
+        string = read_string()
+        index = read_index()
+
+        if string.data_type is not STRING or index.data_type is not INT:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     'GETCHAR\nExpected string and int', True)
+
+        try:
+            result = string_symbol(string.char(index.value))
+        except IndexError:
+            exit_app(exitCodes.INVALID_STRING_OPERATION,
+                     'GETCHAR\nIndex out of range.', True)
+
+        write(result)
+
+    return getchar
+
+
+# 6.4.6 Prace s typy
+def compile_type(program, instruction) -> Step:
+    read = compile_reader(program, 'TYPE', instruction.args[1], False)
+    write = compile_writer(program, 'TYPE', instruction.args[0])
+
+    def type_():
+        symb = read()
+        write(string_symbol('' if symb is None else symb.data_type.value))
+
+    return type_
+
+
+# 6.4.7 Instrukce pro rizeni toku programu
+def compile_jump(program, instruction) -> Step:
+    target = instruction.target
+
+    def jump():
+        program.instruction_pointer = target
+
+    return jump
+
+
+def compile_conditional_jump(program, instruction) -> Step:
+    opcode = instruction.opcode
+    read1 = compile_reader(program, opcode, instruction.args[1])
+    read2 = compile_reader(program, opcode, instruction.args[2])
+    target = instruction.target
+    expected = opcode == 'JUMPIFEQ'
+
+    def conditional_jump():
+        symb1 = read1()
+        symb2 = read2()
+
+        if symb1.data_type is symb2.data_type or symb1.data_type is NIL or \
+                symb2.data_type is NIL:
+            if (symb2.value == symb1.value) is expected:
+                program.instruction_pointer = target
+        else:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     '{}\nOperands must have same type.'.format(opcode), True)
+
+    return conditional_jump
+
+
+def compile_stack_conditional_jump(program, instruction) -> Step:
+    opcode = instruction.opcode
+    data_stack = program.data_stack
+    target = instruction.target
+    expected = opcode == 'JUMPIFEQS'
+
+    def stack_conditional_jump():
+        if len(data_stack) < 2:
+            stack_underflow(opcode, len(data_stack))
+
+        symb2 = data_stack.pop()
+        symb1 = data_stack.pop()
+
+        if symb1.data_type is symb2.data_type or symb1.data_type is NIL or \
+                symb2.data_type is NIL:
+            if (symb2.value == symb1.value) is expected:
+                program.instruction_pointer = target
+        else:
+            exit_app(exitCodes.INVALID_DATA_TYPE,
+                     '{}\nOperands must have same type.'.format(opcode), True)
+
+    return stack_conditional_jump
+
+
+# Slozene instrukce (optimalizace -O1)
+def compile_stack_operation_pops(program, instruction) -> Step:
+    read1 = compile_reader(program, 'PUSHS', instruction.args[1])
+    read2 = compile_reader(program, 'PUSHS', instruction.args[2])
+    write = compile_writer(program, 'POPS', instruction.args[0])
+    operation = compile_operation(instruction.operation)
+
+    def stack_operation_pops():
+        symb1 = read1()
+        write(operation(symb1, read2()))
+
+    return stack_operation_pops
+
+
+def compile_compare_jump(program, instruction) -> Step:
+    compare = instruction.compare
+    read1 = compile_reader(program, compare.opcode, compare.args[1])
+    read2 = compile_reader(program, compare.opcode, compare.args[2])
+    write = compile_writer(program, compare.opcode, compare.args[0])
+    operation = compile_operation(compare)
+    target = instruction.target
+    jump_if = instruction.jump_if
+
+    def compare_jump():
+        symb1 = read1()
+        result = operation(symb1, read2())
+        write(result)
+
+        if result.value is jump_if:
+            program.instruction_pointer = target
+
+    return compare_jump
+
+
+def compile_framed_call(program, instruction) -> Step:
+    lf_stack = program.LF_Stack
+    call_stack = program.call_stack
+    target = instruction.target
+    stats = program.stats
+    acquire = program.frame_pool.acquire
+    release = program.frame_pool.release
+
+    def framed_call():
+        if stats is not None:
+            stats.replace_frame(program.TF, None)
+            if lf_stack:
+                stats.replace_frame(lf_stack[-1], None)
+
+        release(program.TF)
+        lf_stack.append(acquire())
+        program.TF = None
+        call_stack.append(program.instruction_pointer)
+        program.instruction_pointer = target
+
+    return framed_call
+
+
+OPCODE_TO_COMPILER_MAP: Dict[str, Callable] = {
+    # 6.4.1 Prace s ramci, volani funkci
+    "MOVE": compile_move,
+    "CREATEFRAME": compile_createframe,
+    "PUSHFRAME": compile_pushframe,
+    "POPFRAME": compile_popframe,
+    "DEFVAR": compile_defvar,
+    "CALL": compile_call,
+    "RETURN": compile_return,
+
+    # Prace s datvym zasobnikem
+    "PUSHS": compile_pushs,
+    "POPS": compile_pops,
+
+    # 6.4.3 Aritmeticke, relacni, booleovske a konverzni instrukce
+    "ADD": compile_math,
+    "SUB": compile_math,
+    "MUL": compile_math,
+    "IDIV": compile_math,
+    "LT": compile_compare,
+    "GT": compile_compare,
+    "EQ": compile_compare,
+    "AND": compile_compare,
+    "OR": compile_compare,
+    "NOT": compile_not,
+
+    # 6.4.4 Vstupne vystupni instrukce
+    "READ": compile_read,
+    "WRITE": compile_write,
+
+    # 6.4.5 Prace s retezci
+    "CONCAT": compile_concat,
+    "STRLEN": compile_strlen,
+    "GETCHAR": compile_getchar,
+
+    # 6.4.6 Prace s typy
+    "TYPE": compile_type,
+
+    # 6.4.7 Instrukce pro rizeni toku programu
+    "JUMP": compile_jump,
+    "JUMPIFEQ": compile_conditional_jump,
+    "JUMPIFNEQ": compile_conditional_jump,
+
+    # Rozsireni FLOAT
+    "DIV": compile_math,
+
+    # Rozsireni STACK
+    "ADDS": compile_stack_math,
+    "SUBS": compile_stack_math,
+    "MULS": compile_stack_math,
+    "IDIVS": compile_stack_math,
+    "DIVS": compile_stack_math,
+    "LTS": compile_stack_compare,
+    "GTS": compile_stack_compare,
+    "EQS": compile_stack_compare,
+    "ANDS": compile_stack_compare,
+    "ORS": compile_stack_compare,
+    "NOTS": compile_stack_not,
+    "JUMPIFEQS": compile_stack_conditional_jump,
+    "JUMPIFNEQS": compile_stack_conditional_jump
+}
+
+# Slozene instrukce nemaji jednotny operacni kod, prekladaji se podle tridy.
+CLASS_TO_COMPILER_MAP: Dict[str, Callable] = {
+    "StackOperationPops": compile_stack_operation_pops,
+    "CompareJump": compile_compare_jump,
+    "FramedCall": compile_framed_call
+}
+
+
+def compile_program(program) -> List[Step]:
+    """ Preklad instrukci programu do specializovanych uzaveru.
+
+    Operandy (konstanty a promenne jednotlivych ramcu) jsou navazany uz pri
+    prekladu, takze provedeni instrukce nevyzaduje vyhledavani podle
+    operacniho kodu ani porovnavani ramcu. Instrukce bez specializovaneho
+    prekladu se provadi puvodni metodou execute.
+
+    Parameters
+    ----------
+    program: Program
+        Nacteny a propojeny program.
+    Returns
+    -------
+    List[Step]
+        Pole prelozenych instrukci. Indexy odpovidaji Program.instructions.
+    """
+
+    code: List[Step] = list()
+
+    for instruction in program.instructions:
+        compiler = OPCODE_TO_COMPILER_MAP.get(instruction.opcode) or \
+            CLASS_TO_COMPILER_MAP.get(type(instruction).__name__)
+
+        if compiler is None:
+            code.append(partial(instruction.execute, program))
+        else:
+            code.append(compiler(program, instruction))
+
+    return code
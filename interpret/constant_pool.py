@@ -0,0 +1,43 @@
+from typing import Dict, Tuple
+from enums import DataTypes
+from models import InstructionArgument, Symbol, constant_symbol
+
+
+class ConstantPool():
+    """
+    Sdilene operandy programu. Pri nacteni se kazdy zapis operandu dekoduje
+    pouze jednou. Literaly se stejnym typem a hodnotou (i s ruznym zapisem,
+    napr. int@1 a int@+1) sdileji jedinou nemennou instanci (Constant)
+    s predem pripravenou textovou podobou pro instrukci WRITE.
+    """
+
+    def __init__(self):
+        # Dekodovane operandy podle zapisu <(type, text), operand>.
+        self.operands: Dict[Tuple[str, str], InstructionArgument] = dict()
+        # Sdilene konstanty podle hodnoty.
+        self.constants: Dict[tuple, Symbol] = dict()
+        # Pocet vyskytu literalu v operandech instrukci.
+        self.uses = 0
+
+    def intern(self, symbol: Symbol) -> Symbol:
+        """ Nahrazeni literalu sdilenou konstantou se stejnou hodnotou. """
+
+        value = symbol.value
+
+        # 0.0 a -0.0 se rovnaji, ale vypisuji se jinak. Klicem je proto
+        # u desetinnych cisel jejich textova podoba.
+        key = (symbol.data_type, value.hex()) \
+            if symbol.data_type == DataTypes.FLOAT \
+            else (symbol.data_type, value)
+
+        constant = self.constants.get(key)
+        if constant is None:
+            constant = constant_symbol(symbol.data_type, value)
+            self.constants[key] = constant
+
+        return constant
+
+    def size(self) -> int:
+        """ Pocet sdilenych konstant. """
+
+        return len(self.constants)
@@ -0,0 +1,168 @@
+from typing import Dict
+from collections import OrderedDict
+from hashlib import sha256
+from socketserver import StreamRequestHandler, ThreadingMixIn, \
+    UnixStreamServer
+from threading import Lock
+from runner import load, run, report, RunResult
+from program import LinkedProgram
+from errors import InterpretError
+from io import StringIO
+from enums import Engines
+import json
+import os
+import signal
+
+# Vychozi pocet nactenych programu drzenych v pameti.
+DEFAULT_CAPACITY = 64
+
+
+def program_key(source: str, optimization: int) -> str:
+    """ Klic programu (otisk XML reprezentace a urovne optimalizace).
+    Stejny klic pocita klient (client.py). """
+
+    digest = sha256(source.encode('utf-8', 'surrogateescape'))
+    digest.update(b'-O%d' % optimization)
+    return digest.hexdigest()
+
+
+def stop_daemon(signum, frame):
+    raise KeyboardInterrupt()
+
+
+class ProgramLRU():
+    """ Omezena mnozina nactenych a propojenych programu (LRU). """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.programs: Dict[str, LinkedProgram] = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key: str) -> LinkedProgram:
+        with self.lock:
+            linked = self.programs.get(key)
+            if linked is not None:
+                self.programs.move_to_end(key)
+
+            return linked
+
+    def put(self, key: str, linked: LinkedProgram):
+        with self.lock:
+            self.programs[key] = linked
+            self.programs.move_to_end(key)
+
+            while len(self.programs) > self.capacity:
+                self.programs.popitem(last=False)
+
+
+class RequestHandler(StreamRequestHandler):
+    """
+    Spojeni s klientem. Pozadavky i odpovedi jsou radky JSON (viz
+    WorkerDaemon).
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise TypeError('Request must be a JSON object.')
+
+                response = self.server.process(request)
+            except Exception as e:
+                # Chybny pozadavek i neocekavana chyba behu (napr. vyjimka
+                # z instrukce) se vraci jako odpoved, spojeni zustava
+                # pouzitelne.
+                response = {'error': '{}: {}'.format(type(e).__name__, e)}
+
+            self.wfile.write((json.dumps(response) + '\n').encode())
+            self.wfile.flush()
+
+
+class WorkerDaemon(ThreadingMixIn, UnixStreamServer):
+    """
+    Dlouhodobe bezici interpret (--serve). Kazdy pozadavek se provede
+    na novem objektu Program, nactene programy zustavaji v pameti (LRU).
+
+    Pozadavek obsahuje klice source (XML reprezentace programu) nebo key
+    (klic jiz nacteneho programu, viz program_key), input (vstup instrukce
+    READ), stats (nazvy statistik), engine a optimization. Odpoved obsahuje
+    exit_code, stdout, stderr, stats, key a priznak cached (program byl jiz
+    nacten). Neni-li program s klicem key nacten a chybi-li source, odpoved
+    obsahuje pouze error a key. Na chybny pozadavek (a pri neocekavane
+    chybe behu) odpoved obsahuje pouze error.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY):
+        if os.path.exists(path):
+            os.unlink(path)
+
+        super().__init__(path, RequestHandler)
+        self.path = path
+        self.programs = ProgramLRU(capacity)
+
+    def process(self, request: dict) -> dict:
+        optimization = int(request.get('optimization', 0))
+        source = request.get('source')
+        key = request.get('key')
+
+        if key is None and source is not None:
+            key = program_key(source, optimization)
+
+        linked = self.programs.get(key) if key is not None else None
+        cached = linked is not None
+
+        if linked is None:
+            if source is None:
+                return {'error': 'Unknown program key.', 'key': key}
+
+            try:
+                linked = load(source, optimization)
+            except InterpretError as error:
+                # Chyba nacteni (31, 32, 52) se vrati stejne jako chyba behu.
+                stdout, stderr = StringIO(), StringIO()
+                report(error, stdout, stderr)
+                return self.response(RunResult(
+                    int(error.code), stdout.getvalue(), stderr.getvalue(),
+                    dict(), error), key, False)
+
+            self.programs.put(key, linked)
+
+        data_input = request.get('input')
+        if isinstance(data_input, str):
+            data_input = data_input.encode('utf-8', 'surrogateescape')
+
+        result = run(linked, data_input, request.get('stats', ()),
+                     Engines(request.get('engine', Engines.DEFAULT.value)),
+                     optimization)
+        return self.response(result, key, cached)
+
+    @staticmethod
+    def response(result: RunResult, key: str, cached: bool) -> dict:
+        return {
+            'exit_code': result.exit_code,
+            'stdout': result.stdout,
+            'stderr': result.stderr,
+            'stats': result.stats,
+            'key': key,
+            'cached': cached
+        }
+
+    def serve(self):
+        """ Prijimani pozadavku az do preruseni procesu (SIGINT, SIGTERM).
+        """
+
+        signal.signal(signal.SIGTERM, stop_daemon)
+
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+            os.unlink(self.path)
@@ -43,3 +43,19 @@ class DataTypes(Enum):
     BOOL = 'bool'          # Pravdivostni hodnota {true, false}
     STRING = 'string'      # Retezec
     FLOAT = 'float'        # Cislo s plovouci desetinnou carkou.
+
+
+class Engines(Enum):
+    """ Zpusoby provadeni programu. """
+
+    DEFAULT = 'default'    # Volani metody execute u kazde instrukce.
+    COMPILED = 'compiled'  # Instrukce prelozene do uzaveru (compiler.py).
+    TRANSPILED = 'transpiled'  # Program prelozeny do funkce (transpiler.py).
+
+
+class FlushPolicies(Enum):
+    """ Okamzik vyprazdneni bufferu standardniho vystupu (output.py). """
+
+    SIZE = 'size'          # Po naplneni bufferu.
+    NEWLINE = 'newline'    # Po vypisu textu obsahujiciho konec radku.
+    EXIT = 'exit'          # Az pri ukonceni programu.
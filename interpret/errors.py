@@ -0,0 +1,81 @@
+from typing import Dict
+from enums import exitCodes
+
+
+class InterpretError(Exception):
+    """
+    Chyba, ktera ukoncuje interpretaci s chybovym navratovym kodem. Vyvolava
+    ji funkce helper.exit_app. Vypis zpravy a ukonceni procesu zajisti az
+    volajici (interpret.py, runner.py).
+    """
+
+    code: exitCodes = None
+
+    def __init__(self, message: str = '', use_stderr: bool = False):
+        """
+        Parameters
+        ----------
+        message: str
+            Chybova zprava.
+        use_stderr: bool
+            Priznak, ze se ma zprava vypsat na standardni chybovy vystup
+            (jinak na standardni vystup).
+        """
+
+        super().__init__(message)
+        self.message = message
+        self.use_stderr = use_stderr
+
+
+class InvalidArgumentsError(InterpretError):
+    code = exitCodes.INVALID_ARGUMENTS
+
+
+class CannotReadFileError(InterpretError):
+    code = exitCodes.CANNOT_READ_FILE
+
+
+class CannotWriteFileError(InterpretError):
+    code = exitCodes.CANNOT_WRITE_FILE
+
+
+class InvalidXMLFormatError(InterpretError):
+    code = exitCodes.INVALID_XML_FORMAT
+
+
+class InvalidXMLStructureError(InterpretError):
+    code = exitCodes.INVALID_XML_STRUCT
+
+
+class SemanticError(InterpretError):
+    code = exitCodes.SEMANTIC_ERROR
+
+
+class InvalidDataTypeError(InterpretError):
+    code = exitCodes.INVALID_DATA_TYPE
+
+
+class UndefinedVariableError(InterpretError):
+    code = exitCodes.UNDEFINED_VARIABLE
+
+
+class InvalidFrameError(InterpretError):
+    code = exitCodes.INVALID_FRAME
+
+
+class UndefinedValueError(InterpretError):
+    code = exitCodes.UNDEFINED_VALUE
+
+
+class InvalidOperandValueError(InterpretError):
+    code = exitCodes.INVALID_OPERAND_VALUE
+
+
+class InvalidStringOperationError(InterpretError):
+    code = exitCodes.INVALID_STRING_OPERATION
+
+
+# <navratovy kod, trida vyjimky>
+ERRORS: Dict[exitCodes, type] = {
+    error.code: error for error in InterpretError.__subclasses__()
+}
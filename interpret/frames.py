@@ -0,0 +1,113 @@
+from typing import Dict, List, Tuple
+from enums import Frames
+from models import Symbol, Variable
+
+
+class Undefined():
+    """ Znacka slotu, ve kterem neni definovana zadna promenna. """
+
+    def __repr__(self):
+        return 'UNDEFINED'
+
+
+UNDEFINED = Undefined()
+
+# Nejvetsi pocet uvolnenych ramcu drzenych pro opetovne pouziti.
+POOL_CAPACITY = 256
+
+
+class Frame():
+    """
+    Ramec promennych. Kazda promenna ma pri nacteni programu prideleno cislo
+    slotu, hodnoty jsou tak ulozeny v poli a pristup k nim je pouze indexace.
+    """
+
+    __slots__ = ('names', 'values', 'count')
+
+    def __init__(self, names: List[str]):
+        # Nazvy promennych podle slotu (sdileno vsemi ramci stejneho druhu).
+        self.names = names
+        # Hodnoty promennych. UNDEFINED = promenna neexistuje,
+        # None = promenna existuje, ale nema hodnotu.
+        self.values: List[Symbol] = [UNDEFINED] * len(names)
+        # Pocet definovanych promennych v ramci.
+        self.count = 0
+
+    def to_dict(self) -> Dict[str, Symbol]:
+        """ Prevod definovanych promennych na slovnik <nazev, hodnota>. """
+
+        return {name: value for name, value in zip(self.names, self.values)
+                if value is not UNDEFINED}
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class FramePool():
+    """
+    Uvolnene lokalni a docasne ramce k opetovnemu pouziti. Ramec, ktery
+    prestal byt dostupny (CREATEFRAME a POPFRAME nahradi docasny ramec), se
+    vyprazdni a vrati do zasobniku, takze volani funkce nevytvari novy ramec.
+    """
+
+    __slots__ = ('names', 'blank', 'frames', 'capacity', 'requested',
+                 'created')
+
+    def __init__(self, names: List[str], capacity: int = POOL_CAPACITY):
+        self.names = names
+        # Hodnoty prazdneho ramce (vzor pro vyprazdneni ramce).
+        self.blank = [UNDEFINED] * len(names)
+        self.frames: List[Frame] = list()
+        self.capacity = capacity
+        # Pocet pozadovanych a skutecne vytvorenych ramcu.
+        self.requested = 0
+        self.created = 0
+
+    def acquire(self) -> Frame:
+        """ Prazdny ramec (uvolneny, nebo nove vytvoreny). """
+
+        self.requested += 1
+        if self.frames:
+            return self.frames.pop()
+
+        self.created += 1
+        return Frame(self.names)
+
+    def release(self, frame: Frame):
+        """ Vraceni ramce, na ktery jiz neexistuje zadny odkaz. """
+
+        if frame is not None and len(self.frames) < self.capacity:
+            frame.values[:] = self.blank
+            frame.count = 0
+            self.frames.append(frame)
+
+
+def assign_slots(instructions: List) -> Tuple[List[str], List[str]]:
+    """ Prirazeni cisla slotu kazdemu operandu typu promenna.
+
+    Globalni promenne maji vlastni cislovani. Lokalni a docasny ramec sdili
+    jedno cislovani, protoze se docasny ramec stava lokalnim (PUSHFRAME).
+
+    Parameters
+    ----------
+    instructions: List[InstructionBase]
+        Instrukce programu.
+    Returns
+    -------
+    Tuple[List[str], List[str]]
+        Nazvy globalnich a lokalnich promennych serazene podle slotu.
+    """
+
+    global_slots: Dict[str, int] = dict()
+    local_slots: Dict[str, int] = dict()
+
+    for instruction in instructions:
+        for arg in instruction.args:
+            if type(arg) is not Variable:
+                continue
+
+            slots = global_slots if arg.frame == Frames.GLOBAL \
+                else local_slots
+            arg.slot = slots.setdefault(arg.value, len(slots))
+
+    return list(global_slots), list(local_slots)
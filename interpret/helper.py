@@ -1,11 +1,15 @@
-from sys import stderr, stdout
 from models import Symbol
 from enums import DataTypes, exitCodes
+from errors import ERRORS
 from typing import List
 
 
 def exit_app(code: int, message: str = '', use_stderr: bool = False):
-    """ Pomocna funkce pro vypis zpravy na vystup a ukonceni programu s chybovym kodem.
+    """ Pomocna funkce pro ukonceni interpretace s chybovym kodem.
+
+    Vyvola vyjimku odpovidajici chybovemu kodu (errors.py). Vypis zpravy
+    a ukonceni procesu zajisti volajici (interpret.py, runner.py). Buffer
+    vystupu programu se pred vypisem zpravy vyprazdni (Program.run).
 
     Parameters
     ----------
@@ -18,8 +22,7 @@ def exit_app(code: int, message: str = '', use_stderr: bool = False):
         (Vychozi hodnota je False)
     """
 
-    print(message, file=stderr if use_stderr else stdout)
-    exit(int(code.value))
+    raise ERRORS[code](message, use_stderr)
 
 
 def validate_math_symbols(opcode: str, symb1: Symbol,
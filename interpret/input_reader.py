@@ -0,0 +1,228 @@
+from typing import BinaryIO, Callable, Dict
+from models import (Symbol, NIL_SYMBOL, bool_symbol, int_symbol,
+                    float_symbol, string_symbol)
+from locale import getpreferredencoding
+from sys import stdin
+import mmap
+import re
+
+# Velikost bloku pri cteni ze standardniho vstupu.
+BLOCK_SIZE = 1 << 16
+
+# Bile znaky, ktere odstranuje str.rstrip() a ktere jsou v ASCII.
+ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+# Cele cislo v kanonickem tvaru (jiny zapis, napr. '+1' nebo '007', je
+# povazovan za chybny vstup).
+INT_PATTERN = re.compile(rb'0|-?[1-9][0-9]*')
+
+
+class InputReader():
+    """
+    Datovy vstup pro instrukci READ. Soubor (--input) se mapuje do pameti,
+    standardni vstup se cte po blocich. Radky se vraci jako useky bajtu
+    a dekoduji se az podle pozadovaneho typu (viz PARSERS).
+    """
+
+    def __init__(self, stream: BinaryIO, encoding: str,
+                 errors: str = 'strict', source: str = 'file', data=None):
+        """
+        Parameters
+        ----------
+        stream: BinaryIO
+            Binarni proud, ze ktereho se ctou bloky. None = vsechna data jsou
+            jiz v parametru data (namapovany soubor).
+        encoding, errors: str
+            Kodovani vstupu a zpusob zpracovani chyb pri dekodovani.
+        source: str
+            Popis vstupu pro vypis stavu (instrukce BREAK).
+        data
+            Namapovany obsah souboru.
+        """
+
+        self.stream = stream
+        self.encoding = encoding
+        self.errors = errors
+        self.source = source
+        self.data = bytearray() if data is None else data
+        # Pozice zacatku dalsiho radku v datech.
+        self.position = 0
+
+    @staticmethod
+    def from_file(path: str) -> 'InputReader':
+        """ Vstup ze souboru. Soubor, ktery nelze mapovat (prazdny soubor,
+        roura), se cte po blocich. """
+
+        encoding = getpreferredencoding(False)
+        file = open(path, 'rb')
+
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return InputReader(file, encoding)
+
+        file.close()
+        return InputReader(None, encoding, data=data)
+
+    @staticmethod
+    def from_data(data: bytes or str) -> 'InputReader':
+        """ Vstup z pameti (knihovni rozhrani, viz runner.py). Text se
+        koduje v UTF-8. """
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        return InputReader(None, 'utf-8', source='memory', data=data)
+
+    @staticmethod
+    def from_stdin() -> 'InputReader':
+        """ Vstup ze standardniho vstupu. """
+
+        return InputReader(stdin.buffer, stdin.encoding, stdin.errors,
+                           'stdin')
+
+    def fill(self) -> bool:
+        """ Nacteni dalsiho bloku. Vraci False na konci vstupu. """
+
+        if self.stream is None:
+            return False
+
+        block = self.stream.read1(BLOCK_SIZE)
+        if len(block) == 0:
+            self.stream = None
+            return False
+
+        # Odstraneni jiz prectenych radku pred pripojenim bloku.
+        del self.data[:self.position]
+        self.position = 0
+        self.data += block
+        return True
+
+    def readline(self) -> bytes:
+        """
+        Precteni dalsiho radku (bez znaku konce radku). Konce radku se
+        rozpoznavaji stejne jako v textovem rezimu (\\n, \\r\\n i \\r).
+
+        Returns
+        -------
+        bytes
+            Obsah radku, nebo None na konci vstupu.
+        """
+
+        scanned = self.position
+        end = self.data.find(b'\n', scanned)
+
+        while end < 0:
+            scanned = len(self.data) - self.position
+            if not self.fill():
+                break
+            end = self.data.find(b'\n', scanned)
+
+        data = self.data
+        start = self.position
+
+        if end < 0:
+            if start >= len(data):
+                return None
+            end = len(data)
+
+        carriage_return = data.find(b'\r', start, end)
+        if carriage_return < 0:
+            self.position = end + 1
+        else:
+            end = carriage_return
+            self.position = end + 2 if data[end + 1:end + 2] == b'\n' \
+                else end + 1
+
+        return data[start:end]
+
+    def decode(self, line: bytes) -> str:
+        """ Dekodovani radku. Vraci None, pokud radek nelze dekodovat. """
+
+        try:
+            return line.decode(self.encoding, self.errors).rstrip()
+        except UnicodeDecodeError:
+            return None
+
+
+def parse_bool(reader: InputReader, line: bytes) -> Symbol:
+    if line.isascii():
+        return bool_symbol(line.rstrip(ASCII_WHITESPACE).lower() == b'true')
+
+    text = reader.decode(line)
+    return NIL_SYMBOL if text is None else bool_symbol(text.lower() == 'true')
+
+
+def parse_int(reader: InputReader, line: bytes) -> Symbol:
+    if line.isascii():
+        line = line.rstrip(ASCII_WHITESPACE)
+    else:
+        # Po odstraneni bilych znaku musi zustat pouze ASCII cislice.
+        text = reader.decode(line)
+        if text is None or not text.isascii():
+            return NIL_SYMBOL
+        line = text.encode('ascii')
+
+    if INT_PATTERN.fullmatch(line) is None:
+        return NIL_SYMBOL
+
+    try:
+        return int_symbol(int(line))
+    except ValueError:
+        # Prekroceni limitu delky cisla pri prevodu z textu.
+        return NIL_SYMBOL
+
+
+def parse_float(reader: InputReader, line: bytes) -> Symbol:
+    text = reader.decode(line)
+    if text is None:
+        return NIL_SYMBOL
+
+    try:
+        return float_symbol(float(text))
+    except ValueError:
+        pass
+
+    try:
+        return float_symbol(float.fromhex(text))
+    except (ValueError, OverflowError):
+        return NIL_SYMBOL
+
+
+def parse_string(reader: InputReader, line: bytes) -> Symbol:
+    if line.isascii():
+        return string_symbol(line.rstrip(ASCII_WHITESPACE).decode('ascii'))
+
+    text = reader.decode(line)
+    return NIL_SYMBOL if text is None else string_symbol(text)
+
+
+# Prevod radku vstupu na symbol podle typu (operand instrukce READ).
+PARSERS: Dict[type, Callable[[InputReader, bytes], Symbol]] = {
+    bool: parse_bool,
+    int: parse_int,
+    float: parse_float,
+    str: parse_string
+}
+
+
+def read_symbol(reader: InputReader, data_type: type) -> Symbol:
+    """ Precteni jedne hodnoty pozadovaneho typu (instrukce READ).
+
+    Parameters
+    ----------
+    reader: InputReader
+        Datovy vstup.
+    data_type: type
+        Pozadovany typ (bool, int, float nebo str).
+    Returns
+    -------
+    Symbol
+        Prectena hodnota, nebo nil pri chybnem ci chybejicim vstupu.
+    """
+
+    line = reader.readline()
+    if line is None:
+        return NIL_SYMBOL
+
+    return PARSERS[data_type](reader, line)
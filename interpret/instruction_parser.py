@@ -1,90 +1,292 @@
-from typing import IO, Dict, List
+from array import array
+from typing import IO, Callable, Dict, List
 import instructions
-from xml.etree.ElementTree import parse as parse_xml, ParseError, Element
+from xml.etree.ElementTree import Element
+from xml.parsers.expat import ParserCreate, ExpatError
 from helper import exit_app
-from enums import exitCodes, ArgumentTypes, Frames, DataTypes
+from enums import exitCodes, ArgumentTypes, Frames
+import gc
 import re
-from models import (InstructionArgument, Symbol, Variable, Type, Label)
+from constant_pool import ConstantPool
+from models import (InstructionArgument, Variable, Type, Label, NIL_SYMBOL,
+                    TRUE_SYMBOL, FALSE_SYMBOL, int_symbol, float_symbol,
+                    string_symbol)
+
+# Velikost bloku pri cteni XML dat.
+CHUNK_SIZE = 1 << 16
+
+# Predem prelozene regularni vyrazy.
+NAME_PATTERN = re.compile(r"^[_\-$&%*!?a-zA-Z][_\-$&%*!?a-zA-Z0-9]*$")
+HASH_PATTERN = re.compile('.*#')
+
+# Pozice parametru instrukce podle nazvu elementu.
+ARGUMENT_POSITIONS = {'arg1': 0, 'arg2': 1, 'arg3': 2}
+
+# Ramce podle zapisu v nazvu promenne.
+FRAMES = {frame.value: frame for frame in Frames}
+
+# Datove typy operandu typu type.
+TYPE_NAMES = {'int': int, 'string': str, 'bool': bool, 'float': float}
+
+# Druhy operandu, ktere lze predat na misto ocekavaneho druhu.
+ACCEPTED_KINDS = {
+    ArgumentTypes.SYMBOL: (ArgumentTypes.SYMBOL, ArgumentTypes.VARIABLE),
+    ArgumentTypes.VARIABLE: (ArgumentTypes.VARIABLE,),
+    ArgumentTypes.LABEL: (ArgumentTypes.LABEL,),
+    ArgumentTypes.TYPE: (ArgumentTypes.TYPE,)
+}
+
+# Signatury instrukci: <opcode, (trida, ((ocekavany, povolene druhy), ...))>.
+SIGNATURES = {
+    opcode: (instruction_class,
+             tuple((expected, ACCEPTED_KINDS[expected])
+                   for expected in instruction_class.expected_args))
+    for opcode, instruction_class in instructions.OPCODE_TO_CLASS_MAP.items()
+}
+
+# Druh operandu literal (konstanta).
+SYMBOL = ArgumentTypes.SYMBOL
+
+# Zaznam nacteneho parametru: [atributy, text, obsahuje podelementy].
+ArgumentRecord = list
+
+
+class StructureError(Exception):
+    """
+    Chybna struktura XML (navratovy kod 32). Chyba se nahlasi az po nacteni
+    celeho dokumentu, protoze chybny format XML (31) ma prednost.
+    """
+
+    def __init__(self, message: str, use_stderr: bool = True):
+        super().__init__(message)
+        self.message = message
+        self.use_stderr = use_stderr
+
+    def report(self):
+        exit_app(exitCodes.INVALID_XML_STRUCT, self.message, self.use_stderr)
+
+
+class InstructionsBuilder():
+    """
+    Zpracovani udalosti parseru expat. Strom elementu se nevytvari, kazda
+    instrukce se dekoduje po nacteni jejiho koncoveho tagu. Text se predava
+    (obsluha CharacterDataHandler) pouze uvnitr elementu parametru, bile znaky
+    mezi elementy tak parser zahodi bez volani kodu v Pythonu.
+    """
+
+    def __init__(self, parser, pool: ConstantPool):
+        self.parser = parser
+        # Sdilene operandy a konstanty programu.
+        self.pool = pool
+        # Hloubka aktualniho elementu (1 = korenovy element).
+        self.depth = 0
+        # Prvni chyba struktury a jeji pozice (poradi instrukce v dokumentu,
+        # 0 = korenovy element).
+        self.error: StructureError = None
+        self.error_position = 0
+        # Atributy order nactenych instrukci (ve stejnem poradi jako pole
+        # instrukci). Pole je kompaktni, neobsahuje objekty typu int.
+        self.orders = array('Q')
+        self.result: List[instructions.InstructionBase] = list()
+        self.is_sorted = True
+
+        # Atributy aktualni instrukce a jejich parametry.
+        self.attrib: Dict[str, str] = None
+        self.tag: str = None
+        self.arguments: List[ArgumentRecord] = [None, None, None]
+        # Nejnizsi pozice opakovaneho parametru (napr. dva elementy arg1).
+        self.multiple: int = None
+        # Parametr, jehoz text se prave nacita.
+        self.current: ArgumentRecord = None
+
+        # Obsluha textu se zapina pouze uvnitr elementu parametru.
+        self.text_handler = self.data
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.SkippedEntityHandler = self.skipped_entity
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        depth = self.depth = self.depth + 1
+
+        if depth == 3:
+            position = ARGUMENT_POSITIONS.get(tag)
+            if position is None:
+                return
+
+            if self.arguments[position] is None:
+                self.current = self.arguments[position] = [attrib, '', False]
+                self.parser.CharacterDataHandler = self.text_handler
+            elif self.multiple is None or position < self.multiple:
+                self.multiple = position
+        elif depth == 2:
+            self.tag = tag
+            self.attrib = attrib
+            self.arguments = [None, None, None]
+            self.multiple = None
+        elif depth == 4:
+            # Text parametru konci prvnim podelementem.
+            if self.current is not None:
+                self.current[2] = True
+                self.current = None
+                self.parser.CharacterDataHandler = None
+        elif depth == 1 and self.error is None:
+            try:
+                InstructionsParser.validate_root(tag, attrib)
+            except StructureError as e:
+                self.error = e
+
+    def data(self, text: str):
+        self.current[1] += text
+
+    def end(self, tag: str):
+        depth = self.depth
+        self.depth = depth - 1
+
+        if depth == 3:
+            if self.current is not None:
+                self.current = None
+                self.parser.CharacterDataHandler = None
+        elif depth == 2 and self.error is None:
+            try:
+                order = InstructionsParser.parse_order(self.tag, self.attrib)
+                orders = self.orders
+                self.is_sorted = self.is_sorted and \
+                    (len(orders) == 0 or orders[-1] < order)
+
+                try:
+                    orders.append(order)
+                except OverflowError:
+                    # Poradi mimo rozsah 64 bitu (nestandardni vstup).
+                    # Pokracuje se s beznym seznamem.
+                    self.orders = list(orders)
+                    self.orders.append(order)
+
+                self.result.append(InstructionsParser.decode_instruction(
+                    self.attrib, self.arguments, self.multiple, order,
+                    self.pool))
+            except StructureError as e:
+                self.error = e
+                self.error_position = len(self.result) + 1
+
+    def skipped_entity(self, name: str, is_parameter_entity: bool):
+        # Nedefinovana entita je chybou formatu (stejne jako v ElementTree).
+        raise ExpatError('undefined entity &{};'.format(name))
 
 
 class InstructionsParser():
     """ Trida k nacitani a deserializaci vstupnich XML dat do internich struktur. """
 
     @staticmethod
-    def parse_file(file: IO) -> Dict[int, instructions.InstructionBase]:
-        """ Nacteni XML dat z datoveho proudu a zpracovani. 
+    def parse_file(file: IO, pool: ConstantPool = None) -> \
+            List[instructions.InstructionBase]:
+        """ Nacteni XML dat z datoveho proudu a zpracovani.
+
+        Dokument se cte po blocich parserem expat (stejne nastaveni jmennych
+        prostoru jako v ElementTree). Kazda instrukce se zpracuje, jakmile je
+        nacten jeji koncovy tag (InstructionsBuilder). Strom dokumentu se
+        nevytvari.
 
         Perameters
         ----------
         file: IO
             Vstupni datovy proud.
+        pool: ConstantPool
+            Sdilene operandy a konstanty (pro vypis statistik). Neni-li
+            zadan, vytvori se novy.
 
         Returns
         -------
-        Dict[int, instructions.InstructionBase]
-            Serazeny slovnik, kde klicem bude obsah XML atributu order.
+        List[instructions.InstructionBase]
+            Instrukce serazene podle XML atributu order.
         """
+
+        parser = ParserCreate(namespace_separator='}')
+        parser.buffer_text = True
+        builder = InstructionsBuilder(
+            parser, pool if pool is not None else ConstantPool())
+
+        # Vznikaji pouze acyklicke struktury, cyklicky garbage collector se
+        # proto behem nacitani vypina (jinak opakovane prochazi vsechny
+        # dosud nactene instrukce).
+        gc_enabled = gc.isenabled()
+        gc.disable()
+
         try:
-            xml_data = parse_xml(file).getroot()
-            return InstructionsParser.parse(xml_data)
-        except ParseError:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), ''):
+                parser.Parse(chunk, False)
+
+            parser.Parse('', True)
+        except ExpatError:
             exit_app(exitCodes.INVALID_XML_FORMAT, 'Invalid XML format.', True)
+        finally:
+            builder.parser = None
+            if gc_enabled:
+                gc.enable()
+
+        error = builder.error
+        error_position = builder.error_position
+        orders = builder.orders
+        result = builder.result
+
+        # Pri vzestupnem poradi nemohou existovat duplicity.
+        if builder.is_sorted or (error is not None and error_position == 0):
+            if error is not None:
+                error.report()
+            return result
+
+        # Serazeni pomoci pole indexu. Duplicitni poradi se hlasi stejne
+        # jako pri postupne kontrole (prvni duplicita v poradi dokumentu).
+        index = sorted(range(len(orders)), key=orders.__getitem__)
+        duplicate = None
+
+        for previous, current in zip(index, index[1:]):
+            if orders[previous] == orders[current] and \
+                    (duplicate is None or current < duplicate):
+                duplicate = current
+
+        if duplicate is not None and \
+                (error is None or duplicate + 1 <= error_position):
+            StructureError('Found element with same order.').report()
+        elif error is not None:
+            error.report()
+
+        return [result[position] for position in index]
 
     @staticmethod
-    def parse(xml_data: Element) -> Dict[int, instructions.InstructionBase]:
-        """ Nacitani XML dat a jejich rozbiti do struktur.
-
-        Parameters
-        ----------
-        xml_data: Element
-            Korenovy XML prvek.
-        Returns
-        -------
-        Dict[int, instructions.InstructionBase]
-            Serazeny slovnik, kde klicem bude obsah XML atributu order.
-        """
+    def validate_root(tag: str, attrib: Dict[str, str]):
+        """ Kontrola korenoveho elementu. """
 
-        if xml_data.tag != 'program':
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Invalid XML root Element. Expected program', True)
+        if tag != 'program':
+            raise StructureError('Invalid XML root Element. Expected program')
 
-        if 'language' not in xml_data.attrib.get('language') != 'IPPcode20':
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Invalid XML structure. Expected language IPPCode20',
-                     True)
+        language = attrib.get('language')
+        if language is None or 'language' not in language != 'IPPcode20':
+            raise StructureError(
+                'Invalid XML structure. Expected language IPPCode20')
 
-        result: Dict[int, instructions.InstructionBase] = dict()
-        for element in list(xml_data):
-            if element.tag != 'instruction':
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Unknown element in program element.', True)
-
-            try:
-                order = int(element.attrib.get('order'))
+    @staticmethod
+    def parse_order(tag: str, attrib: Dict[str, str]) -> int:
+        """ Kontrola elementu instrukce a nacteni atributu order. """
 
-                if order <= 0:
-                    exit_app(exitCodes.INVALID_XML_STRUCT,
-                             'Negative instructions order', True)
-            except ValueError:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Order attribute must be integer', True)
-            except TypeError:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Order element not found.', True)
+        if tag != 'instruction':
+            raise StructureError('Unknown element in program element.')
 
-            if order in result:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Found element with same order.', True)
+        try:
+            order = int(attrib.get('order'))
+        except ValueError:
+            raise StructureError('Order attribute must be integer')
+        except TypeError:
+            raise StructureError('Order element not found.')
 
-            result[order] = InstructionsParser.parse_instruction(
-                element, order)
+        if order <= 0:
+            raise StructureError('Negative instructions order')
 
-        return dict(sorted(result.items()))
+        return order
 
     @staticmethod
     def parse_instruction(element: Element, order: int) -> \
             instructions.InstructionBase:
-        """ Nacteni a zpracovani jedne instrukce.
+        """ Nacteni a zpracovani jedne instrukce z elementu stromu XML.
 
         Parameters
         ----------
@@ -97,219 +299,250 @@ class InstructionsParser():
         instructions.InstructionBase
             Instance tridy konkretni instrukce.
         """
-        opcode = element.get('opcode')
 
-        if opcode is None or len(opcode) == 0:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Missing element at {}'.format(order), True)
+        arguments: List[ArgumentRecord] = [None, None, None]
+        multiple = None
 
-        opcode = opcode.upper()
-        if opcode not in instructions.OPCODE_TO_CLASS_MAP:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Unknown opcode. ({})'.format(opcode), True)
-
-        args = InstructionsParser.parse_arguments(element)
-        instruction = instructions.OPCODE_TO_CLASS_MAP[opcode](args, opcode)
-
-        for i in range(0, len(args)):
-            expected = instruction.expected_args[i]
-            real = args[i].arg_type
-
-            is_invalid = False
-
-            if expected == ArgumentTypes.SYMBOL:
-                if real != ArgumentTypes.VARIABLE and \
-                        real != ArgumentTypes.SYMBOL:
-                    is_invalid = True
-            elif expected == ArgumentTypes.VARIABLE and \
-                    real != ArgumentTypes.VARIABLE:
-                is_invalid = True
-            elif expected == ArgumentTypes.LABEL and \
-                    real != ArgumentTypes.LABEL:
-                is_invalid = True
-            elif expected == ArgumentTypes.TYPE and real != ArgumentTypes.TYPE:
-                is_invalid = True
-
-            if is_invalid:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid argument. Expected <{}>. Have: <{}>'
-                         .format(expected.value, real.value))
+        for child in element:
+            position = ARGUMENT_POSITIONS.get(child.tag)
 
-        return instruction
+            if position is None:
+                continue
+            elif arguments[position] is None:
+                arguments[position] = [child.attrib, child.text or '',
+                                       len(child) > 0]
+            elif multiple is None or position < multiple:
+                multiple = position
+
+        return InstructionsParser.decode_instruction(
+            element.attrib, arguments, multiple, order)
 
     @staticmethod
-    def parse_arguments(element: Element) -> List[InstructionArgument]:
-        """ Nacteni parametru instrukce.
+    def decode_instruction(attrib: Dict[str, str],
+                           arguments: List[ArgumentRecord], multiple: int,
+                           order: int, pool: ConstantPool = None) -> \
+            instructions.InstructionBase:
+        """ Dekodovani instrukce podle tabulky signatur (SIGNATURES).
+
+        Chyby se hlasi ve stejnem poradi jako pri postupne kontrole
+        (operacni kod, elementy parametru, hodnoty parametru, pocet
+        parametru a nakonec druhy parametru).
 
         Parameters
         ----------
-        element: Element
-            XML element obsahujici data instrukce.
+        attrib: Dict[str, str]
+            Atributy elementu instrukce.
+        arguments: List[ArgumentRecord]
+            Prvni nalezene elementy arg1, arg2 a arg3 (None = chybi).
+        multiple: int
+            Nejnizsi pozice opakovaneho parametru (None = zadny).
+        order: int
+            Poradi instrukce (pri hlaseni chyb a pro profil behu).
+        pool: ConstantPool
+            Sdilene operandy a konstanty. Doplni se o nove dekodovane
+            operandy.
         Returns
         -------
-        List[InstructionArgument]
-            Pole instanci parametru instrukce.
+        instructions.InstructionBase
+            Instance tridy konkretni instrukce.
         """
-        arg1 = element.findall('arg1')
-        arg2 = element.findall('arg2')
-        arg3 = element.findall('arg3')
-
-        if len(arg1) > 1:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Multiple elements named arg1', True)
-        elif len(arg2) > 1:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Multiple elements named arg2', True)
-        elif len(arg3) > 1:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Multiple elements named arg3', True)
-
-        if len(arg3) > 0 and (len(arg1) == 0 or len(arg2) == 0):
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Third argument was set, but first or second missing.',
-                     True)
-        if len(arg2) > 0 and len(arg1) == 0:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Second argument was set, but first missing.', True)
-
-        args = list()
-
-        if len(arg1) > 0:
-            args.append(InstructionsParser.parse_argument(arg1[0]))
-        if len(arg2) > 0:
-            args.append(InstructionsParser.parse_argument(arg2[0]))
-        if len(arg3) > 0:
-            args.append(InstructionsParser.parse_argument(arg3[0]))
-
-        return args
+
+        opcode = attrib.get('opcode')
+
+        if not opcode:
+            raise StructureError('Missing element at {}'.format(order))
+
+        opcode = opcode.upper()
+        signature = SIGNATURES.get(opcode)
+        if signature is None:
+            raise StructureError('Unknown opcode. ({})'.format(opcode))
+
+        if multiple is not None:
+            raise StructureError(
+                'Multiple elements named arg{}'.format(multiple + 1))
+
+        arg1, arg2, arg3 = arguments
+
+        if arg3 is not None and (arg1 is None or arg2 is None):
+            raise StructureError(
+                'Third argument was set, but first or second missing.')
+        if arg2 is not None and arg1 is None:
+            raise StructureError('Second argument was set, but first missing.')
+
+        if pool is None:
+            pool = ConstantPool()
+
+        operands = pool.operands
+        args: List[InstructionArgument] = list()
+
+        for record in arguments:
+            if record is None:
+                break
+
+            arg_attrib, text, nested = record
+            if nested:
+                raise StructureError('Argument contains unexpected elements.')
+
+            key = (arg_attrib.get('type'), text)
+            arg = operands.get(key)
+
+            if arg is None:
+                arg = InstructionsParser.parse_argument(key[0], text)
+                if arg.arg_type is SYMBOL:
+                    arg = pool.intern(arg)
+                operands[key] = arg
+
+            if arg.arg_type is SYMBOL:
+                pool.uses += 1
+
+            args.append(arg)
+
+        instruction_class, kinds = signature
+
+        if len(kinds) != len(args):
+            raise StructureError(
+                'Invalid count of arguments at opcode {}'.format(opcode))
+
+        instruction = instruction_class(args, opcode)
+        instruction.order = order
+
+        for arg, (expected, accepted) in zip(args, kinds):
+            if arg.arg_type not in accepted:
+                raise StructureError(
+                    'Invalid argument. Expected <{}>. Have: <{}>'
+                    .format(expected.value, arg.arg_type.value), False)
+
+        return instruction
 
     @staticmethod
-    def parse_argument(arg: Element) -> InstructionArgument:
+    def parse_argument(arg_type: str, value: str) -> InstructionArgument:
         """ Zpracovani parametru instrukce.
 
         Parameters
         ----------
-        arg: Element
-            XML element parametru.
+        arg_type: str
+            Hodnota atributu type.
+        value: str
+            Text elementu parametru.
         Returns
         -------
         InstructionArgument
             Zpracovany parametr.
         """
 
-        if len(list(arg)) > 0:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Argument contains unexpected elements.', True)
-
-        arg_type = arg.attrib.get('type')
-        arg_value = arg.text if arg.text is not None else ''
-
-        if arg_type == ArgumentTypes.LABEL.value:
-            InstructionsParser.validate_variable_name(arg_value, True)
-            return Label(arg_value)
-        elif arg_type == ArgumentTypes.VARIABLE.value:
-            variable_parts = arg_value.split('@', 1)
-
-            if len(variable_parts) == 2:
-                InstructionsParser.validate_scope(variable_parts[0])
-                InstructionsParser.validate_variable_name(variable_parts[1])
-
-                if variable_parts[0] == 'GF':
-                    return Variable(Frames.GLOBAL, variable_parts[1])
-                elif variable_parts[0] == 'TF':
-                    return Variable(Frames.TEMPORARY, variable_parts[1])
-                elif variable_parts[0] == 'LF':
-                    return Variable(Frames.LOCAL, variable_parts[1])
-            else:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid variable. ({})'.format(arg_value), True)
-        elif arg_type == 'nil':
-            if arg_value != 'nil':
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid value of nil. ({})'.format(arg_value), True)
-
-            return Symbol(DataTypes.NIL, None)
-        elif arg_type == 'int':
-            try:
-                return Symbol(DataTypes.INT, int(arg_value))
-            except ValueError:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid int value. ({})'.format(arg_value), True)
-        elif arg_type == 'bool':
-            if arg_value == 'true':
-                return Symbol(DataTypes.BOOL, True)
-            elif arg_value == 'false':
-                return Symbol(DataTypes.BOOL, False)
-            else:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid boolean value. ({})'.format(arg_value), True)
-        elif arg_type == 'string':
-            if re.compile('.*#.*').match(arg_value):
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Text cannot contains #.', True)
-
-            fixed_string = InstructionsParser.fix_string(arg_value)
-            return Symbol(DataTypes.STRING, fixed_string)
-        elif arg_type == 'type':
-            if arg_value == 'int':
-                return Type(int)
-            elif arg_value == 'string':
-                return Type(str)
-            elif arg_value == 'bool':
-                return Type(bool)
-            elif arg_value == 'float':
-                return Type(float)
-            else:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Unknown type value. ({})'.format(arg_value), True)
-        elif arg_type == 'float':
-            try:
-                return Symbol(DataTypes.FLOAT, float.fromhex(arg_value))
-            except Exception:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid format of operand.')
-        else:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Unknown argument type. ({})'.format(arg_type), True)
+        parser = ARGUMENT_PARSERS.get(arg_type)
+
+        if parser is None:
+            raise StructureError(
+                'Unknown argument type. ({})'.format(arg_type))
+
+        return parser(value)
 
     @staticmethod
     def validate_scope(scope: str):
         """ Kontrola platnosti ramce. """
 
-        if scope != Frames.GLOBAL.value and scope != Frames.LOCAL.value and \
-                scope != Frames.TEMPORARY.value:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Invalid scope. ({})'.format(scope), True)
+        if scope not in FRAMES:
+            raise StructureError('Invalid scope. ({})'.format(scope))
 
     @staticmethod
     def validate_variable_name(name: str, is_label: bool = False):
         """ Kontrola spravnosti nazvu promenne, nebo navesti. """
 
-        if re.compile(r"^[_\-$&%*!?a-zA-Z][_\-$&%*!?a-zA-Z0-9]*$").match(name)\
-                is None:
-            exit_app(exitCodes.INVALID_XML_STRUCT,
-                     'Invalid {} name. ({})'.format(
-                         'label' if is_label else 'variable', name), True)
+        if NAME_PATTERN.match(name) is None:
+            raise StructureError('Invalid {} name. ({})'.format(
+                'label' if is_label else 'variable', name))
 
     @staticmethod
     def fix_string(value: str) -> str:
-        """ Osetreni retezce. Zpracovani escape sekvenci. """
-
-        result: List[str] = list()
-
-        splitedParts = value.split('\\')
-        result.append(splitedParts[0])
+        """ Osetreni retezce. Zpracovani escape sekvenci (\\ddd). """
 
-        number_regex = re.compile("\\d{3}")
+        if '\\' not in value:
+            return value
 
-        for item in splitedParts[1:]:
-            number_matched = number_regex.match(item[:3])
+        parts = value.split('\\')
+        result: List[str] = [parts[0]]
 
-            if not number_matched:
-                exit_app(exitCodes.INVALID_XML_STRUCT,
-                         'Invalid hexadecimal escape.', True)
+        for item in parts[1:]:
+            # Shodne s regularnim vyrazem \d{3} (cislice Unicode).
+            code = item[:3]
+            if len(code) != 3 or not code.isdecimal():
+                raise StructureError('Invalid hexadecimal escape.')
 
-            result.append(chr(int(item[:3])))
+            result.append(chr(int(code)))
             result.append(item[3:])
 
         return str().join(result)
+
+
+def parse_label(value: str) -> InstructionArgument:
+    InstructionsParser.validate_variable_name(value, True)
+    return Label(value)
+
+
+def parse_variable(value: str) -> InstructionArgument:
+    scope, separator, name = value.partition('@')
+
+    if not separator:
+        raise StructureError('Invalid variable. ({})'.format(value))
+
+    InstructionsParser.validate_scope(scope)
+    InstructionsParser.validate_variable_name(name)
+    return Variable(FRAMES[scope], name)
+
+
+def parse_nil(value: str) -> InstructionArgument:
+    if value != 'nil':
+        raise StructureError('Invalid value of nil. ({})'.format(value))
+
+    return NIL_SYMBOL
+
+
+def parse_int(value: str) -> InstructionArgument:
+    try:
+        return int_symbol(int(value))
+    except ValueError:
+        raise StructureError('Invalid int value. ({})'.format(value))
+
+
+def parse_bool(value: str) -> InstructionArgument:
+    if value == 'true':
+        return TRUE_SYMBOL
+    elif value == 'false':
+        return FALSE_SYMBOL
+
+    raise StructureError('Invalid boolean value. ({})'.format(value))
+
+
+def parse_string(value: str) -> InstructionArgument:
+    if '#' in value and HASH_PATTERN.match(value):
+        raise StructureError('Text cannot contains #.')
+
+    return string_symbol(InstructionsParser.fix_string(value))
+
+
+def parse_type(value: str) -> InstructionArgument:
+    if value not in TYPE_NAMES:
+        raise StructureError('Unknown type value. ({})'.format(value))
+
+    return Type(TYPE_NAMES[value])
+
+
+def parse_float(value: str) -> InstructionArgument:
+    try:
+        return float_symbol(float.fromhex(value))
+    except (ValueError, OverflowError):
+        raise StructureError('Invalid format of operand.', False)
+
+
+# Dekodovani parametru podle atributu type.
+ARGUMENT_PARSERS: Dict[str, Callable[[str], InstructionArgument]] = {
+    ArgumentTypes.LABEL.value: parse_label,
+    ArgumentTypes.VARIABLE.value: parse_variable,
+    'nil': parse_nil,
+    'int': parse_int,
+    'bool': parse_bool,
+    'string': parse_string,
+    ArgumentTypes.TYPE.value: parse_type,
+    'float': parse_float
+}
@@ -1,15 +1,26 @@
-from typing import List
+from typing import List, Dict
 from enums import ArgumentTypes, exitCodes, DataTypes
 from helper import exit_app, validate_math_symbols, validate_comparable_symbols
 from program import Program
-from models import InstructionArgument, Symbol, Label as LabelModel
-from sys import stdin, stderr
+from models import (InstructionArgument, Symbol, Label as LabelModel,
+                    StringBuffer, bool_symbol, int_symbol, float_symbol,
+                    string_symbol, create_symbol, render, same_variable)
+from input_reader import read_symbol
 
 
 class InstructionBase():
     """ Bazova trida pro kazdou instrukci. """
 
     expected_args = []
+    # Pocet instrukci zdrojoveho programu, ktere instance provadi.
+    # (Vetsi nez 1 pouze u slozenych instrukci, viz optimizer.py)
+    count = 1
+    # Kontrola typu operandu za behu. Vypina se pouze u instrukci, jejichz
+    # typy operandu jsou dokazany pri nacteni (-O2, viz type_inference.py).
+    checked = True
+    # Poradi instrukce (XML atribut order). Nastavuje parser, slozene
+    # instrukce prebiraji poradi sve prvni casti.
+    order: int = None
 
     def __init__(self, args: List[InstructionArgument], opcode: str):
         if len(self.expected_args) != len(args):
@@ -20,6 +31,12 @@ class InstructionBase():
         self.opcode = opcode
         self.args = args
 
+    def __setstate__(self, state: dict):
+        # Obnoveni z cache (cache.py) pres setattr, aby instance sdilely
+        # klice slovniku atributu stejne jako instance vytvorene parserem.
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def execute(self, program: Program):
         raise NotImplementedError
 
@@ -32,6 +49,11 @@ class Move(InstructionBase):
 
     def execute(self, program: Program):
         symb = program.get_symb('MOVE', self.args[1], False)
+
+        # Menitelny retezec patri pouze zdrojove promenne.
+        if type(symb) is StringBuffer:
+            symb = symb.snapshot()
+
         program.var_set('MOVE', self.args[0], symb)
 
 
@@ -39,7 +61,11 @@ class Createframe(InstructionBase):
     """ Vytvoreni noveho docastneho ramce """
 
     def execute(self, program: Program):
-        program.TF = dict()
+        if program.stats is not None:
+            program.stats.replace_frame(program.TF, None)
+
+        program.release_frame(program.TF)
+        program.TF = program.create_frame()
 
 
 class Pushframe(InstructionBase):
@@ -51,6 +77,9 @@ class Pushframe(InstructionBase):
                      'PUSHFRAME\nInvalid access to undefined temporary frame.',
                      True)
 
+        if program.stats is not None and len(program.LF_Stack) > 0:
+            program.stats.replace_frame(program.LF_Stack[-1], None)
+
         program.LF_Stack.append(program.TF)
         program.TF = None
 
@@ -63,6 +92,12 @@ class Popframe(InstructionBase):
             exit_app(exitCodes.INVALID_FRAME,
                      'POPFRAME\nNo available local frame.', True)
 
+        if program.stats is not None:
+            program.stats.replace_frame(
+                program.TF,
+                program.LF_Stack[-2] if len(program.LF_Stack) > 1 else None)
+
+        program.release_frame(program.TF)
         program.TF = program.LF_Stack.pop()
 
 
@@ -72,13 +107,7 @@ class Defvar(InstructionBase):
     expected_args = [ArgumentTypes.VARIABLE]
 
     def execute(self, program: Program):
-        arg = self.args[0]
-
-        if program.var_exists(arg):
-            exit_app(exitCodes.SEMANTIC_ERROR,
-                     'DEFVAR\nVariable {} now exists. Cannot redefine.', True)
-
-        program.var_set('DEFVAR', arg, None, True)
+        program.var_define(self.args[0])
 
 
 class Return(InstructionBase):
@@ -99,6 +128,10 @@ class PushS(InstructionBase):
 
     def execute(self, program: Program):
         symb = program.get_symb('PUSHS', self.args[0])
+
+        if type(symb) is StringBuffer:
+            symb = symb.snapshot()
+
         program.data_stack.append(symb)
 
 
@@ -113,7 +146,7 @@ class PopS(InstructionBase):
                      'POPS\nInstruction {}. Data Stack is empty.'.format(
                          self.opcode), True)
 
-        program.var_set('POPS', self.args[0], program.pop_stack(1)[0])
+        program.var_set('POPS', self.args[0], program.data_stack.pop())
 
 
 # 6.4.3 Aritmeticke, relacni, booleovske a konverzni instrukce
@@ -130,14 +163,18 @@ class MathInstructionBase(InstructionBase):
     def compute(self, symb1: Symbol, symb2: Symbol):
         raise NotImplementedError
 
+    def apply(self, symb1: Symbol, symb2: Symbol) -> Symbol:
+        """ Kontrola operandu a provedeni vypoctu. """
+
+        if self.checked:
+            validate_math_symbols(self.opcode, symb1, symb2)
+        return self.compute(symb1, symb2)
+
     def execute(self, program: Program):
         symb1 = program.get_symb(self.opcode, self.args[1])
         symb2 = program.get_symb(self.opcode, self.args[2])
 
-        validate_math_symbols(self.opcode, symb1, symb2)
-
-        result = self.compute(symb1, symb2)
-        program.var_set(self.opcode, self.args[0], result)
+        program.var_set(self.opcode, self.args[0], self.apply(symb1, symb2))
 
 
 class StackMathInstructionBase(InstructionBase):
@@ -151,34 +188,42 @@ class StackMathInstructionBase(InstructionBase):
     def compute(self, symb1: Symbol, symb2: Symbol):
         raise NotImplementedError
 
-    def execute(self, program: Program):
-        symbols = program.pop_stack(2)
+    def apply(self, symb1: Symbol, symb2: Symbol) -> Symbol:
+        """ Kontrola operandu a provedeni vypoctu. """
 
-        validate_math_symbols(self.opcode, symbols[1], symbols[0])
+        if self.checked:
+            validate_math_symbols(self.opcode, symb1, symb2)
+        return self.compute(symb1, symb2)
 
-        result = self.compute(symbols[1], symbols[0])
-        program.data_stack.append(result)
+    def execute(self, program: Program):
+        stack = program.data_stack
+        if len(stack) < 2:
+            program.stack_underflow()
+
+        # Vysledek prepise prvni operand na vrcholu zasobniku.
+        symb2 = stack.pop()
+        stack[-1] = self.apply(stack[-1], symb2)
 
 
 class Add(MathInstructionBase):
     """ Scitani (Zakladni varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value + symb2.value)
+        return create_symbol(symb1.data_type, symb1.value + symb2.value)
 
 
 class Sub(MathInstructionBase):
     """ Odcitani (Zakldani varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value - symb2.value)
+        return create_symbol(symb1.data_type, symb1.value - symb2.value)
 
 
 class Mul(MathInstructionBase):
     """ Nasobeni (Zakladni varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value * symb2.value)
+        return create_symbol(symb1.data_type, symb1.value * symb2.value)
 
 
 class IDiv(MathInstructionBase):
@@ -189,7 +234,7 @@ class IDiv(MathInstructionBase):
             exit_app(exitCodes.INVALID_OPERAND_VALUE,
                      'Detected zero division.', True)
 
-        return Symbol(DataTypes.INT, symb1.value // symb2.value)
+        return int_symbol(symb1.value // symb2.value)
 
 
 class ComparableInstruction(InstructionBase):
@@ -208,15 +253,19 @@ class ComparableInstruction(InstructionBase):
     def compare(self, symb1: Symbol, symb2: Symbol) -> bool:
         raise NotImplementedError
 
+    def apply(self, symb1: Symbol, symb2: Symbol) -> Symbol:
+        """ Kontrola operandu a provedeni porovnani. """
+
+        if self.checked:
+            validate_comparable_symbols(self.opcode, symb1,
+                                        symb2, self.allowedTypes)
+        return bool_symbol(self.compare(symb1, symb2))
+
     def execute(self, program: Program):
         symb1 = program.get_symb(self.opcode, self.args[1])
         symb2 = program.get_symb(self.opcode, self.args[2])
 
-        validate_comparable_symbols(self.opcode, symb1,
-                                    symb2, self.allowedTypes)
-
-        result = Symbol(DataTypes.BOOL, self.compare(symb1, symb2))
-        program.var_set(self.opcode, self.args[0], result)
+        program.var_set(self.opcode, self.args[0], self.apply(symb1, symb2))
 
 
 class StackComparableInstruction(InstructionBase):
@@ -233,14 +282,21 @@ class StackComparableInstruction(InstructionBase):
     def compare(self, symb1: Symbol, symb2: Symbol) -> bool:
         raise NotImplementedError
 
-    def execute(self, program: Program):
-        symbols = program.pop_stack(2)
+    def apply(self, symb1: Symbol, symb2: Symbol) -> Symbol:
+        """ Kontrola operandu a provedeni porovnani. """
+
+        if self.checked:
+            validate_comparable_symbols(self.opcode, symb1,
+                                        symb2, self.allowedTypes)
+        return bool_symbol(self.compare(symb1, symb2))
 
-        validate_comparable_symbols(self.opcode, symbols[1],
-                                    symbols[0], self.allowedTypes)
+    def execute(self, program: Program):
+        stack = program.data_stack
+        if len(stack) < 2:
+            program.stack_underflow()
 
-        result = Symbol(DataTypes.BOOL, self.compare(symbols[1], symbols[0]))
-        program.data_stack.append(result)
+        symb2 = stack.pop()
+        stack[-1] = self.apply(stack[-1], symb2)
 
 
 class Lt(ComparableInstruction):
@@ -298,7 +354,7 @@ class Not(InstructionBase):
                      'NOT\nInvalid data type. Expected: bool. Have: ({})'
                      .format(symb.data_type.value), True)
 
-        result = Symbol(DataTypes.BOOL, not symb.value)
+        result = bool_symbol(not symb.value)
         program.var_set('NOT', self.args[0], result)
 
 
@@ -317,11 +373,12 @@ class Int2Char(InstructionBase):
 
         try:
             char = chr(symb.value)
-            program.var_set('INT2CHAR', var, Symbol(DataTypes.STRING, char))
         except Exception:
             exit_app(exitCodes.INVALID_STRING_OPERATION,
                      'INT2CHAR\nInvalid int to char conversion value. {}'
                      .format(symb.value))
+        else:
+            program.var_set('INT2CHAR', var, string_symbol(char))
 
 
 class Stri2Int(InstructionBase):
@@ -341,9 +398,8 @@ class Stri2Int(InstructionBase):
                                                index.data_type.value), True)
 
         try:
-            ordinary = ord(string.value[index.value])
-            program.var_set('STRI2INT', self.args[0], Symbol(DataTypes.INT,
-                                                             ordinary))
+            ordinary = ord(string.char(index.value))
+            program.var_set('STRI2INT', self.args[0], int_symbol(ordinary))
         except IndexError:
             exit_app(exitCodes.INVALID_STRING_OPERATION,
                      'String is out of range.', True)
@@ -359,48 +415,8 @@ class Read(InstructionBase):
     expected_args = [ArgumentTypes.VARIABLE, ArgumentTypes.TYPE]
 
     def execute(self, program: Program):
-        try:
-            if program.input == stdin:
-                line = input().rstrip()
-            else:
-                line = program.input.readline().rstrip()
-        except Exception:
-            line = None
-
-        arg_type = self.args[1]
-
-        if line is None:
-            program.var_set('READ', self.args[0], Symbol(DataTypes.NIL, None))
-        elif arg_type.type is bool:
-            program.var_set('READ', self.args[0],
-                            Symbol(DataTypes.BOOL, line.lower() == 'true'))
-        elif arg_type.type is str:
-            program.var_set('READ', self.args[0], Symbol(DataTypes.STRING,
-                                                         line))
-        elif arg_type.type is int:
-            try:
-                temp_val = int(line)
-                if str(temp_val) != line:
-                    program.var_set(
-                        'READ', self.args[0], Symbol(DataTypes.NIL, None))
-                else:
-                    program.var_set('READ', self.args[0], Symbol(
-                        DataTypes.INT, temp_val))
-            except ValueError:
-                program.var_set(
-                    'READ', self.args[0], Symbol(DataTypes.NIL, None))
-        elif arg_type.type is float:
-            try:
-                try:
-                    float_value = float(line)
-                except ValueError:
-                    float_value = float.fromhex(line)
-            except Exception:
-                program.var_set(
-                    'READ', self.args[0], Symbol(DataTypes.NIL, None))
-            else:
-                program.var_set('READ', self.args[0], Symbol(
-                    DataTypes.FLOAT, float_value))
+        program.var_set('READ', self.args[0],
+                        read_symbol(program.input, self.args[1].type))
 
 
 class Write(InstructionBase):
@@ -411,14 +427,9 @@ class Write(InstructionBase):
     def execute(self, program: Program):
         symb = program.get_symb('WRITE', self.args[0])
 
-        if symb.is_nil():
-            print('', end='')
-        elif symb.is_bool():
-            print(str(symb.value).lower(), end='')
-        elif symb.is_float():
-            print(symb.value.hex(), end='')
-        else:
-            print(symb.value, end='')
+        # Konstanta ma textovou podobu pripravenou (viz Constant).
+        text = symb.text
+        program.output.write(render(symb) if text is None else text)
 
 
 # 6.4.5 Prace s retezci
@@ -428,6 +439,13 @@ class Concat(InstructionBase):
     expected_args = [ArgumentTypes.VARIABLE,
                      ArgumentTypes.SYMBOL, ArgumentTypes.SYMBOL]
 
+    def __init__(self, args: List, opcode: str):
+        InstructionBase.__init__(self, args, opcode)
+        # CONCAT <var> <var> <symb>: retezec se pripojuje primo k hodnote
+        # promenne (StringBuffer), ktera se tak pri kazdem pripojeni
+        # nekopiruje.
+        self.append = same_variable(args[0], args[1])
+
     def execute(self, program: Program):
         symb1 = program.get_symb('CONCAT', self.args[1])
 
@@ -441,7 +459,14 @@ class Concat(InstructionBase):
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'CONCAT\nInvalid type at third operand.', True)
 
-        result = Symbol(DataTypes.STRING, symb1.value + symb2.value)
+        if not self.append:
+            result = string_symbol(symb1.value + symb2.value)
+        elif type(symb1) is StringBuffer:
+            symb1.append(symb2.value)
+            return
+        else:
+            result = StringBuffer(symb1.value + symb2.value)
+
         program.var_set('CONCAT', self.args[0], result)
 
 
@@ -457,7 +482,7 @@ class Strlen(InstructionBase):
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'STRLEN\nExpected string', True)
 
-        string_length = Symbol(DataTypes.INT, len(string.value))
+        string_length = int_symbol(string.length())
         program.var_set('STRLEN', self.args[0], string_length)
 
 
@@ -476,7 +501,7 @@ class Getchar(InstructionBase):
                      'GETCHAR\nExpected string and int', True)
 
         try:
-            result = Symbol(DataTypes.STRING, string.value[index.value])
+            result = string_symbol(string.char(index.value))
             program.var_set('GETCHAR', self.args[0], result)
         except IndexError:
             exit_app(exitCodes.INVALID_STRING_OPERATION,
@@ -503,19 +528,28 @@ class Setchar(InstructionBase):
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'SETCHAR\nExpected: string variable, int, string', True)
 
-        if len(toModify.value) == 0 or index.value >= len(variable.value):
+        if toModify.length() == 0 or index.value >= variable.length():
             exit_app(exitCodes.INVALID_STRING_OPERATION,
                      'SETCHAR\nZero length of to modify characters.', True)
 
-        try:
+        if index.value < 0:
+            # Zaporny index zachovava puvodni chovani (slozeni z rezu).
             result = "{}{}{}".format(variable.value[:index.value],
-                                     toModify.value[0],
+                                     toModify.char(0),
                                      variable.value[index.value + 1:])
             program.var_set('SETCHAR', self.args[0],
-                            Symbol(DataTypes.STRING, result))
-        except IndexError:
-            exit_app(exitCodes.INVALID_STRING_OPERATION,
-                     'SETCHAR\nIndex is out of range.', True)
+                            string_symbol(result))
+            return
+
+        char = toModify.char(0)
+
+        # Znak se meni primo v poli znaku promenne (StringBuffer), ktere se
+        # vytvori pri prvni zmene.
+        if type(variable) is not StringBuffer:
+            variable = StringBuffer(variable.value)
+            program.var_set('SETCHAR', self.args[0], variable)
+
+        variable.set_char(index.value, char)
 
 
 # 6.4.6 Prace s typy
@@ -528,7 +562,7 @@ class Type(InstructionBase):
         symb = program.get_symb('TYPE', self.args[1], False)
 
         if symb is None:
-            program.var_set('TYPE', self.args[0], Symbol(DataTypes.STRING, ''))
+            program.var_set('TYPE', self.args[0], string_symbol(''))
         else:
             program.var_set('TYPE', self.args[0], Symbol(
                 DataTypes.STRING, symb.data_type.value))
@@ -550,13 +584,23 @@ class Jump(InstructionBase):
 
     expected_args = [ArgumentTypes.LABEL]
 
-    def execute(self, program: Program):
+    def __init__(self, args: List, opcode: str):
+        InstructionBase.__init__(self, args, opcode)
+        # Pozice navesti v programu. Nastavuje se pri propojeni (link).
+        self.target: int = None
+
+    def link(self, labels: Dict[str, int]):
+        """ Prevod navesti na pozici v programu. Provadi se pri nacteni. """
+
         label: LabelModel = self.args[0]
-        if label.name not in program.labels:
+        if label.name not in labels:
             exit_app(exitCodes.SEMANTIC_ERROR,
                      'Undefined label to jump. ({})'.format(label.name), True)
 
-        program.instruction_pointer = program.labels[label.name]
+        self.target = labels[label.name]
+
+    def execute(self, program: Program):
+        program.instruction_pointer = self.target
 
 
 class Call(Jump):
@@ -564,7 +608,7 @@ class Call(Jump):
 
     def execute(self, program: Program):
         program.call_stack.append(program.instruction_pointer)
-        Jump.execute(self, program)
+        program.instruction_pointer = self.target
 
 
 class Jumpifeq(Jump):
@@ -580,7 +624,7 @@ class Jumpifeq(Jump):
         if symb2.equal_type(symb1.data_type) or symb1.is_nil() or\
                 symb2.is_nil():
             if symb2.equals_value(symb1):
-                Jump.execute(self, program)
+                program.instruction_pointer = self.target
         else:
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'JUMPIFEQ\nOperands must have same type.', True)
@@ -599,7 +643,7 @@ class Jumpifneq(Jump):
         if symb2.equal_type(symb1.data_type) or symb1.is_nil() or\
                 symb2.is_nil():
             if not symb2.equals_value(symb1):
-                Jump.execute(self, program)
+                program.instruction_pointer = self.target
         else:
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'JUMPIFEQ\nOperands must have same type.', True)
@@ -632,14 +676,14 @@ class DPrint(InstructionBase):
 
     def execute(self, program: Program):
         symb = program.get_symb('DPRINT', self.args[0])
-        print(symb.value, file=stderr)
+        program.output.error(str(symb.value))
 
 
 class Break(InstructionBase):
     """ Vypis aktualniho stavu programu. """
 
     def execute(self, program: Program):
-        print(program.get_state(), file=stderr)
+        program.output.error(program.get_state())
 
 
 # Rozsireni FLOAT
@@ -656,7 +700,7 @@ class Int2Float(InstructionBase):
                      'INT2CHAR\nInvalid data type' +
                      ' Expected INT in second parameter.')
 
-        symbol = Symbol(DataTypes.FLOAT, float(symb.value))
+        symbol = float_symbol(float(symb.value))
         program.var_set('INT2FLOAT', self.args[0], symbol)
 
 
@@ -673,7 +717,7 @@ class Float2Int(InstructionBase):
                      'INT2CHAR\nInvalid data type' +
                      ' Expected FLOAT in second parameter.')
 
-        symbol = Symbol(DataTypes.INT, int(symb.value))
+        symbol = int_symbol(int(symb.value))
         program.var_set('FLOAT2INT', self.args[0], symbol)
 
 
@@ -685,7 +729,7 @@ class Div(MathInstructionBase):
             exit_app(exitCodes.INVALID_OPERAND_VALUE,
                      'DIV\nDetected zero division.', True)
 
-        return Symbol(DataTypes.FLOAT, symb1.value / symb2.value)
+        return float_symbol(symb1.value / symb2.value)
 
 
 # Rozsireni STACK
@@ -695,35 +739,35 @@ class Clears(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        program.data_stack = list()
+        program.data_stack.clear()
 
 
 class Adds(StackMathInstructionBase):
     """ Scitani (Zasobnikova varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value + symb2.value)
+        return create_symbol(symb1.data_type, symb1.value + symb2.value)
 
 
 class Subs(StackMathInstructionBase):
     """ Odcitani (Zasobnikova varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value - symb2.value)
+        return create_symbol(symb1.data_type, symb1.value - symb2.value)
 
 
 class Muls(StackMathInstructionBase):
     """ Nasobeni (Zasobnikova varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value * symb2.value)
+        return create_symbol(symb1.data_type, symb1.value * symb2.value)
 
 
 class IDivs(StackMathInstructionBase):
     """ Celociselne deleni (Zasobnikova varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value // symb2.value)
+        return create_symbol(symb1.data_type, symb1.value // symb2.value)
 
 
 # FLOAT + STACK
@@ -731,7 +775,7 @@ class Divs(StackMathInstructionBase):
     """ Deleni s plovouci desetinnou carkou (Zasobnikova varianta) """
 
     def compute(self, symb1: Symbol, symb2: Symbol):
-        return Symbol(symb1.data_type, symb1.value / symb2.value)
+        return create_symbol(symb1.data_type, symb1.value / symb2.value)
 
 
 class Lts(StackComparableInstruction):
@@ -782,15 +826,18 @@ class Nots(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        symb = program.pop_stack(1)[0]
+        stack = program.data_stack
+        if not stack:
+            program.stack_underflow()
+
+        symb = stack[-1]
 
         if not symb.is_bool():
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'NOT\nInvalid data type. Expected: bool. Have: ({})'
                      .format(symb.data_type.value), True)
 
-        result = Symbol(DataTypes.BOOL, not symb.value)
-        program.data_stack.append(result)
+        stack[-1] = bool_symbol(not symb.value)
 
 
 class Int2Chars(InstructionBase):
@@ -799,7 +846,11 @@ class Int2Chars(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        symb = program.pop_stack(1)[0]
+        stack = program.data_stack
+        if not stack:
+            program.stack_underflow()
+
+        symb = stack[-1]
 
         if not symb.is_int():
             exit_app(exitCodes.INVALID_DATA_TYPE,
@@ -812,7 +863,7 @@ class Int2Chars(InstructionBase):
                      'INT2CHARS\nInvalid int to char conversion value. {}'
                      .format(symb.value))
         else:
-            program.data_stack.append(Symbol(DataTypes.STRING, char))
+            stack[-1] = string_symbol(char)
 
 
 class Stri2Ints(InstructionBase):
@@ -821,9 +872,12 @@ class Stri2Ints(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        symbols = program.pop_stack(2)
-        index = symbols[0]
-        string = symbols[1]
+        stack = program.data_stack
+        if len(stack) < 2:
+            program.stack_underflow()
+
+        index = stack.pop()
+        string = stack[-1]
 
         if not string.is_string() or not index.is_int():
             exit_app(exitCodes.INVALID_DATA_TYPE,
@@ -837,7 +891,7 @@ class Stri2Ints(InstructionBase):
             exit_app(exitCodes.INVALID_STRING_OPERATION,
                      'String is out of range.', True)
         else:
-            program.data_stack.append(Symbol(DataTypes.INT, ordinary))
+            stack[-1] = int_symbol(ordinary)
 
 
 class Jumpifeqs(Jump):
@@ -846,15 +900,17 @@ class Jumpifeqs(Jump):
     expected_args = [ArgumentTypes.LABEL]
 
     def execute(self, program: Program):
-        symbols = program.pop_stack(2)
+        stack = program.data_stack
+        if len(stack) < 2:
+            program.stack_underflow()
 
-        symb2 = symbols[0]
-        symb1 = symbols[1]
+        symb2 = stack.pop()
+        symb1 = stack.pop()
 
         if symb2.equal_type(symb1.data_type) or symb1.is_nil() or\
                 symb2.is_nil():
             if symb2.equals_value(symb1):
-                Jump.execute(self, program)
+                program.instruction_pointer = self.target
         else:
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'JUMPIFEQS\nOperands must have same type.', True)
@@ -866,15 +922,17 @@ class Jumpifneqs(Jump):
     expected_args = [ArgumentTypes.LABEL]
 
     def execute(self, program: Program):
-        symbols = program.pop_stack(2)
+        stack = program.data_stack
+        if len(stack) < 2:
+            program.stack_underflow()
 
-        symb2 = symbols[0]
-        symb1 = symbols[1]
+        symb2 = stack.pop()
+        symb1 = stack.pop()
 
         if symb2.equal_type(symb1.data_type) or symb1.is_nil() or\
                 symb2.is_nil():
             if not symb2.equals_value(symb1):
-                Jump.execute(self, program)
+                program.instruction_pointer = self.target
         else:
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'JUMPIFEQS\nOperands must have same type.', True)
@@ -886,15 +944,18 @@ class Int2Floats(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        symb = program.pop_stack(1)[0]
+        stack = program.data_stack
+        if not stack:
+            program.stack_underflow()
+
+        symb = stack[-1]
 
         if not symb.is_int():
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'INT2CHAR\nInvalid data type' +
                      ' Expected INT in second parameter.')
 
-        symbol = Symbol(DataTypes.FLOAT, float(symb.value))
-        program.data_stack.append(symbol)
+        stack[-1] = float_symbol(float(symb.value))
 
 
 class Float2Ints(InstructionBase):
@@ -903,15 +964,94 @@ class Float2Ints(InstructionBase):
     expected_args = []
 
     def execute(self, program: Program):
-        symb = program.pop_stack(1)[0]
+        stack = program.data_stack
+        if not stack:
+            program.stack_underflow()
+
+        symb = stack[-1]
 
         if not symb.is_float():
             exit_app(exitCodes.INVALID_DATA_TYPE,
                      'INT2CHAR\nInvalid data type' +
                      ' Expected FLOAT in second parameter.')
 
-        symbol = Symbol(DataTypes.INT, int(symb.value))
-        program.data_stack.append(symbol)
+        stack[-1] = int_symbol(int(symb.value))
+
+
+# Slozene instrukce (optimalizace -O1, viz optimizer.py)
+class StackOperationPops(InstructionBase):
+    """
+    PUSHS <symb1>; PUSHS <symb2>; <operace>S; POPS <var>
+    Vysledek se uklada primo do promenne, bez pouziti datoveho zasobniku.
+    """
+
+    def __init__(self, parts: List[InstructionBase]):
+        self.opcode = 'PUSHS+PUSHS+{}+POPS'.format(parts[2].opcode)
+        self.order = parts[0].order
+        self.args = [parts[3].args[0], parts[0].args[0], parts[1].args[0]]
+        self.operation = parts[2]
+        self.count = len(parts)
+
+    def execute(self, program: Program):
+        symb1 = program.get_symb('PUSHS', self.args[1])
+        symb2 = program.get_symb('PUSHS', self.args[2])
+        result = self.operation.apply(symb1, symb2)
+        program.var_set('POPS', self.args[0], result)
+
+
+class CompareJump(Jump):
+    """
+    <porovnani> <var> <symb1> <symb2>; JUMPIF(N)EQ <label> <var> bool@...
+    Vysledek porovnani se ulozi do promenne a rovnou se vyhodnoti skok.
+    """
+
+    def __init__(self, compare: ComparableInstruction, jump: Jump,
+                 jump_if: bool):
+        self.opcode = '{}+{}'.format(compare.opcode, jump.opcode)
+        self.order = compare.order
+        self.args = jump.args
+        self.target: int = None
+        self.compare = compare
+        # Hodnota vysledku porovnani, pri ktere se provede skok.
+        self.jump_if = jump_if
+        self.count = 2
+
+    def execute(self, program: Program):
+        compare = self.compare
+        symb1 = program.get_symb(compare.opcode, compare.args[1])
+        symb2 = program.get_symb(compare.opcode, compare.args[2])
+
+        result = compare.apply(symb1, symb2)
+        program.var_set(compare.opcode, compare.args[0], result)
+
+        if result.value is self.jump_if:
+            program.instruction_pointer = self.target
+
+
+class FramedCall(Call):
+    """
+    CREATEFRAME; PUSHFRAME; CALL <label>
+    Novy ramec se vlozi rovnou na zasobnik lokalnich ramcu.
+    """
+
+    def __init__(self, parts: List[InstructionBase]):
+        self.opcode = 'CREATEFRAME+PUSHFRAME+CALL'
+        self.order = parts[0].order
+        self.args = parts[2].args
+        self.target: int = None
+        self.count = len(parts)
+
+    def execute(self, program: Program):
+        if program.stats is not None:
+            program.stats.replace_frame(program.TF, None)
+            if len(program.LF_Stack) > 0:
+                program.stats.replace_frame(program.LF_Stack[-1], None)
+
+        program.release_frame(program.TF)
+        program.LF_Stack.append(program.create_frame())
+        program.TF = None
+        program.call_stack.append(program.instruction_pointer)
+        program.instruction_pointer = self.target
 
 
 OPCODE_TO_CLASS_MAP = {
@@ -1,69 +1,268 @@
 import sys
-from sys import stdin
+from sys import stdin, stdout, stderr
 from helper import exit_app
-from enums import exitCodes
+from enums import exitCodes, Engines, FlushPolicies
+from errors import InterpretError
 from argparse import ArgumentParser
-from instruction_parser import InstructionsParser
-from program import Program
+from runner import load, execute, report
 from stats import Stats
+from profiler import Profiler, SampleProfiler, SAMPLE_INTERVAL
+from output import Output
+from input_reader import InputReader
+from cache import ProgramCache
+from batch import run_batch, DEFAULT_TIMEOUT
+from prefork import PreforkServer
+from daemon import WorkerDaemon, DEFAULT_CAPACITY
+from transpiler import TranspileError, transpile
+from cfg import ControlFlowGraph
+from os import cpu_count
+from time import perf_counter
+from io import BytesIO, TextIOWrapper
 
 
 def argument_parse_error(message: str):
     exit_app(exitCodes.INVALID_ARGUMENTS, message)
 
 
-if '--help' in sys.argv and len(sys.argv) > 2:
-    exit_app(exitCodes.INVALID_ARGUMENTS,
-             '--help cannot be combined with another parameters')
-
-parser = ArgumentParser()
-parser.add_argument('--source', type=str)
-parser.add_argument('--input', type=str)
-parser.add_argument('--stats', type=str)
-parser.add_argument('--insts', default=False, action='store_true')
-parser.add_argument('--vars', default=False, action='store_true')
-parser.error = argument_parse_error
-
-arguments = parser.parse_args()
-
-if arguments.source is None and arguments.input is None:
-    exit_app(exitCodes.INVALID_ARGUMENTS,
-             '--source or --input or both parameters are required.')
-
-xml_file = stdin
-try:
-    if arguments.source is not None:
-        xml_file = open(arguments.source, 'r')
-except Exception:
-    exit_app(exitCodes.CANNOT_READ_FILE, 'Cannot open XML file.')
-
-input_file = stdin
-try:
-    if arguments.input is not None:
-        input_file = open(arguments.input, 'r')
-except Exception:
-    exit_app(exitCodes.CANNOT_READ_FILE, 'Cannot open inputs file')
-
-stats: Stats = None
-if arguments.stats is not None:
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument('--source', type=str)
+    parser.add_argument('--input', type=str)
+    parser.add_argument('--stats', type=str)
+    parser.add_argument('--insts', default=False, action='store_true')
+    parser.add_argument('--vars', default=False, action='store_true')
+    parser.add_argument('--checks', default=False, action='store_true')
+    parser.add_argument('--pool-size', default=False, action='store_true')
+    parser.add_argument('--pool-hits', default=False, action='store_true')
+    parser.add_argument('--engine', type=str, default=Engines.DEFAULT.value,
+                        choices=[engine.value for engine in Engines])
+    parser.add_argument('-O', dest='optimization', type=int, default=0,
+                        choices=[0, 1, 2])
+    parser.add_argument('--flush', type=str,
+                        default=FlushPolicies.SIZE.value,
+                        choices=[policy.value for policy in FlushPolicies])
+    parser.add_argument('--sync-stderr', default=False, action='store_true')
+    parser.add_argument('--cache-dir', type=str)
+    parser.add_argument('--profile', type=str)
+    parser.add_argument('--profile-stacks', type=str)
+    parser.add_argument('--sample-profile', type=str)
+    parser.add_argument('--sample-interval', type=float,
+                        default=SAMPLE_INTERVAL)
+    parser.add_argument('--batch', type=str)
+    parser.add_argument('--jobs', type=int, default=cpu_count() or 1)
+    parser.add_argument('--results', type=str)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--memory-limit', type=int)
+    parser.add_argument('--prefork', type=str)
+    parser.add_argument('--serve', type=str)
+    parser.add_argument('--serve-cache', type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument('--dump-python', type=str)
+    parser.add_argument('--dump-cfg', type=str)
+    parser.error = argument_parse_error
+    return parser
+
+
+def batch(arguments) -> int:
+    """ Provedeni seznamu uloh (--batch) pracovnimi procesy. """
+
+    if arguments.jobs < 1 or arguments.timeout <= 0 or \
+            (arguments.memory_limit is not None and
+             arguments.memory_limit < 1):
+        exit_app(exitCodes.INVALID_ARGUMENTS,
+                 '--jobs, --timeout and --memory-limit must be positive.')
+
+    try:
+        results = open(arguments.results, 'w') \
+            if arguments.results is not None else stdout
+    except Exception:
+        exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open results file')
+
+    try:
+        summary = run_batch(arguments.batch, results, arguments.jobs,
+                            arguments.timeout, arguments.memory_limit,
+                            Engines(arguments.engine),
+                            arguments.optimization)
+    except (OSError, ValueError):
+        exit_app(exitCodes.CANNOT_READ_FILE, 'Cannot read batch manifest.')
+    finally:
+        if results is not stdout:
+            results.close()
+
+    print('{jobs} jobs, {passed} passed, {failed} failed'.format(**summary),
+          file=stderr)
+    return 0
+
+
+def dump_python(instructions, path: str):
+    """ Ulozeni zdrojoveho kodu programu prelozeneho do jazyka Python
+    (--dump-python, viz transpiler.py). """
+
+    try:
+        source, _ = transpile(instructions)
+    except TranspileError as e:
+        source = '# {}\n'.format(e)
+
     try:
-        if not arguments.insts and not arguments.vars:
+        with open(path, 'w') as file:
+            file.write(source)
+    except OSError:
+        exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open dump file')
+
+
+def dump_cfg(instructions, path: str):
+    """ Ulozeni grafu toku rizeni nacteneho programu ve formatu DOT
+    (--dump-cfg, viz cfg.py). """
+
+    graph = ControlFlowGraph(instructions.instructions, instructions.labels)
+
+    try:
+        with open(path, 'w') as file:
+            file.write(graph.to_dot())
+    except OSError:
+        exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open dump file')
+
+
+def main() -> int:
+    """ Zpracovani parametru, nacteni a provedeni programu. Vraci navratovy
+    kod programu, chyby se hlasi vyjimkou InterpretError. """
+
+    if '--help' in sys.argv and len(sys.argv) > 2:
+        exit_app(exitCodes.INVALID_ARGUMENTS,
+                 '--help cannot be combined with another parameters')
+
+    arguments = create_parser().parse_args()
+
+    if arguments.batch is not None:
+        return batch(arguments)
+
+    if arguments.serve is not None:
+        if arguments.serve_cache < 1:
+            exit_app(exitCodes.INVALID_ARGUMENTS,
+                     '--serve-cache must be positive.')
+
+        WorkerDaemon(arguments.serve, arguments.serve_cache).serve()
+        return 0
+
+    if arguments.source is None and arguments.input is None:
+        exit_app(exitCodes.INVALID_ARGUMENTS,
+                 '--source or --input or both parameters are required.')
+
+    if arguments.prefork is not None and arguments.source is None:
+        exit_app(exitCodes.INVALID_ARGUMENTS,
+                 '--prefork requires --source parameter.')
+
+    xml_file = stdin
+    try:
+        if arguments.source is not None:
+            xml_file = open(arguments.source, 'r')
+    except Exception:
+        exit_app(exitCodes.CANNOT_READ_FILE, 'Cannot open XML file.')
+
+    try:
+        if arguments.input is not None:
+            input_file = InputReader.from_file(arguments.input)
+        else:
+            input_file = InputReader.from_stdin()
+    except Exception:
+        exit_app(exitCodes.CANNOT_READ_FILE, 'Cannot open inputs file')
+
+    stats: Stats = None
+    if arguments.stats is not None:
+        if not arguments.insts and not arguments.vars and \
+                not arguments.checks and not arguments.pool_size and \
+                not arguments.pool_hits:
             exit_app(exitCodes.INVALID_ARGUMENTS,
                      'For stats parameter is required minimal ' +
-                     'one of --vars or --insts parameters.')
+                     'one of --vars, --insts, --checks, --pool-size or ' +
+                     '--pool-hits parameters.')
+
+        try:
+            stats_file = open(arguments.stats, 'w+')
+        except Exception as e:
+            print(e)
+            exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open stats file')
+
+        stats = Stats(stats_file, arguments.insts, arguments.vars,
+                      arguments.checks,
+                      arguments.pool_size or arguments.pool_hits)
+
+    profiler: Profiler = None
+    if arguments.profile is not None or \
+            arguments.profile_stacks is not None:
+        try:
+            profiler = Profiler(
+                open(arguments.profile, 'w')
+                if arguments.profile is not None else None,
+                open(arguments.profile_stacks, 'w')
+                if arguments.profile_stacks is not None else None)
+        except Exception:
+            exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open profile file')
+
+    sampler: SampleProfiler = None
+    if arguments.sample_profile is not None:
+        if arguments.sample_interval <= 0:
+            exit_app(exitCodes.INVALID_ARGUMENTS,
+                     '--sample-interval must be positive number.')
+
+        try:
+            sampler = SampleProfiler(open(arguments.sample_profile, 'w'),
+                                     arguments.sample_interval)
+        except Exception:
+            exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open profile file')
+
+    start = perf_counter()
+
+    if arguments.cache_dir is None:
+        instructions = load(xml_file, arguments.optimization)
+    else:
+        # Propojeny program se nacte z cache, nebo se do ni po nacteni ulozi.
+        cache = ProgramCache(arguments.cache_dir)
+
+        if arguments.source is not None:
+            with open(arguments.source, 'rb') as source:
+                key = cache.key(source, arguments.optimization)
+        else:
+            source_data = stdin.buffer.read()
+            key = cache.key(BytesIO(source_data), arguments.optimization)
+            xml_file = TextIOWrapper(BytesIO(source_data), stdin.encoding)
+
+        instructions = cache.load(key)
+        if instructions is None:
+            instructions = load(xml_file, arguments.optimization)
+            cache.store(key, instructions)
 
-        stats_file = open(arguments.stats, 'w+')
-        stats = Stats(stats_file, arguments.insts, arguments.vars)
-    except Exception as e:
-        print(e)
-        exit_app(exitCodes.CANNOT_WRITE_FILE, 'Cannot open stats file')
+    if arguments.dump_python is not None:
+        dump_python(instructions, arguments.dump_python)
 
-instructions = InstructionsParser.parse_file(xml_file)
-program = Program(list(instructions.values()), input_file, stats)
-program.run()
+    if arguments.dump_cfg is not None:
+        dump_cfg(instructions, arguments.dump_cfg)
 
-if stats is not None:
-    stats.save()
-    stats_file.close()
+    if arguments.prefork is not None:
+        # Program se provadi az v potomcich serveru (vstupy z pozadavku).
+        server = PreforkServer(instructions, round(perf_counter() - start, 6),
+                               Engines(arguments.engine),
+                               arguments.optimization)
+        server.serve(arguments.prefork)
+        return 0
+
+    output = Output(policy=FlushPolicies(arguments.flush),
+                    sync_stderr=arguments.sync_stderr)
+    exit_code = execute(instructions, input_file, output, stats,
+                        Engines(arguments.engine), arguments.optimization,
+                        profiler, sampler)
+
+    if stats is not None:
+        stats.save()
+        stats_file.close()
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    try:
+        code = main()
+    except InterpretError as error:
+        report(error, stdout, stderr)
+        code = int(error.code)
 
-exit(int(program.exit_code))
+    exit(code)
@@ -4,14 +4,24 @@ from typing import Any, List
 
 class InstructionArgument():
     """ Obecny model pro operandy. """
+
+    __slots__ = ()
     arg_type: ArgumentTypes
 
 
 class Symbol(InstructionArgument):
-    """ Konstanta nebo promenna. """
+    """
+    Konstanta nebo promenna. Instance se po vytvoreni nemeni, a proto mohou
+    byt sdileny (viz funkce pro vytvareni symbolu na konci modulu).
+    """
+
+    __slots__ = ('data_type', 'value')
+    arg_type = ArgumentTypes.SYMBOL
+    # Textova podoba pro instrukci WRITE. Predem je pripravena pouze
+    # u sdilenych konstant (viz Constant), jinak se vytvari az pri vypisu.
+    text: str = None
 
     def __init__(self, data_type: DataTypes, value: Any):
-        self.arg_type = ArgumentTypes.SYMBOL
         self.data_type = data_type
         self.value = value
 
@@ -47,27 +57,183 @@ class Symbol(InstructionArgument):
     def equals_value(self, symb: 'Symbol'):
         return self.value == symb.value
 
+    def length(self) -> int:
+        """ Delka retezce (instrukce STRLEN). """
+
+        return len(self.value)
+
+    def char(self, index: int) -> str:
+        """ Znak retezce na pozici <index> (IndexError mimo rozsah). """
+
+        return self.value[index]
+
+    def __reduce__(self):
+        # Po nacteni z cache (pickle) se opet pouziji sdilene instance.
+        return create_symbol, (self.data_type, self.value)
+
 
 class Variable(InstructionArgument):
     """ Operand promenna. """
 
+    __slots__ = ('frame', 'value', 'slot')
+    arg_type = ArgumentTypes.VARIABLE
+
     def __init__(self, frame: Frames, value: Any):
-        self.arg_type = ArgumentTypes.VARIABLE
         self.frame = frame
         self.value = value
+        # Index promenne v ramci. Prirazen pri nacteni programu.
+        self.slot: int = None
+
+
+def same_variable(var1: Variable, var2: Variable) -> bool:
+    """ Oba operandy jsou tataz promenna. """
+
+    return type(var1) is Variable and type(var2) is Variable and \
+        var1.frame == var2.frame and var1.value == var2.value
 
 
 class Type(InstructionArgument):
     """ Operand typ """
 
+    __slots__ = ('type',)
+    arg_type = ArgumentTypes.TYPE
+
     def __init__(self, type: Any):
-        self.arg_type = ArgumentTypes.TYPE
         self.type = type
 
 
 class Label(InstructionArgument):
     """ Operand navesti """
 
+    __slots__ = ('name',)
+    arg_type = ArgumentTypes.LABEL
+
     def __init__(self, name: str):
-        self.arg_type = ArgumentTypes.LABEL
         self.name = name
+
+
+def render(symb: Symbol) -> str:
+    """ Textova podoba symbolu pro instrukci WRITE. """
+
+    if symb.is_nil():
+        return ''
+    elif symb.is_bool():
+        return 'true' if symb.value else 'false'
+    elif symb.is_float():
+        return symb.value.hex()
+
+    return str(symb.value)
+
+
+class Constant(Symbol):
+    """
+    Sdilena konstanta (literal programu nebo sdilena instance nejcastejsich
+    hodnot) s predem pripravenou textovou podobou pro instrukci WRITE.
+    """
+
+    __slots__ = ('text',)
+
+    def __init__(self, data_type: DataTypes, value: Any):
+        super().__init__(data_type, value)
+        self.text = render(self)
+
+    def __reduce__(self):
+        return constant_symbol, (self.data_type, self.value)
+
+
+class StringBuffer(Symbol):
+    """
+    Menitelny retezec (pole znaku) pro instrukce SETCHAR a CONCAT, ktere tak
+    nevytvari pri kazde zmene novy retezec. Hodnota value (str) se vytvori
+    az pri cteni a uchova se do dalsi zmeny.
+
+    Instance patri vzdy jedine promenne. Instrukce, ktere hodnotu promenne
+    kopiruji (MOVE, PUSHS), predavaji misto ni nemenny symbol (snapshot).
+    """
+
+    __slots__ = ('chars', 'string')
+
+    def __init__(self, value: str):
+        self.data_type = DataTypes.STRING
+        self.chars = list(value)
+        self.string = value
+
+    @property
+    def value(self) -> str:
+        if self.string is None:
+            self.string = ''.join(self.chars)
+
+        return self.string
+
+    def length(self) -> int:
+        return len(self.chars)
+
+    def char(self, index: int) -> str:
+        return self.chars[index]
+
+    def append(self, value: str):
+        self.chars.extend(value)
+        self.string = None
+
+    def set_char(self, index: int, char: str):
+        self.chars[index] = char
+        self.string = None
+
+    def snapshot(self) -> Symbol:
+        """ Nemenna kopie aktualni hodnoty. """
+
+        return Symbol(DataTypes.STRING, self.value)
+
+
+# Sdilene instance nejcastejsich hodnot.
+NIL_SYMBOL = Constant(DataTypes.NIL, None)
+TRUE_SYMBOL = Constant(DataTypes.BOOL, True)
+FALSE_SYMBOL = Constant(DataTypes.BOOL, False)
+
+# Rozsah celych cisel, pro ktere existuji predem vytvorene instance.
+SMALL_INT_MIN = -128
+SMALL_INT_MAX = 1024
+SMALL_INTS = [Constant(DataTypes.INT, value)
+              for value in range(SMALL_INT_MIN, SMALL_INT_MAX + 1)]
+
+
+def bool_symbol(value: bool) -> Symbol:
+    return TRUE_SYMBOL if value else FALSE_SYMBOL
+
+
+def int_symbol(value: int) -> Symbol:
+    # Vysledek IDIV s operandy float a DIVS s operandy int ma typ int, ale
+    # hodnotu float (chovani puvodniho interpretu). Sdilene instance jsou
+    # pouze pro hodnoty typu int.
+    if type(value) is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return SMALL_INTS[value - SMALL_INT_MIN]
+
+    return Symbol(DataTypes.INT, value)
+
+
+def float_symbol(value: float) -> Symbol:
+    return Symbol(DataTypes.FLOAT, value)
+
+
+def string_symbol(value: str) -> Symbol:
+    return Symbol(DataTypes.STRING, value)
+
+
+def create_symbol(data_type: DataTypes, value: Any) -> Symbol:
+    """ Vytvoreni symbolu libovolneho typu (pouziti sdilenych instanci). """
+
+    if data_type == DataTypes.INT:
+        return int_symbol(value)
+    elif data_type == DataTypes.BOOL:
+        return bool_symbol(value)
+    elif data_type == DataTypes.NIL:
+        return NIL_SYMBOL
+
+    return Symbol(data_type, value)
+
+
+def constant_symbol(data_type: DataTypes, value: Any) -> Symbol:
+    """ Vytvoreni konstanty (Constant) s pouzitim sdilenych instanci. """
+
+    symbol = create_symbol(data_type, value)
+    return symbol if type(symbol) is Constant else Constant(data_type, value)
@@ -0,0 +1,140 @@
+from typing import List, Tuple
+from enums import DataTypes
+from models import Symbol, same_variable
+from type_inference import infer_types
+import instructions as instrs
+
+
+def match_stack_operation(instructions: List['instrs.InstructionBase'],
+                          index: int) -> 'instrs.InstructionBase':
+    """ PUSHS <symb1>; PUSHS <symb2>; <operace>S; POPS <var> """
+
+    parts = instructions[index:index + 4]
+    if len(parts) < 4:
+        return None
+
+    if type(parts[0]) is instrs.PushS and type(parts[1]) is instrs.PushS and \
+            isinstance(parts[2], (instrs.StackMathInstructionBase,
+                                  instrs.StackComparableInstruction)) and \
+            type(parts[3]) is instrs.PopS:
+        return instrs.StackOperationPops(parts)
+
+    return None
+
+
+def match_compare_jump(instructions: List['instrs.InstructionBase'],
+                       index: int) -> 'instrs.InstructionBase':
+    """ <porovnani> <var> <symb1> <symb2>; JUMPIF(N)EQ <label> <var> bool@... """
+
+    parts = instructions[index:index + 2]
+    if len(parts) < 2:
+        return None
+
+    compare, jump = parts
+    if not isinstance(compare, instrs.ComparableInstruction) or \
+            type(jump) not in (instrs.Jumpifeq, instrs.Jumpifneq):
+        return None
+
+    result = compare.args[0]
+    if same_variable(result, jump.args[1]):
+        constant = jump.args[2]
+    elif same_variable(result, jump.args[2]):
+        constant = jump.args[1]
+    else:
+        return None
+
+    if not isinstance(constant, Symbol) or \
+            constant.data_type != DataTypes.BOOL:
+        return None
+
+    jump_if = constant.value if type(jump) is instrs.Jumpifeq \
+        else not constant.value
+    return instrs.CompareJump(compare, jump, jump_if)
+
+
+def match_framed_call(instructions: List['instrs.InstructionBase'],
+                      index: int) -> 'instrs.InstructionBase':
+    """ CREATEFRAME; PUSHFRAME; CALL <label> """
+
+    parts = instructions[index:index + 3]
+    if len(parts) < 3:
+        return None
+
+    if type(parts[0]) is instrs.Createframe and \
+            type(parts[1]) is instrs.Pushframe and \
+            type(parts[2]) is instrs.Call:
+        return instrs.FramedCall(parts)
+
+    return None
+
+
+PATTERNS = [
+    match_stack_operation,
+    match_compare_jump,
+    match_framed_call
+]
+
+
+def fuse_instructions(instructions: List['instrs.InstructionBase']) -> \
+        List['instrs.InstructionBase']:
+    """ Nahrazeni castych posloupnosti instrukci slozenymi instrukcemi.
+
+    Posloupnost se nahradi pouze tehdy, pokud v ni neni navesti. Do stredu
+    slozene instrukce tak nemuze vest zadny skok.
+
+    Parameters
+    ----------
+    instructions: List[InstructionBase]
+        Instrukce programu vcetne navesti (v poradi podle atributu order).
+    Returns
+    -------
+    List[InstructionBase]
+        Upraveny seznam instrukci.
+    """
+
+    result: List['instrs.InstructionBase'] = list()
+    index = 0
+
+    while index < len(instructions):
+        for pattern in PATTERNS:
+            fused = pattern(instructions, index)
+
+            if fused is not None:
+                result.append(fused)
+                index += fused.count
+                break
+        else:
+            result.append(instructions[index])
+            index += 1
+
+    return result
+
+
+def optimize(instructions: List['instrs.InstructionBase'], level: int) -> \
+        Tuple[List['instrs.InstructionBase'], int]:
+    """ Optimalizace nacteneho programu podle urovne (parametr -O).
+
+    Parameters
+    ----------
+    instructions: List[InstructionBase]
+        Instrukce programu vcetne navesti.
+    level: int
+        Uroven optimalizace. 0 = bez optimalizaci, 1 = slozene instrukce,
+        2 = navic odstraneni dokazanych kontrol typu operandu.
+    Returns
+    -------
+    Tuple[List[InstructionBase], int]
+        Upraveny seznam instrukci a pocet odstranenych kontrol typu.
+    """
+
+    elided = 0
+
+    # Analyza typu musi probehnout pred slozenim instrukci (vidi jednotlive
+    # instrukce a navesti).
+    if level >= 2:
+        elided = infer_types(instructions)
+
+    if level >= 1:
+        instructions = fuse_instructions(instructions)
+
+    return instructions, elided
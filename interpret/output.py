@@ -0,0 +1,79 @@
+from typing import IO, List
+from enums import FlushPolicies
+from sys import stdout, stderr
+
+# Vychozi velikost bufferu (pocet znaku).
+BUFFER_SIZE = 1 << 16
+
+
+class Output():
+    """
+    Buffer standardniho vystupu programu (instrukce WRITE). Text se
+    shromazduje v seznamu a na vystup se zapisuje po vetsich blocich podle
+    zvolene politiky vyprazdneni. Program buffer vyprazdni vzdy pri ukonceni
+    (i pri chybe, viz Program.run).
+    """
+
+    def __init__(self, stream: IO = stdout,
+                 policy: FlushPolicies = FlushPolicies.SIZE,
+                 size: int = BUFFER_SIZE, sync_stderr: bool = False,
+                 error_stream: IO = stderr):
+        """
+        Parameters
+        ----------
+        stream: IO
+            Cilovy vystup.
+        policy: FlushPolicies
+            Okamzik vyprazdneni bufferu.
+        size: int
+            Velikost bufferu pro politiku FlushPolicies.SIZE.
+        sync_stderr: bool
+            Priznak, ze se ma buffer vyprazdnit pred kazdym vypisem na
+            standardni chybovy vystup (zachovani poradi vypisu).
+        error_stream: IO
+            Vystup ladicich informaci (DPRINT, BREAK).
+        """
+
+        self.stream = stream
+        self.error_stream = error_stream
+        self.policy = policy
+        self.sync_stderr = sync_stderr
+        self.buffer: List[str] = list()
+        # Pocet znaku v bufferu.
+        self.length = 0
+        # Pocet znaku, po jehoz dosazeni se buffer vyprazdni.
+        self.limit = size if policy == FlushPolicies.SIZE else float('inf')
+        self.on_newline = policy == FlushPolicies.NEWLINE
+
+    def write(self, text: str):
+        self.buffer.append(text)
+        self.length += len(text)
+
+        if self.length >= self.limit or (self.on_newline and '\n' in text):
+            self.flush()
+
+    def flush(self):
+        """ Zapis obsahu bufferu na vystup. """
+
+        if len(self.buffer) > 0:
+            self.stream.write(''.join(self.buffer))
+            self.buffer.clear()
+            self.length = 0
+
+        self.stream.flush()
+
+    def error(self, text: str):
+        """ Vypis ladici informace na standardni chybovy vystup. """
+
+        if self.sync_stderr:
+            self.flush()
+
+        print(text, file=self.error_stream)
+
+    def detach(self):
+        """
+        Konec behu programu. Vyprazdneni bufferu. Pri chybe se tak vypis
+        programu zapise jeste pred chybovym hlasenim (viz helper.exit_app).
+        """
+
+        self.flush()
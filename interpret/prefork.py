@@ -0,0 +1,191 @@
+from typing import BinaryIO, List
+from runner import run
+from program import LinkedProgram
+from enums import Engines, exitCodes
+from stats import STATS_OPTIONS
+import gc
+import json
+import os
+import socket
+import time
+
+
+class PreforkServer():
+    """
+    Server, ktery provadi jeden program s ruznymi vstupy. Program se nacte
+    a propoji pouze jednou v rodicovskem procesu, pro kazdy pozadavek se
+    vytvori potomek (fork), ktery s rodicem sdili instrukce a konstanty
+    (copy-on-write) a provede program se vstupy z pozadavku.
+
+    Protokol ridiciho socketu (Unix socket): pozadavek je radek JSON
+    s klici id, inputs (seznam cest ke vstupum, kazdy vstup se provede
+    zvlast v jednom potomkovi), input_size (za radkem nasleduje vstup
+    o zadane velikosti v bajtech) a stats (nazvy statistik). Pozadavek
+    {"command": "shutdown"} server ukonci. Na chybny pozadavek se odpovi
+    {"error": ...} a server pokracuje dal. Odpoved je radek JSON s vysledky
+    jednotlivych vstupu a s dobou vytvoreni potomka (fork_time) a dobou
+    nacteni programu (parse_time) zvlast.
+    """
+
+    def __init__(self, linked: LinkedProgram, parse_time: float,
+                 engine: Engines = Engines.DEFAULT, optimization: int = 0):
+        self.linked = linked
+        self.parse_time = parse_time
+        self.engine = engine
+        self.optimization = optimization
+
+    def serve(self, path: str):
+        """ Prijimani pozadavku na socketu <path> az do prikazu shutdown. """
+
+        # Objekty nacteneho programu se presunou do trvale generace, aby je
+        # garbage collector v potomcich neprochazel (zapis do hlavicek
+        # objektu by rusil sdileni stranek pameti).
+        gc.collect()
+        gc.freeze()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if os.path.exists(path):
+            os.unlink(path)
+
+        server.bind(path)
+        server.listen()
+
+        try:
+            running = True
+            while running:
+                connection, _ = server.accept()
+                with connection, connection.makefile('rb') as stream:
+                    running = self.handle(connection, stream)
+        finally:
+            server.close()
+            os.unlink(path)
+
+    def handle(self, connection: socket.socket, stream: BinaryIO) -> bool:
+        """ Zpracovani pozadavku jednoho spojeni. Vraci False po prikazu
+        shutdown. Na chybny pozadavek se odpovi {"error": ...}, pri chybe
+        spojeni (klient se odpojil) se ukonci pouze toto spojeni. """
+
+        try:
+            for line in stream:
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise TypeError('Request must be a JSON object.')
+
+                    if request.get('command') == 'shutdown':
+                        return False
+
+                    response = self.process(request, stream)
+                except (ValueError, TypeError, KeyError) as e:
+                    response = {'error': '{}: {}'.format(type(e).__name__, e)}
+
+                connection.sendall((json.dumps(response) + '\n').encode())
+        except OSError:
+            pass
+
+        return True
+
+    def process(self, request: dict, stream: BinaryIO) -> dict:
+        """ Provedeni jednoho pozadavku (vstup za radkem pozadavku nebo
+        seznam cest ke vstupum). Chybne hodnoty pozadavku se hlasi
+        vyjimkou TypeError nebo ValueError. """
+
+        stats = request.get('stats', [])
+        if not isinstance(stats, list):
+            raise TypeError('stats must be a list.')
+        for option in stats:
+            if option not in STATS_OPTIONS:
+                raise ValueError('Unknown stats option {!r}.'.format(option))
+
+        if 'input_size' in request:
+            size = request['input_size']
+            if type(size) is not int:
+                raise TypeError('input_size must be an integer.')
+            if size < 0:
+                raise ValueError('input_size must not be negative.')
+
+            response = self.fork([stream.read(size)], stats)
+        else:
+            inputs = request.get('inputs', [])
+            if not isinstance(inputs, list) or \
+                    not all(isinstance(item, str) for item in inputs):
+                raise TypeError('inputs must be a list of paths.')
+
+            response = self.fork(inputs, stats)
+
+        response['id'] = request.get('id')
+        return response
+
+    def fork(self, inputs: List[bytes or str], stats: List[str]) -> dict:
+        """ Provedeni programu se vstupy (data nebo cesty k souborum)
+        v novem potomkovi. """
+
+        read_fd, write_fd = os.pipe()
+        start = time.perf_counter()
+        pid = os.fork()
+
+        if pid == 0:
+            os.close(read_fd)
+            self.child(write_fd, inputs, stats)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, 'rb') as pipe:
+            data = pipe.read()
+
+        _, status = os.waitpid(pid, 0)
+
+        if not data:
+            return {'status': 'crash', 'wait_status': status,
+                    'parse_time': self.parse_time}
+
+        response = json.loads(data)
+        # Hodiny perf_counter jsou spolecne pro vsechny procesy systemu.
+        response['fork_time'] = round(response.pop('started') - start, 6)
+        response['parse_time'] = self.parse_time
+        return response
+
+    def child(self, write_fd: int, inputs: List[bytes or str],
+              stats: List[str]):
+        """ Potomek: provedeni programu a zapis vysledku do roury. Potomek
+        se ukonci bez navratu (os._exit). """
+
+        started = time.perf_counter()
+        code = 0
+
+        try:
+            results = list()
+            for data_input in inputs:
+                if isinstance(data_input, str):
+                    try:
+                        with open(data_input, 'rb') as file:
+                            data_input = file.read()
+                    except OSError:
+                        results.append({
+                            'exit_code': int(exitCodes.CANNOT_READ_FILE),
+                            'stdout': 'Cannot open inputs file\n',
+                            'stderr': '', 'stats': {}, 'run_time': 0.0
+                        })
+                        continue
+
+                begin = time.perf_counter()
+                result = run(self.linked, data_input, stats, self.engine,
+                             self.optimization)
+                results.append({
+                    'exit_code': result.exit_code,
+                    'stdout': result.stdout,
+                    'stderr': result.stderr,
+                    'stats': result.stats,
+                    'run_time': round(time.perf_counter() - begin, 6)
+                })
+
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(json.dumps({
+                    'status': 'ok', 'started': started, 'results': results
+                }).encode())
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
@@ -0,0 +1,234 @@
+from typing import IO, Dict, List, Tuple
+from bisect import bisect_right
+import json
+import signal
+
+# Nazev korene zasobniku volani (kod mimo funkce).
+ROOT_FRAME = 'program'
+
+# Vychozi perioda vzorkovani (s) pro --sample-profile.
+SAMPLE_INTERVAL = 0.001
+
+
+def call_stack_labels(instructions: List, call_stack: List[int]) -> \
+        Tuple[str, ...]:
+    """ Zasobnik volani jako posloupnost navesti volanych funkci.
+
+    Navratova adresa ukazuje za instrukci CALL, jejiz prvni operand je
+    navesti volane funkce.
+    """
+
+    return (ROOT_FRAME,) + tuple(instructions[address - 1].args[0].name
+                                 for address in call_stack)
+
+
+def frame_name(instructions: List, position: int) -> str:
+    """ Nazev listu zasobniku (operacni kod a poradi instrukce). """
+
+    instruction = instructions[position]
+    order = instruction.order if instruction.order is not None else position
+
+    return '{}@{}'.format(instruction.opcode, order)
+
+
+class Profiler():
+    """
+    Deterministicky profil behu programu (--profile, --profile-stacks). Pro
+    kazdou instrukci (pozici v propojenem programu) se pocita pocet provedeni
+    a kumulativni doba. Doba se navic rozdeluje podle zasobniku volani
+    (navesti cilu instrukci CALL). Profil plni Program.run_profile.
+    """
+
+    def __init__(self, file: IO = None, stacks_file: IO = None):
+        """
+        Parameters
+        ----------
+        file: IO
+            Vystup profilu ve formatu JSON (nebo None).
+        stacks_file: IO
+            Vystup zasobniku v kolapsovanem formatu pro nastroje flamegraph
+            (nebo None).
+        """
+
+        self.file = file
+        self.stacks_file = stacks_file
+        self.instructions: List = list()
+        # Pocet provedeni a kumulativni doba (s) podle pozice instrukce.
+        self.counts: List[int] = list()
+        self.times: List[float] = list()
+        # Doba podle zasobniku volani a pozice <(zasobnik, pozice), doba>.
+        self.stacks: Dict[Tuple[Tuple[str, ...], int], float] = dict()
+
+    def start(self, instructions: List):
+        """ Priprava citacu pro instrukce propojeneho programu. """
+
+        self.instructions = instructions
+        self.counts = [0] * len(instructions)
+        self.times = [0.0] * len(instructions)
+        self.stacks = dict()
+
+    def call_stack(self, call_stack: List[int]) -> Tuple[str, ...]:
+        return call_stack_labels(self.instructions, call_stack)
+
+    def report(self) -> dict:
+        """ Profil podle operacnich kodu a jednotlivych instrukci. """
+
+        opcodes: Dict[str, dict] = dict()
+        instructions: List[dict] = list()
+
+        for position, count in enumerate(self.counts):
+            if count == 0:
+                continue
+
+            instruction = self.instructions[position]
+            elapsed = self.times[position]
+
+            summary = opcodes.setdefault(
+                instruction.opcode, {'count': 0, 'time': 0.0})
+            summary['count'] += count
+            summary['time'] += elapsed
+
+            instructions.append({
+                'order': instruction.order,
+                'position': position,
+                'opcode': instruction.opcode,
+                'count': count,
+                'time': elapsed
+            })
+
+        instructions.sort(key=lambda item: item['time'], reverse=True)
+
+        return {
+            'count': sum(self.counts),
+            'time': sum(self.times),
+            'opcodes': dict(sorted(opcodes.items(),
+                                   key=lambda item: item[1]['time'],
+                                   reverse=True)),
+            'instructions': instructions
+        }
+
+    def collapsed_stacks(self) -> List[str]:
+        """ Radky kolapsovaneho formatu (zasobnik oddeleny strednikem
+        a doba v nanosekundach). """
+
+        lines = list()
+        for (stack, position), elapsed in self.stacks.items():
+            lines.append('{};{} {}'.format(
+                ';'.join(stack), frame_name(self.instructions, position),
+                round(elapsed * 1e9)))
+
+        return sorted(lines)
+
+    def save(self):
+        if self.file is not None:
+            json.dump(self.report(), self.file, indent=2)
+            self.file.write('\n')
+
+        if self.stacks_file is not None:
+            for line in self.collapsed_stacks():
+                self.stacks_file.write(line + '\n')
+
+
+class SampleProfiler():
+    """
+    Vzorkovaci profil behu programu (--sample-profile). Casovac
+    (signal.setitimer, procesorovy cas) periodicky vyvolava signal SIGPROF,
+    jehoz obsluha zaznamena aktualni instrukci a kopii zasobniku volani.
+    Provadeni programu se nijak nemeni, rezie je dana pouze poctem vzorku.
+    """
+
+    def __init__(self, file: IO, interval: float = SAMPLE_INTERVAL):
+        """
+        Parameters
+        ----------
+        file: IO
+            Vystup profilu ve formatu JSON.
+        interval: float
+            Perioda vzorkovani v sekundach procesoroveho casu.
+        """
+
+        self.file = file
+        self.interval = interval
+        self.program = None
+        # Pocet vzorku podle pozice a zasobniku <(pozice, zasobnik), pocet>.
+        self.samples: Dict[Tuple[int, Tuple[int, ...]], int] = dict()
+
+    def start(self, program):
+        """ Zahajeni vzorkovani behu programu. """
+
+        self.program = program
+        signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        """ Ukonceni vzorkovani. """
+
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def sample(self, signum, frame):
+        """ Obsluha signalu. Ukazatel instrukci ukazuje za prave
+        provadenou instrukci. """
+
+        program = self.program
+        key = (program.instruction_pointer - 1, tuple(program.call_stack))
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def report(self) -> dict:
+        """ Histogramy vzorku podle instrukci, navesti (nejblizsi
+        predchazejici navesti, tj. smycka nebo blok) a zasobniku volani. """
+
+        instructions = self.program.instructions
+        labels = sorted((position, name) for name, position
+                        in self.program.labels.items())
+        label_positions = [position for position, _ in labels]
+
+        by_position: Dict[int, int] = dict()
+        by_label: Dict[str, int] = dict()
+        by_function: Dict[str, int] = dict()
+        by_stack: Dict[str, int] = dict()
+        total = 0
+
+        for (position, call_stack), count in self.samples.items():
+            # Vzorky pred zacatkem a po skonceni programu se nezapocitavaji.
+            if not 0 <= position < len(instructions):
+                continue
+
+            total += count
+            by_position[position] = by_position.get(position, 0) + count
+
+            index = bisect_right(label_positions, position)
+            label = labels[index - 1][1] if index > 0 else ROOT_FRAME
+            by_label[label] = by_label.get(label, 0) + count
+
+            stack = call_stack_labels(instructions, call_stack)
+            by_function[stack[-1]] = by_function.get(stack[-1], 0) + count
+
+            line = '{};{}'.format(';'.join(stack),
+                                  frame_name(instructions, position))
+            by_stack[line] = by_stack.get(line, 0) + count
+
+        def histogram(counts: Dict[str, int]) -> Dict[str, int]:
+            return dict(sorted(counts.items(), key=lambda item: item[1],
+                               reverse=True))
+
+        return {
+            'interval': self.interval,
+            'samples': total,
+            'instructions': [{
+                'order': instructions[position].order,
+                'position': position,
+                'opcode': instructions[position].opcode,
+                'samples': count
+            } for position, count in sorted(
+                by_position.items(), key=lambda item: item[1],
+                reverse=True)],
+            'labels': histogram(by_label),
+            'functions': histogram(by_function),
+            'stacks': ['{} {}'.format(line, count)
+                       for line, count in sorted(by_stack.items())]
+        }
+
+    def save(self):
+        json.dump(self.report(), self.file, indent=2)
+        self.file.write('\n')
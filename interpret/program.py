@@ -1,103 +1,333 @@
-from typing import List, IO, Dict
+from typing import List, Dict, Callable
 from models import Symbol, Variable
-from enums import Frames, exitCodes
+from enums import Frames, exitCodes, Engines
 from helper import exit_app
+from compiler import compile_program
+from transpiler import Transpiled, transpile_program
+from optimizer import optimize
+from cfg import ControlFlowGraph
+from frames import Frame, FramePool, UNDEFINED, assign_slots
 import instructions as instrs
-from sys import stdin
 from stats import Stats
+from output import Output
+from input_reader import InputReader
+from constant_pool import ConstantPool
+from profiler import Profiler
+from time import perf_counter
+
+
+class LinkedProgram():
+    """
+    Nacteny a propojeny program (instrukce bez navesti se skoky propojenymi
+    s cili). Neobsahuje stav behu, a proto jej lze ulozit do cache (cache.py).
+    """
+
+    __slots__ = ('instructions', 'labels', 'global_names', 'local_names',
+                 'elided_checks', 'constants', 'constant_uses')
+
+    def __init__(self):
+        self.instructions: List[instrs.InstructionBase] = list()
+        # <label, instructionPointerPosition>
+        self.labels: Dict[str, int] = dict()
+        # Nazvy promennych podle slotu (globalni, lokalni a docasny ramec).
+        self.global_names: List[str] = list()
+        self.local_names: List[str] = list()
+        # Pocet kontrol typu odstranenych optimalizaci -O2.
+        self.elided_checks = 0
+        # Pocet sdilenych konstant a pocet vyskytu literalu (ConstantPool).
+        self.constants = 0
+        self.constant_uses = 0
+
+
+def link(instructions: List, optimization: int = 0,
+         pool: ConstantPool = None) -> LinkedProgram:
+    """ Prirazeni slotu promennym, optimalizace a propojeni skoku.
+
+    Parameters
+    ----------
+    instructions: List[InstructionBase]
+        Instrukce programu vcetne navesti (serazene podle order).
+    optimization: int
+        Uroven optimalizace (parametr -O).
+    pool: ConstantPool
+        Konstanty pouzite pri nacteni programu (pro vypis statistik).
+    Returns
+    -------
+    LinkedProgram
+        Propojeny program.
+    """
+
+    linked = LinkedProgram()
+
+    if pool is not None:
+        linked.constants = pool.size()
+        linked.constant_uses = pool.uses
+
+    # Sestaveni grafu toku rizeni overi navesti celeho programu (redefinice
+    # a skoky na nedefinovane navesti se hlasi i v nedosazitelnem kodu).
+    graph = ControlFlowGraph(instructions)
+
+    # Odstraneni nedosazitelnych instrukci a nepouzitych navesti (-O1).
+    # Provadi se pred prirazenim slotu, promenne pouzite pouze
+    # v odstranenem kodu tak nezvetsuji ramce.
+    if optimization >= 1:
+        instructions = graph.live_instructions()
+
+    # Prirazeni slotu promennym. Nazvy jsou potreba pro vypis stavu.
+    linked.global_names, linked.local_names = assign_slots(instructions)
+
+    # Optimalizace (parametr -O) se provadi jeste pred odstranenim navesti.
+    instructions, linked.elided_checks = optimize(instructions, optimization)
+
+    # Detekce navesti
+    for instruction in instructions:
+        if type(instruction) is instrs.Label:
+            linked.labels[instruction.name.name] = len(linked.instructions)
+        else:
+            linked.instructions.append(instruction)
+
+    # Propojeni skoku s navestimi. Navesti jsou overena grafem toku rizeni
+    # jiz pri nacteni programu, ne az pri provedeni skoku.
+    for instruction in linked.instructions:
+        if isinstance(instruction, instrs.Jump):
+            instruction.link(linked.labels)
+
+    return linked
 
 
 class Program():
     """ Definice aplikace, ktera se bude provadet. """
 
-    def __init__(self, instructions: List, data_input: IO, stats: Stats):
+    def __init__(self, instructions: List or LinkedProgram,
+                 data_input: InputReader, stats: Stats,
+                 engine: Engines = Engines.DEFAULT, optimization: int = 0,
+                 output: Output = None, profiler: Profiler = None,
+                 sampled: bool = False):
         # Datovy vstup pro instrukci read.
         self.input = data_input
+        # Buffer standardniho vystupu (instrukce WRITE).
+        self.output = output if output is not None else Output()
         # Aktualni pozice v programu.
         self.instruction_pointer = 0
-        self.GF: Dict[str, Symbol] = dict()                 # Globalni ramec
-        self.TF: Dict[str, Symbol] = None                   # Docasny ramec.
-        self.LF_Stack: List[Dict[str, Symbol]] = list()     # Lokalni ramec.
+        self.TF: Frame = None                               # Docasny ramec.
+        self.LF_Stack: List[Frame] = list()                 # Lokalni ramec.
         self.data_stack: List[Symbol] = list()              # Datovy zasobnik
         self.call_stack: List[int] = list()                 # Zasobnik volani
         self.exit_code = 0                                  # Navratovy kod
         self.stats = stats                                  # Statistiky
+        self.profiler = profiler                            # Profil behu
+
+        # Program muze byt jiz propojen (nacten z cache, viz cache.py).
+        linked = instructions if type(instructions) is LinkedProgram \
+            else link(instructions, optimization)
 
         # <label, instructionPointerPosition>
-        self.labels: Dict[str, int] = dict()
-        self.instructions: List[instrs.InstructionBase] = list()
+        self.labels: Dict[str, int] = linked.labels
+        self.instructions: List[instrs.InstructionBase] = \
+            linked.instructions
+        self.global_names = linked.global_names
+        self.local_names = linked.local_names
+        self.GF = Frame(self.global_names)                  # Globalni ramec
+        # Uvolnene lokalni a docasne ramce (viz release_frame).
+        self.frame_pool = FramePool(self.local_names)
 
-        # Detekce navesti
-        for instruction in instructions:
-            if type(instruction) is instrs.Label:
-                if instruction.name.name in self.labels:
-                    exit_app(exitCodes.SEMANTIC_ERROR,
-                             'Detected label redefinition.', True)
+        if stats is not None:
+            stats.increment_checks(linked.elided_checks)
+            stats.set_constants(linked.constants, linked.constant_uses)
 
-                self.labels.update(
-                    {instruction.name.name: len(self.instructions)})
-            else:
-                self.instructions.append(instruction)
+        # Prelozene instrukce (pro --engine=compiled a transpiled).
+        self.code: List[Callable[[], None]] = None
+        if engine in (Engines.COMPILED, Engines.TRANSPILED):
+            self.code = compile_program(self)
+
+        # Program prelozeny do jedne funkce (pouze pro --engine=transpiled).
+        # Statistiky a profil vyzaduji provadeni po instrukcich, program se
+        # pak provadi prelozenymi uzavery. Pri vzorkovani (sampled) funkce
+        # udrzuje pozici zacatku provadeneho bloku.
+        self.transpiled: Transpiled = None
+        if engine == Engines.TRANSPILED and stats is None and \
+                profiler is None:
+            self.transpiled = transpile_program(self, sampled)
 
     def run(self):
-        """ Provadeni programu. """
+        """
+        Provadeni programu. Buffer vystupu se vyprazdni pri kazdem ukonceni
+        (konec programu, instrukce EXIT i chyba ukoncena funkci exit_app).
+        """
 
-        while len(self.instructions) > self.instruction_pointer:
-            instruction = self.instructions[self.instruction_pointer]
+        try:
+            if self.profiler is not None:
+                self.run_profile()
+            elif self.stats is not None:
+                self.run_stats()
+            elif self.transpiled is not None:
+                self.transpiled(self)
+            elif self.code is not None:
+                self.run_compiled()
+            else:
+                self.run_default()
+        finally:
+            self.output.detach()
+
+    def run_default(self):
+        """ Provadeni programu volanim metody execute u instrukci. """
+
+        instructions = self.instructions
+        while len(instructions) > self.instruction_pointer:
+            instruction = instructions[self.instruction_pointer]
             self.instruction_pointer += 1
             instruction.execute(self)
 
+    def run_compiled(self):
+        """ Provadeni programu prelozeneho do uzaveru. """
+
+        code = self.code
+        while len(code) > self.instruction_pointer:
+            position = self.instruction_pointer
+            self.instruction_pointer += 1
+            code[position]()
+
+    def run_stats(self):
+        """
+        Provadeni programu se sberem statistik (rozsireni STATI). Pocet
+        promennych aktualizuji primo instrukce DEFVAR, CREATEFRAME, PUSHFRAME
+        a POPFRAME, zde se pocitaji pouze provedene instrukce.
+        """
+
+        instructions = self.instructions
+        code = self.code
+        executed = 0
+
+        try:
+            while len(instructions) > self.instruction_pointer:
+                position = self.instruction_pointer
+                self.instruction_pointer += 1
+
+                if code is None:
+                    instructions[position].execute(self)
+                else:
+                    code[position]()
+
+                executed += instructions[position].count
+        finally:
+            self.stats.increment_insts(executed)
+
+    def run_profile(self):
+        """
+        Provadeni programu s merenim poctu provedeni a doby jednotlivych
+        instrukci (--profile). Zasobnik volani se prevadi na navesti pouze
+        pri zmene jeho hloubky (meni jej jen instrukce CALL a RETURN).
+        """
+
+        instructions = self.instructions
+        code = self.code
+        call_stack = self.call_stack
+        profiler = self.profiler
+        profiler.start(instructions)
+        counts = profiler.counts
+        times = profiler.times
+        stacks = profiler.stacks
+        stack = profiler.call_stack(call_stack)
+        depth = len(call_stack)
+        executed = 0
+
+        try:
+            while len(instructions) > self.instruction_pointer:
+                position = self.instruction_pointer
+                self.instruction_pointer += 1
+                start = perf_counter()
+
+                if code is None:
+                    instructions[position].execute(self)
+                else:
+                    code[position]()
+
+                elapsed = perf_counter() - start
+                counts[position] += 1
+                times[position] += elapsed
+                key = (stack, position)
+                stacks[key] = stacks.get(key, 0.0) + elapsed
+                executed += instructions[position].count
+
+                if len(call_stack) != depth:
+                    stack = profiler.call_stack(call_stack)
+                    depth = len(call_stack)
+        finally:
             if self.stats is not None:
-                self.stats.increment_insts()
-                self.stats.increment_vars(self.GF, self.LF_Stack, self.TF)
+                self.stats.increment_insts(executed)
 
-    def var_exists(self, var: Variable):
-        """ Kontrola na existenci promenne. """
+    def create_frame(self) -> Frame:
+        """ Vytvoreni noveho (prazdneho) docasneho nebo lokalniho ramce. """
+
+        return self.frame_pool.acquire()
+
+    def release_frame(self, frame: Frame):
+        """ Uvolneni ramce, ktery prestal byt dostupny (nahrazeny docasny
+        ramec). Ramec se pouzije pri dalsim volani create_frame. """
+
+        self.frame_pool.release(frame)
+
+    def get_frame(self, var: Variable) -> Frame:
+        """ Ziskani ramce, ve kterem se promenna nachazi. """
 
         if var.frame == Frames.GLOBAL:
-            return var.value in self.GF
+            return self.GF
         elif var.frame == Frames.TEMPORARY:
             if self.TF is None:
                 exit_app(exitCodes.INVALID_FRAME,
                          'Temporary frame is unitialized', True)
 
-            return var.value in self.TF
+            return self.TF
         elif var.frame == Frames.LOCAL:
             if len(self.LF_Stack) == 0:
                 exit_app(exitCodes.INVALID_FRAME,
                          'Local frame stack is empty.', True)
-            return var.value in self.LF_Stack[-1]
+            return self.LF_Stack[-1]
 
-    def var_set(self, opcode: str, var: Variable, value: Symbol,
-                create: bool = False):
-        """ Nastaveni hodnoty promenne. Pripadne vytvořeni. """
+    def var_exists(self, var: Variable):
+        """ Kontrola na existenci promenne. """
 
-        if not create and not self.var_exists(var):
+        return self.get_frame(var).values[var.slot] is not UNDEFINED
+
+    def var_define(self, var: Variable):
+        """ Definice nove promenne (bez hodnoty). """
+
+        frame = self.get_frame(var)
+
+        if frame.values[var.slot] is not UNDEFINED:
+            exit_app(exitCodes.SEMANTIC_ERROR,
+                     'DEFVAR\nVariable {} now exists. Cannot redefine.'
+                     .format(var.value), True)
+
+        frame.values[var.slot] = None
+        frame.count += 1
+
+        if self.stats is not None:
+            self.stats.increment_vars()
+
+    def var_set(self, opcode: str, var: Variable, value: Symbol):
+        """ Nastaveni hodnoty existujici promenne. """
+
+        values = self.get_frame(var).values
+
+        if values[var.slot] is UNDEFINED:
             exit_app(exitCodes.UNDEFINED_VARIABLE,
                      '{}\nVariable {} not exists'.format(opcode, var.value),
                      True)
 
-        if var.frame == Frames.GLOBAL:
-            self.GF[var.value] = value
-        elif var.frame == Frames.LOCAL:
-            self.LF_Stack[-1][var.value] = value
-        elif var.frame == Frames.TEMPORARY:
-            self.TF[var.value] = value
+        values[var.slot] = value
 
     def var_get(self, opcode: str, var: Variable) -> Symbol:
         """ Ziskani hodnoty promenne. """
 
-        if not self.var_exists(var):
+        value = self.get_frame(var).values[var.slot]
+
+        if value is UNDEFINED:
             exit_app(exitCodes.UNDEFINED_VARIABLE,
                      '{}\nVariable {} not exists'.format(opcode, var.value),
                      True)
 
-        if var.frame == Frames.TEMPORARY:
-            return self.TF[var.value]
-        elif var.frame == Frames.GLOBAL:
-            return self.GF[var.value]
-        elif var.frame == Frames.LOCAL:
-            return self.LF_Stack[-1][var.value]
+        return value
 
     def get_symb(self, opcode: str, symb: Symbol or Variable,
                  required_value: bool = True):
@@ -119,8 +349,7 @@ class Program():
         """ Ziskani stavu aplikace """
 
         return "\n".join([
-            "Input type: {}".format(
-                'stdin' if self.input == stdin else 'file'),
+            "Input type: {}".format(self.input.source),
             "IP: {}".format(self.instruction_pointer),
             "GlobalFrame: {}".format(self.GF),
             "LocalFrame: {}".format(self.LF_Stack),
@@ -130,19 +359,16 @@ class Program():
             "Labels: {}".format(self.labels)
         ])
 
-    def pop_stack(self, required_count: int):
-        """ Ziskani N hodnot ze zasovniku. """
-        
-        if len(self.data_stack) < required_count:
-            exit_app(exitCodes.UNDEFINED_VALUE,
-                     'Invalid count of required arguments in stack at' +
-                     ' instruction {}. Count of values in data_stack: {}'
-                     .format(
-                         self.instructions[self.instruction_pointer].opcode,
-                         len(self.data_stack)))
-
-        stack_data = list()
-        for i in range(required_count):
-            stack_data.append(self.data_stack.pop())
+    def stack_underflow(self):
+        """
+        Chyba nedostatku hodnot na datovem zasobniku. Pocet hodnot kontroluji
+        primo instrukce, ktere pak pracuji s vrcholem zasobniku na miste
+        (vysledek prepise operand, bez pomocneho seznamu).
+        """
 
-        return stack_data
+        exit_app(exitCodes.UNDEFINED_VALUE,
+                 'Invalid count of required arguments in stack at' +
+                 ' instruction {}. Count of values in data_stack: {}'
+                 .format(
+                     self.instructions[self.instruction_pointer - 1].opcode,
+                     len(self.data_stack)))
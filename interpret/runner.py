@@ -0,0 +1,156 @@
+from typing import IO, Dict, List
+from io import StringIO
+from enums import Engines
+from errors import InterpretError
+from instruction_parser import InstructionsParser
+from constant_pool import ConstantPool
+from program import Program, LinkedProgram, link
+from input_reader import InputReader
+from output import Output
+from stats import Stats, STATS_OPTIONS
+from profiler import Profiler, SampleProfiler
+
+
+class RunResult():
+    """ Vysledek behu programu. """
+
+    __slots__ = ('exit_code', 'stdout', 'stderr', 'stats', 'error')
+
+    def __init__(self, exit_code: int, stdout: str, stderr: str,
+                 stats: Dict[str, float], error: InterpretError = None):
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        # Hodnoty pozadovanych statistik <nazev, hodnota>.
+        self.stats = stats
+        # Chyba, ktera beh ukoncila (None = program skoncil bez chyby).
+        self.error = error
+
+    def __repr__(self):
+        return 'RunResult(exit_code={}, stdout={!r}, stderr={!r}, stats={})' \
+            .format(self.exit_code, self.stdout, self.stderr, self.stats)
+
+
+def load(source: IO or str, optimization: int = 0) -> LinkedProgram:
+    """ Nacteni a propojeni programu.
+
+    Parameters
+    ----------
+    source: IO or str
+        Textovy proud s XML reprezentaci programu, nebo primo XML text.
+    optimization: int
+        Uroven optimalizace (parametr -O).
+    Returns
+    -------
+    LinkedProgram
+        Propojeny program. Lze jej provest opakovane (funkce execute, run).
+    """
+
+    if isinstance(source, str):
+        source = StringIO(source)
+
+    pool = ConstantPool()
+    instructions = InstructionsParser.parse_file(source, pool)
+    return link(instructions, optimization, pool)
+
+
+def execute(linked: LinkedProgram, data_input: InputReader, output: Output,
+            stats: Stats = None, engine: Engines = Engines.DEFAULT,
+            optimization: int = 0, profiler: Profiler = None,
+            sampler: SampleProfiler = None) -> int:
+    """ Provedeni propojeneho programu.
+
+    Chyba behu se hlasi vyjimkou InterpretError. Profily se ulozi i pri
+    ukonceni programu chybou.
+
+    Returns
+    -------
+    int
+        Navratovy kod programu (instrukce EXIT).
+    """
+
+    program = Program(linked, data_input, stats, engine, optimization,
+                      output, profiler, sampler is not None)
+
+    if sampler is not None:
+        sampler.start(program)
+
+    try:
+        program.run()
+    finally:
+        if sampler is not None:
+            sampler.stop()
+            sampler.save()
+
+        if profiler is not None:
+            profiler.save()
+
+    return int(program.exit_code)
+
+
+def report(error: InterpretError, stdout: IO, stderr: IO):
+    """ Vypis chyboveho hlaseni na standardni nebo chybovy vystup. """
+
+    print(error.message, file=stderr if error.use_stderr else stdout)
+
+
+def run(source: IO or str or LinkedProgram, data_input: bytes or str = None,
+        stats: List[str] = (), engine: Engines = Engines.DEFAULT,
+        optimization: int = 0) -> RunResult:
+    """ Nacteni a provedeni programu se zachycenim vystupu.
+
+    Knihovni rozhrani interpretu. Chyby se nehlasi ukoncenim procesu, ale
+    prevedou se na navratovy kod ve vysledku, takze lze v jednom procesu
+    provest libovolny pocet programu.
+
+    Parameters
+    ----------
+    source: IO or str or LinkedProgram
+        XML reprezentace programu (proud nebo text), nebo jiz propojeny
+        program (funkce load).
+    data_input: bytes or str
+        Vstup instrukce READ (None = prazdny vstup).
+    stats: List[str]
+        Nazvy pozadovanych statistik (viz stats.STATS_OPTIONS).
+    engine: Engines
+        Zpusob provadeni programu.
+    optimization: int
+        Uroven optimalizace (parametr -O).
+    Returns
+    -------
+    RunResult
+        Navratovy kod, standardni a chybovy vystup a hodnoty statistik.
+        Chybove hlaseni je soucasti vystupu stejne jako u interpret.py.
+    """
+
+    for option in stats:
+        if option not in STATS_OPTIONS:
+            raise ValueError('Unknown statistic {}'.format(option))
+
+    stdout = StringIO()
+    stderr = StringIO()
+    counters: Stats = None
+
+    if len(stats) > 0:
+        counters = Stats(None, 'insts' in stats, 'vars' in stats,
+                         'checks' in stats,
+                         'pool-size' in stats or 'pool-hits' in stats)
+
+    error: InterpretError = None
+    try:
+        linked = source if type(source) is LinkedProgram \
+            else load(source, optimization)
+        output = Output(stream=stdout, error_stream=stderr)
+        exit_code = execute(
+            linked, InputReader.from_data(data_input or b''), output,
+            counters, engine, optimization)
+    except InterpretError as e:
+        error = e
+        exit_code = int(e.code)
+        report(e, stdout, stderr)
+
+    values = {option: counters.value(option) for option in stats} \
+        if counters is not None else dict()
+
+    return RunResult(exit_code, stdout.getvalue(), stderr.getvalue(), values,
+                     error)
@@ -1,39 +1,116 @@
-from typing import IO, Dict, List
-from models import Symbol
+from typing import IO, List
+from frames import Frame
 from sys import argv
 
+# Nazvy statistik (parametry prikazove radky bez uvodnich pomlcek).
+STATS_OPTIONS = ('insts', 'vars', 'checks', 'pool-size', 'pool-hits')
+
 
 class Stats():
     """ Rozsireni statistik """
 
-    def __init__(self, file: IO, insts_enabled: bool, vars_enabled: bool):
+    def __init__(self, file: IO, insts_enabled: bool, vars_enabled: bool,
+                 checks_enabled: bool = False, pool_enabled: bool = False):
         self.file = file
         self.insts_count = 0
         self.vars_count = 0
+        # Aktualni pocet promennych v dostupnych ramcich (GF, vrchol LF, TF).
+        self.vars_current = 0
+        # Pocet odstranenych kontrol typu operandu (-O2).
+        self.checks_count = 0
+        # Pocet sdilenych konstant a pocet vyskytu literalu v programu.
+        self.constants_count = 0
+        self.constant_uses = 0
         self.insts_enabled = insts_enabled
         self.vars_enabled = vars_enabled
+        self.checks_enabled = checks_enabled
+        self.pool_enabled = pool_enabled
 
-    def increment_insts(self):
+    def increment_insts(self, count: int = 1):
         if not self.insts_enabled:
             return
 
-        self.insts_count += 1
+        self.insts_count += count
+
+    def increment_vars(self, count: int = 1):
+        """ Definice promenne v nekterem z dostupnych ramcu (DEFVAR). """
+
+        if not self.vars_enabled:
+            return
+
+        self.vars_current += count
+
+        if self.vars_current > self.vars_count:
+            self.vars_count = self.vars_current
+
+    def replace_frame(self, removed: Frame, added: Frame):
+        """ Zmena dostupnych ramcu (CREATEFRAME, PUSHFRAME, POPFRAME).
+
+        Parameters
+        ----------
+        removed: Frame
+            Ramec, ktery prestal byt dostupny (nebo None).
+        added: Frame
+            Ramec, ktery se stal dostupnym (nebo None).
+        """
 
-    def increment_vars(self, gf: Dict[str, Symbol],
-                       lf_stack: List[Dict[str, Symbol]],
-                       tf: Dict[str, Symbol]):
         if not self.vars_enabled:
             return
 
-        cnt = len(gf) + (len(tf) if tf is not None else 0) + \
-            (len(lf_stack[-1]) if len(lf_stack) > 0 else 0)
+        if removed is not None:
+            self.vars_current -= removed.count
+
+        if added is not None:
+            self.increment_vars(added.count)
+
+    def increment_checks(self, count: int):
+        if not self.checks_enabled:
+            return
+
+        self.checks_count += count
+
+    def set_constants(self, count: int, uses: int):
+        """ Statistika sdilenych konstant (ConstantPool) po nacteni. """
+
+        if not self.pool_enabled:
+            return
+
+        self.constants_count = count
+        self.constant_uses = uses
+
+    def pool_hit_rate(self) -> float:
+        """ Podil vyskytu literalu, pro ktere se pouzila jiz existujici
+        konstanta. """
+
+        if self.constant_uses == 0:
+            return 0.0
+
+        return (self.constant_uses - self.constants_count) / \
+            self.constant_uses
+
+    def value(self, option: str):
+        """ Hodnota statistiky podle nazvu (viz STATS_OPTIONS). """
+
+        if option == 'insts':
+            return self.insts_count
+        elif option == 'vars':
+            return self.vars_count
+        elif option == 'checks':
+            return self.checks_count
+        elif option == 'pool-size':
+            return self.constants_count
+        elif option == 'pool-hits':
+            return self.pool_hit_rate()
+
+    def save(self, options: List[str] = None):
+        """ Zapis statistik do souboru v poradi podle parametru prikazove
+        radky (nebo podle seznamu nazvu options). """
 
-        if cnt > self.vars_count:
-            self.vars_count = cnt
+        if options is None:
+            options = [arg[2:] for arg in argv if arg.startswith('--')]
 
-    def save(self):
-        for arg in argv:
-            if arg == '--insts':
-                self.file.write('{}\n'.format(self.insts_count))
-            elif arg == '--vars':
-                self.file.write('{}\n'.format(self.vars_count))
+        for option in options:
+            if option == 'pool-hits':
+                self.file.write('{:.4f}\n'.format(self.value(option)))
+            elif option in STATS_OPTIONS:
+                self.file.write('{}\n'.format(self.value(option)))
@@ -0,0 +1,809 @@
+from operator import add, sub, mul, lt, gt
+from typing import Callable, Dict, List, Set, Tuple
+from enums import DataTypes, Frames, exitCodes
+from helper import (exit_app, validate_math_symbols,
+                    validate_comparable_symbols)
+from models import (Symbol, Variable, StringBuffer, NIL_SYMBOL, bool_symbol,
+                    int_symbol, float_symbol, string_symbol, render)
+from frames import UNDEFINED
+from cfg import ControlFlowGraph
+from input_reader import PARSERS
+from compiler import (ARITHMETIC_OPERATORS, COMPARE_OPERATORS, INT, FLOAT,
+                      BOOL, STRING, NIL, compile_operation,
+                      undefined_variable, undefined_value, stack_underflow,
+                      missing_local_frame, missing_temporary_frame)
+import instructions as instrs
+
+# Prelozeny program. Vola se s objektem Program, nad jehoz stavem pracuje.
+Transpiled = Callable[['Program'], None]
+
+# Nazev vygenerovane funkce a jmeno souboru pro compile().
+FUNCTION_NAME = 'transpiled'
+FILENAME = '<transpiled>'
+
+# Operatory jazyka Python odpovidajici funkcim z compiler.py.
+OPERATOR_SYMBOLS = {add: '+', sub: '-', mul: '*', lt: '<', gt: '>'}
+
+# Jmena datovych typu ve vygenerovanem kodu.
+TYPE_NAMES = {INT: 'INT', FLOAT: 'FLOAT', BOOL: 'BOOL', STRING: 'STRING',
+              NIL: 'NIL'}
+
+# Typy operandu aritmetickych instrukci (validate_math_symbols).
+NUMERIC_TYPES = [INT, FLOAT]
+
+# Instrukce, ktere ctou cely stav programu (vcetne globalniho ramce).
+STATE_OPCODES = ('BREAK',)
+
+# Nejvetsi pocet instrukci prekladaneho programu. Doba prekladu funkci
+# compile() roste s delkou programu (priblizne 0.2 ms na instrukci), delsi
+# programy se provadi prelozenymi uzavery (compiler.py).
+MAX_INSTRUCTIONS = 5000
+
+
+def invalid_value(value, opcode: str, name: str):
+    """ Chyba cteni promenne, ktera neexistuje nebo nema hodnotu. """
+
+    if value is UNDEFINED:
+        undefined_variable(opcode, name)
+    undefined_value(opcode)
+
+
+# Objekty dostupne ve vygenerovanem kodu (globalni jmena funkce).
+NAMESPACE = {
+    'exit_app': exit_app,
+    'exitCodes': exitCodes,
+    'validate_math_symbols': validate_math_symbols,
+    'validate_comparable_symbols': validate_comparable_symbols,
+    'StringBuffer': StringBuffer,
+    'NIL_SYMBOL': NIL_SYMBOL,
+    'bool_symbol': bool_symbol,
+    'int_symbol': int_symbol,
+    'float_symbol': float_symbol,
+    'string_symbol': string_symbol,
+    'UNDEFINED': UNDEFINED,
+    'INT': INT,
+    'FLOAT': FLOAT,
+    'BOOL': BOOL,
+    'STRING': STRING,
+    'NIL': NIL,
+    'undefined_variable': undefined_variable,
+    'undefined_value': undefined_value,
+    'stack_underflow': stack_underflow,
+    'missing_local_frame': missing_local_frame,
+    'missing_temporary_frame': missing_temporary_frame,
+    'invalid_value': invalid_value
+}
+
+
+class TranspileError(Exception):
+    """ Program obsahuje konstrukci, kterou nelze bezpecne prelozit. """
+
+
+def describe(value) -> str:
+    """ Popis objektu navazaneho na lokalni promennou (komentar ve
+    vygenerovanem kodu). """
+
+    if isinstance(value, Symbol):
+        return '{}@{!r}'.format(value.data_type.value, value.value)
+
+    return getattr(value, '__qualname__', None) or repr(value)
+
+
+class Transpiler():
+    """
+    Preklad propojeneho programu do zdrojoveho kodu jedne funkce jazyka
+    Python. Zakladni bloky jsou vetve rozhodovaciho stromu (pulenim podle
+    pozice bloku) uvnitr smycky, skoky nastavuji pozici dalsiho bloku.
+    Blok, ktery skace sam na sebe, je vlastni smyckou while.
+
+    Promenne globalniho ramce jsou lokalni promenne funkce, pokud k nim
+    nepristupuje zadna instrukce provadena mimo vygenerovany kod (prelozeny
+    uzaver z compiler.py). Chybova hlaseni a navratove kody odpovidaji
+    compiler.py i instructions.py.
+
+    S parametrem positions se na zacatku kazdeho bloku ulozi pozice do
+    Program.instruction_pointer (pro vzorkovaci profil, viz profiler.py).
+    """
+
+    def __init__(self, instructions: List['instrs.InstructionBase'],
+                 labels: Dict[str, int], global_names: List[str],
+                 positions: bool = False):
+        self.instructions = instructions
+        self.labels = labels
+        self.positions = positions
+        self.end = len(instructions)
+        # Radky vygenerovaneho kodu a aktualni odsazeni.
+        self.lines: List[str] = list()
+        self.depth = 0
+        # Objekty navazane na lokalni promenne (konstanty, instrukce).
+        self.objects: List = list()
+        self.object_names: Dict[int, str] = dict()
+        # Pozice instrukci provadenych prelozenym uzaverem.
+        self.fallbacks: List[int] = list()
+        # Pocatek bloku, ktery je vlastni smyckou (None = neni smyckou).
+        self.loop = None
+
+        self.emitters: Dict[str, Callable] = {
+            'MOVE': self.emit_move,
+            'CREATEFRAME': self.emit_createframe,
+            'PUSHFRAME': self.emit_pushframe,
+            'POPFRAME': self.emit_popframe,
+            'DEFVAR': self.emit_defvar,
+            'CALL': self.emit_call,
+            'RETURN': self.emit_return,
+            'PUSHS': self.emit_pushs,
+            'POPS': self.emit_pops,
+            'ADD': self.emit_math,
+            'SUB': self.emit_math,
+            'MUL': self.emit_math,
+            'IDIV': self.emit_math,
+            'DIV': self.emit_math,
+            'LT': self.emit_compare,
+            'GT': self.emit_compare,
+            'EQ': self.emit_compare,
+            'AND': self.emit_compare,
+            'OR': self.emit_compare,
+            'NOT': self.emit_not,
+            'READ': self.emit_read,
+            'WRITE': self.emit_write,
+            'CONCAT': self.emit_concat,
+            'STRLEN': self.emit_strlen,
+            'GETCHAR': self.emit_getchar,
+            'TYPE': self.emit_type,
+            'JUMP': self.emit_jump,
+            'JUMPIFEQ': self.emit_conditional_jump,
+            'JUMPIFNEQ': self.emit_conditional_jump,
+            'EXIT': self.emit_exit,
+            'JUMPIFEQS': self.emit_stack_conditional_jump,
+            'JUMPIFNEQS': self.emit_stack_conditional_jump
+        }
+
+        self.class_emitters: Dict[str, Callable] = {
+            'StackOperationPops': self.emit_stack_operation_pops,
+            'CompareJump': self.emit_compare_jump,
+            'FramedCall': self.emit_framed_call
+        }
+
+        self.promoted = self.promotable(global_names)
+
+    def emitter(self, instruction: 'instrs.InstructionBase') -> Callable:
+        return self.emitters.get(instruction.opcode) or \
+            self.class_emitters.get(type(instruction).__name__)
+
+    def promotable(self, global_names: List[str]) -> Set[int]:
+        """ Sloty globalniho ramce, ktere mohou byt lokalnimi promennymi. """
+
+        promoted = set(range(len(global_names)))
+
+        for instruction in self.instructions:
+            if self.emitter(instruction) is not None:
+                continue
+
+            if instruction.opcode in STATE_OPCODES:
+                return set()
+
+            for arg in instruction.args:
+                if type(arg) is Variable and arg.frame == Frames.GLOBAL:
+                    promoted.discard(arg.slot)
+
+        return promoted
+
+    # Generovani radku
+    def line(self, text: str):
+        self.lines.append('    ' * self.depth + text)
+
+    def block(self, text: str, *body: str):
+        """ Radek s dvojteckou a odsazene telo. """
+
+        self.line(text)
+        self.depth += 1
+        for item in body:
+            self.line(item)
+        self.depth -= 1
+
+    def bind(self, value) -> str:
+        """ Navazani objektu na lokalni promennou funkce. """
+
+        name = self.object_names.get(id(value))
+        if name is None:
+            name = 'k{}'.format(len(self.objects))
+            self.object_names[id(value)] = name
+            self.objects.append(value)
+
+        return name
+
+    def global_value(self, slot: int) -> str:
+        return 'g{}'.format(slot) if slot in self.promoted \
+            else 'gf[{}]'.format(slot)
+
+    def transfer(self, target: int):
+        """ Skok na blok zacinajici na pozici <target>. """
+
+        if target == self.end:
+            self.line('return')
+        elif target == self.loop:
+            self.line('continue')
+        else:
+            self.line('block = {}'.format(target))
+            self.line('break' if self.loop is not None else 'continue')
+
+    def read(self, opcode: str, symb: Symbol or Variable, name: str,
+             required: bool = True) -> str:
+        """ Ziskani hodnoty operandu (odpovida compile_reader). Vraci nazev
+        promenne s hodnotou. """
+
+        if type(symb) is not Variable:
+            return self.bind(symb)
+
+        slot = symb.slot
+
+        if symb.frame == Frames.GLOBAL and slot in self.promoted:
+            # Lokalni promennou funkce neni potreba kopirovat.
+            name = self.global_value(slot)
+        elif symb.frame == Frames.GLOBAL:
+            self.line('{} = {}'.format(name, self.global_value(slot)))
+        elif symb.frame == Frames.LOCAL:
+            self.block('if not lf_stack:', 'missing_local_frame()')
+            self.line('{} = lf_stack[-1].values[{}]'.format(name, slot))
+        else:
+            self.line('frame = program.TF')
+            self.block('if frame is None:', 'missing_temporary_frame()')
+            self.line('{} = frame.values[{}]'.format(name, slot))
+
+        if required:
+            self.block('if {0} is None or {0} is UNDEFINED:'.format(name),
+                       'invalid_value({}, {!r}, {!r})'.format(name, opcode,
+                                                              symb.value))
+        else:
+            self.block('if {} is UNDEFINED:'.format(name),
+                       'undefined_variable({!r}, {!r})'.format(opcode,
+                                                               symb.value))
+
+        return name
+
+    def snapshot(self, symb: str) -> str:
+        """ Kopie menitelneho retezce (StringBuffer) v promenne a. """
+
+        self.line('a = {0}.snapshot() if type({0}) is StringBuffer else {0}'
+                  .format(symb))
+        return 'a'
+
+    def write(self, opcode: str, var: Variable, value: str):
+        """ Ulozeni jiz vypocitane hodnoty do existujici promenne
+        (odpovida compile_writer). """
+
+        slot = var.slot
+        missing = 'undefined_variable({!r}, {!r})'.format(opcode, var.value)
+
+        if var.frame == Frames.GLOBAL:
+            target = self.global_value(slot)
+        elif var.frame == Frames.LOCAL:
+            self.block('if not lf_stack:', 'missing_local_frame()')
+            self.line('values = lf_stack[-1].values')
+            target = 'values[{}]'.format(slot)
+        else:
+            self.line('frame = program.TF')
+            self.block('if frame is None:', 'missing_temporary_frame()')
+            self.line('values = frame.values')
+            target = 'values[{}]'.format(slot)
+
+        self.block('if {} is UNDEFINED:'.format(target), missing)
+        self.line('{} = {}'.format(target, value))
+
+    def type_check(self, instruction: 'instrs.InstructionBase',
+                   symb1: str, symb2: str, arg1, arg2) -> DataTypes:
+        """ Kontrola typu operandu aritmeticke nebo porovnavaci instrukce
+        (validate_math_symbols nebo validate_comparable_symbols). Je-li
+        jeden z operandu konstanta, podminka porovnava pouze typ druheho
+        operandu s jejim typem.
+
+        Returns
+        -------
+        DataTypes
+            Typ vysledku aritmeticke operace, pokud je znam (jeden z operandu
+            je ciselna konstanta), jinak None.
+        """
+
+        if isinstance(instruction, (instrs.MathInstructionBase,
+                                    instrs.StackMathInstructionBase)):
+            allowed = NUMERIC_TYPES
+            validate = 'validate_math_symbols({!r}, {}, {})'.format(
+                instruction.opcode, symb1, symb2)
+        else:
+            allowed = instruction.allowedTypes
+            validate = 'validate_comparable_symbols({!r}, {}, {}, {})'.format(
+                instruction.opcode, symb1, symb2,
+                self.bind(instruction.allowedTypes))
+
+        type1 = None if type(arg1) is Variable else arg1.data_type
+        type2 = None if type(arg2) is Variable else arg2.data_type
+        known = type1 if type1 in NUMERIC_TYPES else \
+            type2 if type2 in NUMERIC_TYPES else None
+
+        if not instruction.checked:
+            return known
+
+        if type2 is not None or type1 is not None:
+            other, data_type = (symb1, type2) if type2 is not None \
+                else (symb2, type1)
+
+            if data_type in allowed:
+                self.block('if {}.data_type is not {}:'.format(
+                    other, TYPE_NAMES[data_type]), validate)
+            else:
+                # Kontrola neuspeje pro zadnou hodnotu druheho operandu.
+                self.line(validate)
+        else:
+            self.line('dt = {}.data_type'.format(symb1))
+            self.block('if dt is not {}.data_type or dt not in {}:'.format(
+                symb2, self.bind(allowed)), validate)
+
+        return known
+
+    def operation(self, instruction: 'instrs.InstructionBase', symb1: str,
+                  symb2: str, arg1, arg2):
+        """ Kontrola typu a vypocet aritmeticke nebo porovnavaci operace
+        (odpovida compile_operation). Vysledek je v promenne r. """
+
+        opcode = instruction.opcode
+
+        if opcode in ARITHMETIC_OPERATORS:
+            known = self.type_check(instruction, symb1, symb2, arg1, arg2)
+            value = '{}.value {} {}.value'.format(
+                symb1, OPERATOR_SYMBOLS[ARITHMETIC_OPERATORS[opcode]], symb2)
+
+            if known is INT:
+                self.line('r = int_symbol({})'.format(value))
+            elif known is FLOAT:
+                self.line('r = float_symbol({})'.format(value))
+            else:
+                self.line('v = {}'.format(value))
+                self.line('r = int_symbol(v) if {}.data_type is INT else '
+                          'float_symbol(v)'.format(symb1))
+        elif opcode in COMPARE_OPERATORS:
+            self.type_check(instruction, symb1, symb2, arg1, arg2)
+            self.line('r = bool_symbol({}.value {} {}.value)'.format(
+                symb1, OPERATOR_SYMBOLS[COMPARE_OPERATORS[opcode]], symb2))
+        else:
+            self.line('r = {}({}, {})'.format(
+                self.bind(compile_operation(instruction)), symb1, symb2))
+
+    # 6.4.1 Prace s ramci, volani funkci
+    def emit_move(self, position: int, instruction: 'instrs.Move'):
+        symb = self.read('MOVE', instruction.args[1], 'a', False)
+
+        # Menitelny retezec patri pouze zdrojove promenne.
+        if type(instruction.args[1]) is Variable:
+            symb = self.snapshot(symb)
+
+        self.write('MOVE', instruction.args[0], symb)
+
+    def emit_createframe(self, position: int, instruction):
+        self.line('release(program.TF)')
+        self.line('program.TF = acquire()')
+
+    def emit_pushframe(self, position: int, instruction):
+        self.block('if program.TF is None:',
+                   'exit_app(exitCodes.INVALID_FRAME, {!r}, True)'.format(
+                       'PUSHFRAME\nInvalid access to undefined temporary '
+                       'frame.'))
+        self.line('lf_stack.append(program.TF)')
+        self.line('program.TF = None')
+
+    def emit_popframe(self, position: int, instruction):
+        self.block('if not lf_stack:',
+                   'exit_app(exitCodes.INVALID_FRAME, {!r}, True)'.format(
+                       'POPFRAME\nNo available local frame.'))
+        self.line('release(program.TF)')
+        self.line('program.TF = lf_stack.pop()')
+
+    def emit_defvar(self, position: int, instruction: 'instrs.Defvar'):
+        var: Variable = instruction.args[0]
+        redefined = 'exit_app(exitCodes.SEMANTIC_ERROR, {!r}, True)'.format(
+            'DEFVAR\nVariable {} now exists. Cannot redefine.'.format(
+                var.value))
+
+        if var.frame == Frames.GLOBAL and var.slot in self.promoted:
+            target = self.global_value(var.slot)
+            self.block('if {} is not UNDEFINED:'.format(target), redefined)
+            self.line('{} = None'.format(target))
+            return
+
+        if var.frame == Frames.GLOBAL:
+            self.line('frame = program.GF')
+        elif var.frame == Frames.LOCAL:
+            self.block('if not lf_stack:', 'missing_local_frame()')
+            self.line('frame = lf_stack[-1]')
+        else:
+            self.line('frame = program.TF')
+            self.block('if frame is None:', 'missing_temporary_frame()')
+
+        self.block('if frame.values[{}] is not UNDEFINED:'.format(var.slot),
+                   redefined)
+        self.line('frame.values[{}] = None'.format(var.slot))
+        self.line('frame.count += 1')
+
+    def emit_call(self, position: int, instruction: 'instrs.Call'):
+        self.line('call_stack.append({})'.format(position + 1))
+        self.transfer(instruction.target)
+
+    def emit_return(self, position: int, instruction):
+        self.block('if not call_stack:',
+                   'exit_app(exitCodes.UNDEFINED_VALUE, {!r}, True)'.format(
+                       'RETURN\nEmpty call stack.'))
+        self.line('block = call_stack.pop()')
+        self.line('break' if self.loop is not None else 'continue')
+
+    # Prace s datovym zasobnikem
+    def emit_pushs(self, position: int, instruction: 'instrs.PushS'):
+        symb = self.read('PUSHS', instruction.args[0], 'a')
+
+        if type(instruction.args[0]) is Variable:
+            symb = self.snapshot(symb)
+
+        self.line('data_stack.append({})'.format(symb))
+
+    def emit_pops(self, position: int, instruction: 'instrs.PopS'):
+        self.block('if not data_stack:',
+                   'exit_app(exitCodes.UNDEFINED_VALUE, {!r}, True)'.format(
+                       'POPS\nInstruction POPS. Data Stack is empty.'))
+        self.line('r = data_stack.pop()')
+        self.write('POPS', instruction.args[0], 'r')
+
+    # 6.4.3 Aritmeticke, relacni, booleovske a konverzni instrukce
+    def emit_math(self, position: int, instruction):
+        opcode = instruction.opcode
+        arg1, arg2 = instruction.args[1], instruction.args[2]
+        symb1 = self.read(opcode, arg1, 'a')
+        symb2 = self.read(opcode, arg2, 'b')
+
+        if opcode in ARITHMETIC_OPERATORS:
+            self.operation(instruction, symb1, symb2, arg1, arg2)
+        else:
+            # Deleni kontroluje nulu az ve vypoctu (compute).
+            self.type_check(instruction, symb1, symb2, arg1, arg2)
+            self.line('r = {}({}, {})'.format(self.bind(instruction.compute),
+                                              symb1, symb2))
+
+        self.write(opcode, instruction.args[0], 'r')
+
+    def emit_compare(self, position: int, instruction):
+        opcode = instruction.opcode
+        arg1, arg2 = instruction.args[1], instruction.args[2]
+        symb1 = self.read(opcode, arg1, 'a')
+        symb2 = self.read(opcode, arg2, 'b')
+
+        if opcode in COMPARE_OPERATORS:
+            self.operation(instruction, symb1, symb2, arg1, arg2)
+        else:
+            self.type_check(instruction, symb1, symb2, arg1, arg2)
+            self.line('r = bool_symbol({}({}, {}))'.format(
+                self.bind(instruction.compare), symb1, symb2))
+
+        self.write(opcode, instruction.args[0], 'r')
+
+    def emit_not(self, position: int, instruction: 'instrs.Not'):
+        symb = self.read('NOT', instruction.args[1], 'a')
+        self.block('if {}.data_type is not BOOL:'.format(symb),
+                   'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}.format({}'
+                   '.data_type.value), True)'.format(
+                       'NOT\nInvalid data type. Expected: bool. Have: ({})',
+                       symb))
+        self.line('r = bool_symbol(not {}.value)'.format(symb))
+        self.write('NOT', instruction.args[0], 'r')
+
+    # 6.4.4 Vstupne-vystupni instrukce
+    def emit_read(self, position: int, instruction: 'instrs.Read'):
+        parse = self.bind(PARSERS[instruction.args[1].type])
+        self.line('line = reader.readline()')
+        self.line('r = NIL_SYMBOL if line is None else {}(reader, line)'
+                  .format(parse))
+        self.write('READ', instruction.args[0], 'r')
+
+    def emit_write(self, position: int, instruction: 'instrs.Write'):
+        symb = instruction.args[0]
+
+        if type(symb) is not Variable:
+            self.line('output({!r})'.format(render(symb)))
+            return
+
+        value = self.read('WRITE', symb, 'a')
+        self.line('text = {}.text'.format(value))
+
+        # Konstanta ma textovou podobu pripravenou (viz Constant).
+        self.block('if text is not None:', 'output(text)')
+        self.block('elif {0}.data_type is STRING:'.format(value),
+                   'output({0}.value)'.format(value))
+        self.block('elif {0}.data_type is INT:'.format(value),
+                   'output(str({0}.value))'.format(value))
+        self.block('elif {0}.data_type is BOOL:'.format(value),
+                   "output('true' if {0}.value else 'false')".format(value))
+        self.block('elif {0}.data_type is FLOAT:'.format(value),
+                   'output({0}.value.hex())'.format(value))
+
+    # 6.4.5 Prace s retezci
+    def emit_concat(self, position: int, instruction: 'instrs.Concat'):
+        invalid = 'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}, True)'
+        symb1 = self.read('CONCAT', instruction.args[1], 'a')
+        self.block('if {}.data_type is not STRING:'.format(symb1),
+                   invalid.format('CONCAT\nInvalid type at second operand.'))
+        symb2 = self.read('CONCAT', instruction.args[2], 'b')
+        self.block('if {}.data_type is not STRING:'.format(symb2),
+                   invalid.format('CONCAT\nInvalid type at third operand.'))
+
+        if not instruction.append:
+            self.line('r = string_symbol({}.value + {}.value)'.format(
+                symb1, symb2))
+            self.write('CONCAT', instruction.args[0], 'r')
+            return
+
+        self.block('if type({}) is StringBuffer:'.format(symb1),
+                   '{}.append({}.value)'.format(symb1, symb2))
+        self.line('else:')
+        self.depth += 1
+        self.line('r = StringBuffer({}.value + {}.value)'.format(symb1,
+                                                                 symb2))
+        self.write('CONCAT', instruction.args[0], 'r')
+        self.depth -= 1
+
+    def emit_strlen(self, position: int, instruction: 'instrs.Strlen'):
+        symb = self.read('STRLEN', instruction.args[1], 'a')
+        self.block('if {}.data_type is not STRING:'.format(symb),
+                   'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}, True)'.format(
+                       'STRLEN\nExpected string'))
+        self.line('r = int_symbol({}.length())'.format(symb))
+        self.write('STRLEN', instruction.args[0], 'r')
+
+    def emit_getchar(self, position: int, instruction: 'instrs.Getchar'):
+        string = self.read('GETCHAR', instruction.args[1], 'a')
+        index = self.read('GETCHAR', instruction.args[2], 'b')
+        self.block('if {}.data_type is not STRING or {}.data_type is not '
+                   'INT:'.format(string, index),
+                   'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}, True)'.format(
+                       'GETCHAR\nExpected string and int'))
+        self.block('try:', 'r = string_symbol({}.char({}.value))'.format(
+            string, index))
+        self.block('except IndexError:',
+                   'exit_app(exitCodes.INVALID_STRING_OPERATION, {!r}, True)'
+                   .format('GETCHAR\nIndex out of range.'))
+        self.write('GETCHAR', instruction.args[0], 'r')
+
+    # 6.4.6 Prace s typy
+    def emit_type(self, position: int, instruction: 'instrs.Type'):
+        symb = self.read('TYPE', instruction.args[1], 'a', False)
+        self.line("r = string_symbol('' if {0} is None else "
+                  "{0}.data_type.value)".format(symb))
+        self.write('TYPE', instruction.args[0], 'r')
+
+    # 6.4.7 Instrukce pro rizeni toku programu
+    def emit_jump(self, position: int, instruction: 'instrs.Jump'):
+        self.transfer(instruction.target)
+
+    def jump_if_equal(self, opcode: str, symb1: str, symb2: str,
+                      target: int):
+        """ Podmineny skok podle rovnosti hodnot dvou operandu. """
+
+        self.block('if {0}.data_type is not {1}.data_type and {0}.data_type '
+                   'is not NIL and {1}.data_type is not NIL:'.format(symb1,
+                                                                     symb2),
+                   'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}, True)'.format(
+                       '{}\nOperands must have same type.'.format(opcode)))
+
+        condition = '{}.value == {}.value'.format(symb2, symb1)
+        if opcode not in ('JUMPIFEQ', 'JUMPIFEQS'):
+            condition = 'not ({})'.format(condition)
+
+        self.line('if {}:'.format(condition))
+        self.depth += 1
+        self.transfer(target)
+        self.depth -= 1
+
+    def emit_conditional_jump(self, position: int, instruction):
+        opcode = instruction.opcode
+        symb1 = self.read(opcode, instruction.args[1], 'a')
+        symb2 = self.read(opcode, instruction.args[2], 'b')
+        self.jump_if_equal(opcode, symb1, symb2, instruction.target)
+
+    def emit_stack_conditional_jump(self, position: int, instruction):
+        opcode = instruction.opcode
+        self.block('if len(data_stack) < 2:',
+                   'stack_underflow({!r}, len(data_stack))'.format(opcode))
+        self.line('b = data_stack.pop()')
+        self.line('a = data_stack.pop()')
+        self.jump_if_equal(opcode, 'a', 'b', instruction.target)
+
+    def emit_exit(self, position: int, instruction: 'instrs.Exit'):
+        symb = self.read('EXIT', instruction.args[0], 'a')
+        self.block('if {}.data_type is not INT:'.format(symb),
+                   'exit_app(exitCodes.INVALID_DATA_TYPE, {!r}, True)'.format(
+                       'EXIT\nInvalid exit code'))
+        self.block('if {0}.value < 0 or {0}.value > 49:'.format(symb),
+                   'exit_app(exitCodes.INVALID_OPERAND_VALUE, {!r}, True)'
+                   .format('EXIT\nInvalid exit code. Allowed range is '
+                           '<0; 49>.'))
+        self.line('program.exit_code = {}.value'.format(symb))
+        self.line('return')
+
+    # Slozene instrukce (optimalizace -O1)
+    def emit_stack_operation_pops(self, position: int, instruction):
+        arg1, arg2 = instruction.args[1], instruction.args[2]
+        symb1 = self.read('PUSHS', arg1, 'a')
+        symb2 = self.read('PUSHS', arg2, 'b')
+        self.operation(instruction.operation, symb1, symb2, arg1, arg2)
+        self.write('POPS', instruction.args[0], 'r')
+
+    def emit_compare_jump(self, position: int, instruction):
+        compare = instruction.compare
+        arg1, arg2 = compare.args[1], compare.args[2]
+        symb1 = self.read(compare.opcode, arg1, 'a')
+        symb2 = self.read(compare.opcode, arg2, 'b')
+        self.operation(compare, symb1, symb2, arg1, arg2)
+        self.write(compare.opcode, compare.args[0], 'r')
+
+        self.line('if r.value:' if instruction.jump_if else
+                  'if not r.value:')
+        self.depth += 1
+        self.transfer(instruction.target)
+        self.depth -= 1
+
+    def emit_framed_call(self, position: int, instruction):
+        self.line('release(program.TF)')
+        self.line('lf_stack.append(acquire())')
+        self.line('program.TF = None')
+        self.emit_call(position, instruction)
+
+    def emit_fallback(self, position: int, instruction):
+        """ Provedeni instrukce prelozenym uzaverem (Program.code). Pozice
+        se nastavuje kvuli hlaseni chyb v instructions.py. """
+
+        if isinstance(instruction, instrs.Jump):
+            raise TranspileError('Unsupported jump instruction {}.'
+                                 .format(instruction.opcode))
+
+        self.fallbacks.append(position)
+        self.line('program.instruction_pointer = {}'.format(position + 1))
+        self.line('x{}()'.format(position))
+
+    # Bloky a funkce
+    def emit_block(self, start: int, stop: int):
+        """ Telo zakladniho bloku <start, stop). """
+
+        if start == self.end:
+            self.line('return')
+            return
+
+        instructions = self.instructions[start:stop]
+        self.loop = start if any(
+            isinstance(instruction, instrs.Jump) and
+            instruction.target == start for instruction in instructions) \
+            else None
+
+        if self.loop is not None:
+            self.line('while True:')
+            self.depth += 1
+
+        if self.positions:
+            # Ukazatel instrukci ukazuje za prvni instrukci bloku.
+            self.line('program.instruction_pointer = {}'.format(start + 1))
+
+        for position, instruction in enumerate(instructions, start):
+            self.line('# {} {}'.format(position, instruction.opcode))
+            emitter = self.emitter(instruction) or self.emit_fallback
+            emitter(position, instruction)
+
+        last = instructions[-1]
+        if not (type(last) in (instrs.Jump, instrs.Call, instrs.FramedCall,
+                               instrs.Return, instrs.Exit)):
+            self.transfer(stop)
+
+        if self.loop is not None:
+            self.depth -= 1
+            self.loop = None
+
+    def emit_dispatch(self, leaders: List[int], bounds: Dict[int, int]):
+        """ Rozhodovaci strom nad pozicemi bloku (puleni intervalu). """
+
+        if len(leaders) == 1:
+            self.emit_block(leaders[0], bounds[leaders[0]])
+            return
+
+        middle = len(leaders) // 2
+        self.line('if block < {}:'.format(leaders[middle]))
+        self.depth += 1
+        self.emit_dispatch(leaders[:middle], bounds)
+        self.depth -= 1
+        self.line('else:')
+        self.depth += 1
+        self.emit_dispatch(leaders[middle:], bounds)
+        self.depth -= 1
+
+    def generate(self) -> str:
+        """ Zdrojovy kod funkce transpiled(program). """
+
+        # Nedosazitelne bloky (-O0 je neodstranuje) se neprekladaji. Konec
+        # programu je vzdy samostatny blok.
+        graph = ControlFlowGraph(self.instructions, self.labels)
+        reachable = graph.reachable()
+        bounds = {block.start: block.stop for block in graph.blocks
+                  if block.index in reachable}
+        bounds[self.end] = self.end
+        leaders = sorted(bounds)
+
+        self.depth = 1
+        self.line('block = 0')
+        self.line('while True:')
+        self.depth += 1
+        self.emit_dispatch(leaders, bounds)
+        body = self.lines
+
+        self.lines = list()
+        self.depth = 0
+        self.line('def {}(program):'.format(FUNCTION_NAME))
+        self.depth += 1
+        self.line('gf = program.GF.values')
+        self.line('lf_stack = program.LF_Stack')
+        self.line('data_stack = program.data_stack')
+        self.line('call_stack = program.call_stack')
+        self.line('output = program.output.write')
+        self.line('reader = program.input')
+        self.line('acquire = program.frame_pool.acquire')
+        self.line('release = program.frame_pool.release')
+
+        for index, value in enumerate(self.objects):
+            self.line('k{0} = K[{0}]  # {1}'.format(index, describe(value)))
+        for position in self.fallbacks:
+            self.line('x{0} = program.code[{0}]'.format(position))
+        for slot in sorted(self.promoted):
+            self.line('g{} = UNDEFINED'.format(slot))
+
+        return '\n'.join(self.lines + body) + '\n'
+
+
+def transpile(linked, positions: bool = False) -> Tuple[str, List]:
+    """ Preklad propojeneho programu (LinkedProgram nebo Program) do
+    zdrojoveho kodu. Nelze-li program prelozit, vyvola TranspileError.
+    S parametrem positions funkce udrzuje pozici zacatku bloku.
+
+    Returns
+    -------
+    Tuple[str, List]
+        Zdrojovy kod funkce a objekty, ktere funkce ocekava v promenne K.
+    """
+
+    transpiler = Transpiler(linked.instructions, linked.labels,
+                            linked.global_names, positions)
+    return transpiler.generate(), transpiler.objects
+
+
+def transpile_program(program, positions: bool = False) -> Transpiled:
+    """ Preklad programu do funkce jazyka Python (--engine=transpiled).
+
+    Zdrojovy kod se prelozi jednou funkci compile() a provede funkci exec().
+    Instrukce mimo vygenerovany kod se provadi uzavery z Program.code.
+
+    Parameters
+    ----------
+    program: Program
+        Nacteny a propojeny program s prelozenymi uzavery (Program.code).
+    positions: bool
+        Ukladat pozici zacatku kazdeho bloku (vzorkovaci profil).
+    Returns
+    -------
+    Transpiled
+        Prelozena funkce, nebo None, pokud program obsahuje konstrukci,
+        kterou nelze bezpecne prelozit (program se pak provadi
+        Program.run_compiled).
+    """
+
+    if len(program.instructions) > MAX_INSTRUCTIONS:
+        return None
+
+    try:
+        source, objects = transpile(program, positions)
+    except TranspileError:
+        return None
+
+    namespace = dict(NAMESPACE)
+    namespace['K'] = objects
+    exec(compile(source, FILENAME, 'exec'), namespace)
+    return namespace[FUNCTION_NAME]
@@ -0,0 +1,276 @@
+from typing import Dict, FrozenSet, List, Tuple
+from enums import DataTypes, Frames
+from models import Variable
+from cfg import BasicBlock, ControlFlowGraph
+import instructions as instrs
+
+# Mnozina typu, kterych muze nabyvat hodnota. None = typ neni znam.
+TypeSet = FrozenSet[DataTypes]
+# Klic promenne ve stavu analyzy (ramec, nazev).
+VariableKey = Tuple[Frames, str]
+# Stav analyzy (zname typy promennych a hodnot na vrcholu zasobniku).
+State = Tuple[Dict[VariableKey, TypeSet], List[TypeSet]]
+
+NUMERIC_TYPES = frozenset([DataTypes.INT, DataTypes.FLOAT])
+
+
+def types_of(types: Dict[VariableKey, TypeSet], symb) -> TypeSet:
+    """ Mnozina moznych typu operandu <symb>. """
+
+    if type(symb) is Variable:
+        return types.get((symb.frame, symb.value))
+
+    return frozenset([symb.data_type])
+
+
+def validation_passes(types1: TypeSet, types2: TypeSet,
+                      allowed_types: List[DataTypes]) -> bool:
+    """
+    Overeni, ze kontrola typu operandu (validate_math_symbols nebo
+    validate_comparable_symbols) uspeje pro vsechny kombinace typu.
+    """
+
+    if types1 is None or types2 is None:
+        return False
+
+    for type1 in types1:
+        for type2 in types2:
+            if type1 not in allowed_types or type2 not in allowed_types:
+                return False
+
+            if type1 != type2 and type1 != DataTypes.NIL and \
+                    type2 != DataTypes.NIL:
+                return False
+
+    return True
+
+
+def math_result(instruction, types1: TypeSet, types2: TypeSet) -> TypeSet:
+    """ Typ vysledku aritmeticke operace (pokud probehne bez chyby). """
+
+    if type(instruction) is instrs.IDiv:
+        return frozenset([DataTypes.INT])
+    elif type(instruction) is instrs.Div:
+        return frozenset([DataTypes.FLOAT])
+
+    # Operandy musi mit stejny typ, vysledek ma typ prvniho operandu.
+    known = types1 if types1 is not None else types2
+    return NUMERIC_TYPES if known is None else known & NUMERIC_TYPES
+
+
+def read_result(instruction: 'instrs.Read') -> TypeSet:
+    """ Instrukce READ vraci pozadovany typ, nebo nil (chybny vstup). """
+
+    data_type = {
+        bool: DataTypes.BOOL,
+        int: DataTypes.INT,
+        str: DataTypes.STRING,
+        float: DataTypes.FLOAT
+    }[instruction.args[1].type]
+    return frozenset([data_type, DataTypes.NIL])
+
+
+# Typy vysledku instrukci, ktere nezavisi na operandech.
+RESULT_TYPES = {
+    "NOT": DataTypes.BOOL,
+    "INT2CHAR": DataTypes.STRING,
+    "STRI2INT": DataTypes.INT,
+    "CONCAT": DataTypes.STRING,
+    "STRLEN": DataTypes.INT,
+    "GETCHAR": DataTypes.STRING,
+    "SETCHAR": DataTypes.STRING,
+    "TYPE": DataTypes.STRING,
+    "INT2FLOAT": DataTypes.FLOAT,
+    "FLOAT2INT": DataTypes.INT,
+    "NOTS": DataTypes.BOOL,
+    "INT2CHARS": DataTypes.STRING,
+    "STRI2INTS": DataTypes.INT,
+    "INT2FLOATS": DataTypes.FLOAT,
+    "FLOAT2INTS": DataTypes.INT
+}
+
+# Pocet hodnot, ktere zasobnikove instrukce odebiraji z datoveho zasobniku.
+STACK_POPS = {
+    "NOTS": 1,
+    "INT2CHARS": 1,
+    "STRI2INTS": 2,
+    "INT2FLOATS": 1,
+    "FLOAT2INTS": 1,
+    "JUMPIFEQS": 2,
+    "JUMPIFNEQS": 2
+}
+
+
+def inherited_state(graph: ControlFlowGraph, block: BasicBlock,
+                    exits: List[State]) -> State:
+    """
+    Stav na zacatku bloku, do ktereho vede jedina hrana z jiz zpracovaneho
+    bloku (skok nebo pokracovani dalsim blokem). Za volanim (po navratu
+    z funkce) ani na zacatku programu neni stav znam (None).
+    """
+
+    if len(block.predecessors) != 1 or block.predecessors[0] >= block.index:
+        return None
+
+    source = graph.blocks[block.predecessors[0]]
+    if isinstance(graph.last(source), instrs.Call) and \
+            source.fallthrough == block.index:
+        return None
+
+    return exits[source.index]
+
+
+class TypeInference():
+    """
+    Analyza datovych typu promennych v ramci zakladnich bloku (cfg.py).
+
+    Stav (zname typy promennych a hodnot na vrcholu datoveho zasobniku) se
+    prebira z konce predchoziho bloku, pokud do bloku vede jedina hrana,
+    jinak se zahazuje (viz inherited_state). U aritmetickych a porovnavacich
+    instrukci, jejichz typy operandu jsou dokazany, se vypne kontrola typu
+    za behu (atribut checked).
+    """
+
+    def __init__(self):
+        self.types: Dict[VariableKey, TypeSet] = dict()
+        # Zname typy hodnot na vrcholu datoveho zasobniku.
+        self.stack: List[TypeSet] = list()
+        # Pocet instrukci, u kterych byla kontrola typu odstranena.
+        self.elided = 0
+
+    def enter(self, state: State):
+        """ Nastaveni stavu na zacatku bloku (None = nic neni znamo). """
+
+        if state is None:
+            self.types = dict()
+            self.stack = list()
+        else:
+            self.types = dict(state[0])
+            self.stack = list(state[1])
+
+    def state(self) -> State:
+        return dict(self.types), list(self.stack)
+
+    def assign(self, var: Variable, types: TypeSet):
+        key = (var.frame, var.value)
+
+        if types is None:
+            self.types.pop(key, None)
+        else:
+            self.types[key] = types
+
+    def pop(self) -> TypeSet:
+        return self.stack.pop() if len(self.stack) > 0 else None
+
+    def move_frame(self, source: Frames, destination: Frames):
+        """ Presun znalosti mezi ramci (PUSHFRAME, POPFRAME). """
+
+        moved = {(destination, name): types
+                 for (frame, name), types in self.types.items()
+                 if frame == source}
+
+        for key in [key for key in self.types
+                    if key[0] == source or key[0] == destination]:
+            del self.types[key]
+
+        self.types.update(moved)
+
+    def elide(self, instruction):
+        instruction.checked = False
+        self.elided += 1
+
+    def visit(self, instruction):
+        """ Zpracovani jedne instrukce. """
+
+        kind = type(instruction)
+        args = instruction.args
+
+        if isinstance(instruction, instrs.MathInstructionBase):
+            types1 = types_of(self.types, args[1])
+            types2 = types_of(self.types, args[2])
+
+            if validation_passes(types1, types2, NUMERIC_TYPES):
+                self.elide(instruction)
+            self.assign(args[0], math_result(instruction, types1, types2))
+        elif isinstance(instruction, instrs.ComparableInstruction):
+            types1 = types_of(self.types, args[1])
+            types2 = types_of(self.types, args[2])
+
+            if validation_passes(types1, types2, instruction.allowedTypes):
+                self.elide(instruction)
+            self.assign(args[0], frozenset([DataTypes.BOOL]))
+        elif isinstance(instruction, instrs.StackMathInstructionBase):
+            types2 = self.pop()
+            types1 = self.pop()
+
+            if validation_passes(types1, types2, NUMERIC_TYPES):
+                self.elide(instruction)
+            self.stack.append(math_result(instruction, types1, types2))
+        elif isinstance(instruction, instrs.StackComparableInstruction):
+            types2 = self.pop()
+            types1 = self.pop()
+
+            if validation_passes(types1, types2, instruction.allowedTypes):
+                self.elide(instruction)
+            self.stack.append(frozenset([DataTypes.BOOL]))
+        elif kind is instrs.Move:
+            self.assign(args[0], types_of(self.types, args[1]))
+        elif kind is instrs.Read:
+            self.assign(args[0], read_result(instruction))
+        elif kind is instrs.PushS:
+            self.stack.append(types_of(self.types, args[0]))
+        elif kind is instrs.PopS:
+            self.assign(args[0], self.pop())
+        elif kind is instrs.Clears:
+            self.stack.clear()
+        elif kind is instrs.Createframe:
+            self.types = {key: types for key, types in self.types.items()
+                          if key[0] != Frames.TEMPORARY}
+        elif kind is instrs.Pushframe:
+            self.move_frame(Frames.TEMPORARY, Frames.LOCAL)
+        elif kind is instrs.Popframe:
+            self.move_frame(Frames.LOCAL, Frames.TEMPORARY)
+        elif instruction.opcode in STACK_POPS:
+            for _ in range(STACK_POPS[instruction.opcode]):
+                self.pop()
+
+            if instruction.opcode in RESULT_TYPES:
+                self.stack.append(
+                    frozenset([RESULT_TYPES[instruction.opcode]]))
+        elif instruction.opcode in RESULT_TYPES:
+            self.assign(args[0],
+                        frozenset([RESULT_TYPES[instruction.opcode]]))
+        elif kind is instrs.Defvar:
+            self.assign(args[0], None)
+
+
+def infer_types(instructions: List['instrs.InstructionBase']) -> int:
+    """ Odstraneni kontrol typu operandu, ktere nemohou selhat.
+
+    Parameters
+    ----------
+    instructions: List[InstructionBase]
+        Instrukce programu vcetne navesti (pred slozenim instrukci).
+    Returns
+    -------
+    int
+        Pocet instrukci, u kterych byla kontrola typu odstranena.
+    """
+
+    graph = ControlFlowGraph(instructions)
+    inference = TypeInference()
+    # Stav na konci jednotlivych bloku.
+    exits: List[State] = list()
+
+    for block in graph.blocks:
+        inference.enter(inherited_state(graph, block, exits))
+
+        for instruction in instructions[block.start:block.stop]:
+            inference.visit(instruction)
+
+        # Stav se uklada pouze pro bloky, ktere jej predavaji dal.
+        inherits = any(len(graph.blocks[successor].predecessors) == 1
+                       for successor in block.successors)
+        exits.append(inference.state() if inherits else None)
+
+    return inference.elided